@@ -0,0 +1,66 @@
+"""Find the file count where process-pool tag parsing beats in-process parsing.
+
+Run from the repo root:
+    python -m benchmarks.bench_bulk_import [--sizes 250,500,1000,2000,4000,8000]
+
+For each size, times platforms.pc.bulk_import.iter_tag_infos in-process and
+on a fresh ProcessPoolExecutor (pool startup included, as in a real import),
+using the synthetic headers from bench_tags. The smallest size where the pool
+wins is the value INPROCESS_THRESHOLD should roughly track on the target
+machine (pool startup and per-file cost vary with CPU count and storage).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_tags import AUDIO_BYTES, flac_header, mp3_header, write_sparse
+from platforms.pc.bulk_import import INPROCESS_THRESHOLD, iter_tag_infos
+
+
+def build(root: str, count: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        ext, make = (".mp3", mp3_header) if i % 2 else (".flac", flac_header)
+        path = os.path.join(root, f"{i:06d}{ext}")
+        header = make(i)
+        write_sparse(path, header, len(header) + AUDIO_BYTES)
+        paths.append(path)
+    return paths
+
+
+def _time(paths: list[str], pooled: bool, workers: int | None) -> float:
+    start = time.perf_counter()
+    threshold = 0 if pooled else len(paths) + 1
+    for _ in iter_tag_infos(paths, workers=workers, threshold=threshold):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=str, default="250,500,1000,2000,4000,8000")
+    parser.add_argument("--workers", type=int, default=None, help="Pool size (default: CPU count)")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print(f"CPUs: {os.cpu_count()}  current INPROCESS_THRESHOLD: {INPROCESS_THRESHOLD}")
+    crossover = None
+    with tempfile.TemporaryDirectory() as root:
+        paths = build(root, max(sizes))
+        _time(paths, pooled=False, workers=None)  # warm the page cache so both modes see the same I/O
+        for size in sizes:
+            subset = paths[:size]
+            inproc = min(_time(subset, pooled=False, workers=args.workers) for _ in range(2))
+            pooled = min(_time(subset, pooled=True, workers=args.workers) for _ in range(2))
+            print(f"{size:7d} files  in-process {inproc * 1000:8.1f} ms  pool {pooled * 1000:8.1f} ms")
+            if crossover is None and pooled < inproc:
+                crossover = size
+    print(f"pool wins from: {crossover if crossover is not None else 'never (within sizes)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Holding DOWN through the artist list: one render per event vs coalesced batches.
+
+Run from the repo root:
+    python -m benchmarks.bench_input [--artists 5000] [--batch 37]
+
+Scrolls from the first to the last artist on a headless ConsoleScreen with
+18 visible rows. "per event" calls handle_button once per press (a render
+each); "coalesced" hands handle_batch runs of `--batch` presses, as an input
+poll does when presses queue up faster than frames can be drawn.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.bench_navigation import NullAudio
+from core.input_coalescer import coalesce
+from core.models import ButtonEvent, LibraryLevel, PlayerState, ScreenID, Track
+from core.player_app import PlayerApp
+from platforms.pc.console_screen import ConsoleScreen
+
+
+def make_app(artists: int) -> PlayerApp:
+    tracks = [Track(str(i), "Song", f"Artist {i:06d}", "Album", 1, 180, f"/sd/{i}.mp3") for i in range(artists)]
+    state = PlayerState(tracks=tracks)
+    app = PlayerApp(state, ConsoleScreen(rows=20, headless=True), NullAudio())
+    state.current_screen = ScreenID.LIBRARY
+    state.library_level = LibraryLevel.ARTISTS
+    app.render()
+    return app
+
+
+def scroll(app: PlayerApp, presses: int, batch: int) -> tuple[float, int]:
+    renders = app.renders_performed
+    start = time.perf_counter()
+    if batch <= 1:
+        for _ in range(presses):
+            app.handle_button(ButtonEvent.DOWN)
+    else:
+        for done in range(0, presses, batch):
+            app.handle_batch(coalesce([ButtonEvent.DOWN] * min(batch, presses - done)))
+    elapsed = time.perf_counter() - start
+    assert app.state.selected_artist_index == presses
+    return elapsed, app.renders_performed - renders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--artists", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=37)
+    args = parser.parse_args()
+
+    presses = args.artists - 1
+    print(f"{'mode':>10} {'renders':>8} {'total ms':>9}")
+    for label, batch in (("per event", 1), ("coalesced", args.batch)):
+        elapsed, renders = scroll(make_app(args.artists), presses, batch)
+        print(f"{label:>10} {renders:>8} {elapsed * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
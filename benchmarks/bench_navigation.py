@@ -0,0 +1,121 @@
+"""Per-keypress cost of PlayerApp.handle_button as the library grows.
+
+Run from the repo root:
+    python -m benchmarks.bench_navigation [--tracks 50000] [--events 2000]
+
+Drives UP/DOWN/SELECT/BACK through the album and track levels of one artist
+(the screen discards draw calls) and compares the current Library against a
+copy that re-sorts on every lookup, as Library did before its views were
+precomputed. Artist-list paging is reported separately; its cost depends on
+whether the screen windows the list (see bench_render).
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.bench_track_store import make_rows
+from core.library import Library
+from core.models import ButtonEvent, LibraryLevel, PlayerState, ScreenID, Track
+from core.player_app import PlayerApp
+from core.track_store import TrackStore
+
+
+class NullScreen:
+    def clear(self) -> None:
+        pass
+
+    def draw_text(self, x: int, y: int, text: str) -> None:
+        pass
+
+    def refresh(self) -> None:
+        pass
+
+
+class NullAudio:
+    def play(self, track) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def pause(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+    def set_volume(self, level: int) -> None:
+        pass
+
+
+class ResortingLibrary(Library):
+    """The old lookups: sort (or scan and sort) on every call."""
+
+    def artists(self):
+        return sorted(self.artist_index.keys())
+
+    def albums_for_artist(self, artist):
+        albums = [album for (artist_key, album) in self.album_index.keys() if artist_key == artist]
+        return sorted(set(albums))
+
+    def tracks_for(self, artist, album):
+        return sorted(self.album_index.get((artist, album), []), key=self._track_sort_key)
+
+
+EVENTS = [
+    ButtonEvent.DOWN,
+    ButtonEvent.DOWN,
+    ButtonEvent.SELECT,  # albums -> tracks
+    ButtonEvent.DOWN,
+    ButtonEvent.DOWN,
+    ButtonEvent.UP,
+    ButtonEvent.BACK,  # tracks -> albums
+    ButtonEvent.UP,
+]
+
+
+def make_app(n: int, library_cls) -> PlayerApp:
+    tracks = TrackStore(Track(*row) for row in make_rows(n))
+    state = PlayerState(tracks=tracks)
+    app = PlayerApp(state, NullScreen(), NullAudio(), library=library_cls(tracks))
+    state.current_screen = ScreenID.LIBRARY
+    state.selected_artist_index = len(app.library.artists()) // 2
+    state.library_level = LibraryLevel.ALBUMS
+    return app
+
+
+def per_event_us(app: PlayerApp, events: int) -> float:
+    start = time.perf_counter()
+    for i in range(events):
+        app.handle_button(EVENTS[i % len(EVENTS)])
+    return (time.perf_counter() - start) / events * 1e6
+
+
+def artist_level_us(app: PlayerApp, events: int) -> float:
+    app.state.library_level = LibraryLevel.ARTISTS
+    start = time.perf_counter()
+    for i in range(events):
+        app.handle_button(ButtonEvent.DOWN if i % 2 else ButtonEvent.UP)
+    return (time.perf_counter() - start) / events * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=50_000)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    sizes = sorted({max(200, args.tracks // 10), args.tracks})
+    print(f"{'tracks':>8} {'library':>10} {'album/track us/event':>22} {'artist list us/event':>22}")
+    for n in sizes:
+        for name, cls in (("resorting", ResortingLibrary), ("views", Library)):
+            app = make_app(n, cls)
+            drill = per_event_us(app, args.events)
+            artists = artist_level_us(app, max(1, args.events // 20))
+            print(f"{n:>8} {name:>10} {drill:>22.1f} {artists:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Cost of one PlayerApp.render() of the artist list vs list length.
+
+Run from the repo root:
+    python -m benchmarks.bench_render [--max-artists 100000] [--renders 200]
+
+Compares a screen reporting the ST7789's 18 visible rows (only the window is
+drawn) with one that has no `visible_rows()` (every row is drawn, as before).
+The selection sits mid-list so the window has to be scrolled into place.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.bench_navigation import NullAudio, NullScreen
+from core.models import LibraryLevel, PlayerState, ScreenID, Track
+from core.player_app import PlayerApp
+
+
+class St7789Rows(NullScreen):
+    def visible_rows(self) -> int:
+        return 18
+
+
+def make_app(artists: int, screen) -> PlayerApp:
+    tracks = [
+        Track(str(i), "Song", f"Artist {i:06d}", "Album", 1, 180, f"/sd/{i}.mp3")
+        for i in range(artists)
+    ]
+    state = PlayerState(tracks=tracks)
+    app = PlayerApp(state, screen, NullAudio())
+    state.current_screen = ScreenID.LIBRARY
+    state.library_level = LibraryLevel.ARTISTS
+    state.selected_artist_index = artists // 2
+    return app
+
+
+def render_us(app: PlayerApp, renders: int) -> float:
+    start = time.perf_counter()
+    for _ in range(renders):
+        app.render()
+    return (time.perf_counter() - start) / renders * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-artists", type=int, default=100_000)
+    parser.add_argument("--renders", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'artists':>8} {'windowed us':>12} {'full list us':>13}")
+    count = 100
+    while count <= args.max_artists:
+        windowed = render_us(make_app(count, St7789Rows()), args.renders)
+        # The unwindowed render is O(n); keep its total time bounded.
+        full = render_us(make_app(count, NullScreen()), max(1, args.renders * 100 // count))
+        print(f"{count:>8} {windowed:>12.1f} {full:>13.1f}")
+        count *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark header-only tag/duration extraction (core.tags) in files per second.
+
+Run from the repo root:
+    python -m benchmarks.bench_tags [--files 2000]
+
+Builds synthetic .mp3 (ID3v2.3 + 300 KB cover art + Xing frame + ID3v1),
+.flac (STREAMINFO + PICTURE + VORBIS_COMMENT) and .wav (fmt + data + LIST)
+files. Audio payloads are sparse, so each file looks ~5 MB on disk while
+only the headers are real; the parser should never touch the payload.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from core.tags import read_tags
+
+AUDIO_BYTES = 5 * 1024 * 1024
+
+
+def _syncsafe(n: int) -> bytes:
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+
+def mp3_header(i: int) -> bytes:
+    frames = [
+        (b"TIT2", b"\x00Track %d" % i),
+        (b"TPE1", b"\x00Artist %d" % (i % 97)),
+        (b"TALB", b"\x00Album %d" % (i % 13)),
+        (b"TRCK", b"\x00%d/20" % (i % 20 + 1)),
+        (b"APIC", b"\x00image/jpeg\x00\x03\x00" + b"\x00" * 300_000),
+    ]
+    body = b"".join(fid + len(data).to_bytes(4, "big") + b"\x00\x00" + data for fid, data in frames)
+    body += b"\x00" * 1024
+    xing = bytearray(417)
+    xing[0:4] = b"\xff\xfb\x90\x00"
+    xing[36:40] = b"Xing"
+    xing[40:44] = (1).to_bytes(4, "big")
+    xing[44:48] = (8000 + i).to_bytes(4, "big")
+    return b"ID3\x03\x00\x00" + _syncsafe(len(body)) + body + bytes(xing)
+
+
+def flac_header(i: int) -> bytes:
+    info = bytearray(34)
+    rate, total = 44100, 44100 * (180 + i % 60)
+    info[10], info[11], info[12] = (rate >> 12) & 0xFF, (rate >> 4) & 0xFF, (rate & 0x0F) << 4
+    info[13] = (total >> 32) & 0x0F
+    info[14:18] = (total & 0xFFFFFFFF).to_bytes(4, "big")
+    comments = [b"TITLE=Track %d" % i, b"ARTIST=Artist %d" % (i % 97), b"ALBUM=Album %d" % (i % 13)]
+    vorbis = (6).to_bytes(4, "little") + b"bench!" + len(comments).to_bytes(4, "little")
+    vorbis += b"".join(len(c).to_bytes(4, "little") + c for c in comments)
+    picture = b"\x00" * 300_000
+    return (
+        b"fLaC"
+        + b"\x00" + len(info).to_bytes(3, "big") + bytes(info)
+        + b"\x06" + len(picture).to_bytes(3, "big") + picture
+        + b"\x84" + len(vorbis).to_bytes(3, "big") + vorbis
+    )
+
+
+def wav_header(i: int) -> bytes:
+    fmt = (1).to_bytes(2, "little") + (2).to_bytes(2, "little") + (44100).to_bytes(4, "little")
+    fmt += (176400).to_bytes(4, "little") + (4).to_bytes(2, "little") + (16).to_bytes(2, "little")
+    return b"RIFF" + (AUDIO_BYTES + 36).to_bytes(4, "little") + b"WAVE" + b"fmt " + (16).to_bytes(4, "little") + fmt + b"data" + AUDIO_BYTES.to_bytes(4, "little")
+
+
+def write_sparse(path: str, header: bytes, size: int) -> None:
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(max(size, len(header)))
+
+
+def build(root: str, count: int) -> dict:
+    paths = {".mp3": [], ".flac": [], ".wav": []}
+    for i in range(count):
+        for ext, make in ((".mp3", mp3_header), (".flac", flac_header), (".wav", wav_header)):
+            path = os.path.join(root, f"{i:05d}{ext}")
+            header = make(i)
+            write_sparse(path, header, len(header) + AUDIO_BYTES)
+            paths[ext].append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="Files per format")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = build(root, args.files)
+        for ext, group in paths.items():
+            start = time.perf_counter()
+            for path in group:
+                info = read_tags(path)
+                assert info.duration_secs, path
+            elapsed = time.perf_counter() - start
+            print(f"{ext:6s} {len(group):6d} files  {elapsed * 1000:8.1f} ms  {len(group) / elapsed:10.0f} files/s")
+
+
+if __name__ == "__main__":
+    main()
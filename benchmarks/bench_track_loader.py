@@ -0,0 +1,87 @@
+"""Benchmark the PC track loader over a synthetic Artist/Album/Track tree.
+
+Run from the repo root:
+    python -m benchmarks.bench_track_loader [--artists 500 --albums 10 --tracks 20]
+
+The default shape is 100k files. The tree is built once in a temp dir (or
+reused via --root) and scanned with the current loader and with a copy of
+the original pathlib-based loop for comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from platforms.pc.track_loader import SUPPORTED_EXTS, _parse_filename, load_tracks_from_dir
+
+
+def build_tree(root: Path, artists: int, albums: int, tracks: int) -> int:
+    count = 0
+    for a in range(artists):
+        for b in range(albums):
+            album_dir = root / f"Artist {a:04d}" / f"Album {b:02d}"
+            album_dir.mkdir(parents=True, exist_ok=True)
+            for t in range(tracks):
+                (album_dir / f"{t + 1:02d} - Track {t}.mp3").touch()
+                count += 1
+            (album_dir / "cover.jpg").touch()
+    return count
+
+
+def pathlib_reference(path: str) -> int:
+    """The original iterdir/is_dir/is_file loop, kept here only as a baseline."""
+    base = Path(path)
+    count = 0
+    for artist_dir in sorted([p for p in base.iterdir() if p.is_dir()]):
+        for file_entry in [p for p in artist_dir.iterdir() if p.is_file()]:
+            if file_entry.suffix.lower() in SUPPORTED_EXTS:
+                _parse_filename(file_entry.stem)
+                count += 1
+        for album_dir in sorted([p for p in artist_dir.iterdir() if p.is_dir()]):
+            for file_entry in sorted([p for p in album_dir.iterdir() if p.is_file()]):
+                if file_entry.suffix.lower() not in SUPPORTED_EXTS:
+                    continue
+                _parse_filename(file_entry.stem)
+                str(file_entry)
+                count += 1
+    return count
+
+
+def _time(fn, path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--artists", type=int, default=500)
+    parser.add_argument("--albums", type=int, default=10)
+    parser.add_argument("--tracks", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--root", type=str, default=None, help="Existing tree to scan instead of a synthetic one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root
+        if root is None:
+            root = os.path.join(tmp, "music")
+            start = time.perf_counter()
+            files = build_tree(Path(root), args.artists, args.albums, args.tracks)
+            print(f"built {files} files in {time.perf_counter() - start:.1f}s")
+
+        count = len(load_tracks_from_dir(root))
+        for label, fn in (("scandir loader", load_tracks_from_dir), ("pathlib reference", pathlib_reference)):
+            elapsed = _time(fn, root, args.repeat)
+            print(f"{label:18s} {elapsed * 1000:8.1f} ms  {count / elapsed:10.0f} files/s")
+
+
+if __name__ == "__main__":
+    main()
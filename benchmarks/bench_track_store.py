@@ -0,0 +1,69 @@
+"""Compare bytes per track: List[Track] vs core.track_store.TrackStore.
+
+Run from the repo root:
+    python -m benchmarks.bench_track_store [--tracks 100000]
+
+Tracks are shaped like a real Artist/Album/Track tree (20 tracks per album,
+10 albums per artist). Memory is measured with tracemalloc while each
+representation is alive, excluding the strings both share at input.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+from core.models import Track
+from core.track_store import TrackStore
+
+
+def make_rows(count: int) -> list[tuple]:
+    rows = []
+    for i in range(count):
+        artist = f"Artist {i // 200:05d}"
+        album = f"Album {i // 20 % 10:02d}"
+        title = f"Track Title {i % 20:02d}"
+        path = f"/sd/music/{artist}/{album}/{i % 20 + 1:02d} - {title}.mp3"
+        rows.append((path, title, artist, album, i % 20 + 1, 180 + i % 120, path))
+    return rows
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=100_000)
+    args = parser.parse_args()
+    n = args.tracks
+
+    def as_list():
+        # Each Track keeps its own strings (id and path share one), as after a real scan.
+        return [Track(*row) for row in make_rows(n)]
+
+    def as_store():
+        store = TrackStore()
+        for row in make_rows(n):
+            store.append(Track(*row))
+        return store
+
+    # make_rows() output is garbage by the time we measure, so only retained memory counts.
+    list_bytes = measure(as_list)
+    store_bytes = measure(as_store)
+    print(f"{n} tracks")
+    print(f"List[Track]  {list_bytes / n:8.1f} bytes/track  ({list_bytes / 1e6:.1f} MB)")
+    print(f"TrackStore   {store_bytes / n:8.1f} bytes/track  ({store_bytes / 1e6:.1f} MB)")
+    print(f"ratio        {list_bytes / store_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Streaming playback: file -> ring buffer -> PCM sink.
+
+Pure Python (no imports beyond core) so the same engine runs on MicroPython
+and under CPython tests with fake files and sinks.
+"""
+
+from .tags import read_wav_layout
+
+
+class RingBuffer:
+    """Fixed-capacity byte ring over one preallocated bytearray."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.view = memoryview(bytearray(capacity))
+        self.reset()
+
+    def reset(self, start=0):
+        """Empty the ring; the next write lands at index `start`."""
+        self.read_index = start % self.capacity
+        self.write_index = self.read_index
+        self.used = 0
+
+    def free(self):
+        return self.capacity - self.used
+
+    def writable(self):
+        """Length of the contiguous free span starting at `write_index`."""
+        return min(self.capacity - self.used, self.capacity - self.write_index)
+
+    def readable(self):
+        """Length of the contiguous filled span starting at `read_index`."""
+        return min(self.used, self.capacity - self.read_index)
+
+    def commit_write(self, n):
+        self.write_index = (self.write_index + n) % self.capacity
+        self.used += n
+
+    def commit_read(self, n):
+        self.read_index = (self.read_index + n) % self.capacity
+        self.used -= n
+
+
+class WavSource:
+    """PCM reader for the data chunk of a WAV file (the passthrough 'decoder')."""
+
+    def __init__(self, f, layout):
+        self.file = f
+        self.layout = layout
+        self.position = layout.data_offset  # file offset of the next read
+        self.remaining = layout.data_size
+        f.seek(self.position)
+
+    def readinto(self, buf):
+        if self.remaining <= 0:
+            return 0
+        if len(buf) > self.remaining:
+            buf = buf[: self.remaining]
+        n = self.file.readinto(buf) or 0
+        self.position += n
+        self.remaining -= n
+        return n
+
+    def close(self):
+        self.file.close()
+
+
+def open_source(f):
+    """Return a PCM source for an open audio file, or None if the format has no decoder."""
+    layout = read_wav_layout(f)
+    if layout is None or layout.audio_format != 1:
+        return None
+    return WavSource(f, layout)
+
+
+def _open_file(path):
+    return open(path, "rb")
+
+
+class StreamingPlayer:
+    """
+    AudioBackend that streams a track through a ring buffer into `sink`.
+
+    The producer (`fill`) reads up to the next `chunk_size` boundary of the
+    file straight into the ring. `play` starts the ring at an index
+    congruent to the file offset modulo `chunk_size`, so after the first
+    read every read is one whole, chunk-aligned piece (whole sectors on
+    FAT). The consumer (`feed`) hands contiguous spans of the ring to the
+    sink. A main loop or task calls both (`pump` does one of each).
+
+    Gapless playback: `preload(track)` opens the next track and reads its
+    first `preload_chunks` chunks into a side buffer. When the current file
+    runs out, the producer carries straight on with the preloaded one
+    (if its PCM format matches), and `track` switches over when the
+    consumer reaches the boundary. A `play` of the preloaded track reuses
+    it instead of reopening the file.
+
+    `on_track_end(gapless)`, if set, is called from `feed` when the current
+    track has been fully handed to the sink: `gapless` is True when a
+    preloaded track has already taken over, False when playback stopped.
+
+    Instrumentation: `underruns` counts feeds that found the ring empty
+    before the end of the track, `low_water` is the lowest fill level seen
+    while playing, `bytes_read` / `bytes_played` track throughput and
+    `gapless_transitions` counts tracks started without a stop.
+    """
+
+    def __init__(self, sink, buffer_size=32768, chunk_size=4096, opener=None, preload_chunks=2):
+        if buffer_size % chunk_size:
+            raise ValueError("buffer_size must be a multiple of chunk_size")
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.ring = RingBuffer(buffer_size)
+        # Preallocated views of each aligned chunk slot, so steady-state reads don't allocate.
+        self._chunks = [self.ring.view[i : i + chunk_size] for i in range(0, buffer_size, chunk_size)]
+        self._open = opener if opener is not None else _open_file
+        self._preload_view = memoryview(bytearray(preload_chunks * chunk_size))
+        self._next = None  # preloaded (track, source, bytes in _preload_view)
+        self._incoming = None  # chained track whose data follows the current one in the ring
+        self._boundary = 0  # bytes of the current track left in the ring before `_incoming`
+        self.source = None
+        self.track = None
+        self.is_playing = False
+        self.eof = True
+        self.volume = None
+        self.underruns = 0
+        self.low_water = buffer_size
+        self.bytes_read = 0
+        self.bytes_played = 0
+        self.gapless_transitions = 0
+        self.on_track_end = None
+
+    # AudioBackend
+
+    def play(self, track):
+        self.stop()
+        preloaded = self._take_preloaded(track)
+        if preloaded is None:
+            source = self._open_source(track)
+            filled = 0
+        else:
+            source, filled = preloaded
+        layout = source.layout
+        if hasattr(self.sink, "configure"):
+            self.sink.configure(layout.sample_rate, layout.channels, layout.bits_per_sample)
+        self.source = source
+        self.track = track
+        self.ring.reset(layout.data_offset % self.chunk_size)
+        self._copy_in(self._preload_view[:filled])
+        self.eof = False
+        self.low_water = self.ring.capacity
+        self.fill()  # start with a full buffer
+        self.is_playing = True
+
+    def preload(self, track):
+        """Open `track` and read its first chunks now, ready to follow the current one."""
+        self._drop_preloaded()
+        source = self._open_source(track)
+        view = self._preload_view
+        filled = 0
+        while filled < len(view):
+            want = min(self.chunk_size - source.position % self.chunk_size, len(view) - filled)
+            n = source.readinto(view[filled : filled + want])
+            if not n:
+                break
+            filled += n
+        self.bytes_read += filled
+        self._next = (track, source, filled)
+
+    def pause(self):
+        self.is_playing = False
+
+    def resume(self):
+        if self.source is not None:
+            self.is_playing = True
+
+    def stop(self):
+        """Stop the current track; a preloaded next track is kept for a following `play`."""
+        if self.source is not None:
+            self.source.close()
+        self.source = None
+        self.track = None
+        self._incoming = None
+        self.is_playing = False
+        self.eof = True
+        self.ring.reset()
+
+    def set_volume(self, level):
+        self.volume = level
+        if hasattr(self.sink, "set_volume"):
+            self.sink.set_volume(level)
+
+    # Pipeline
+
+    @property
+    def finished(self):
+        """True once the whole track has been handed to the sink."""
+        return self.source is not None and self.eof and self.ring.used == 0
+
+    def fill(self, max_reads=None):
+        """Producer: read whole chunks while they fit in the ring; returns bytes read."""
+        total = 0
+        reads = 0
+        ring = self.ring
+        chunk = self.chunk_size
+        while max_reads is None or reads < max_reads:
+            if self.eof:
+                if not self._chain_preloaded():
+                    break
+                continue
+            want = chunk - self.source.position % chunk
+            if ring.free() < want:
+                break
+            index = ring.write_index
+            if want == chunk and index % chunk == 0:
+                view = self._chunks[index // chunk]
+            else:
+                # Partial chunk: the start of a track, or a chained track whose
+                # alignment differs from the ring's.
+                want = min(want, ring.capacity - index)
+                view = ring.view[index : index + want]
+            n = self.source.readinto(view)
+            reads += 1
+            if not n:
+                self.eof = True
+                continue
+            ring.commit_write(n)
+            total += n
+        self.bytes_read += total
+        return total
+
+    def feed(self, nbytes):
+        """Consumer: hand up to `nbytes` to the sink; returns bytes it accepted."""
+        if not self.is_playing:
+            return 0
+        ring = self.ring
+        sent = 0
+        switched = False
+        while sent < nbytes:
+            if self._incoming is not None and self._boundary == 0:
+                self.track = self._incoming
+                self._incoming = None
+                self.gapless_transitions += 1
+                switched = True
+            span = min(ring.readable(), nbytes - sent)
+            if self._incoming is not None:
+                span = min(span, self._boundary)
+            if span == 0:
+                if not self.eof:
+                    self.underruns += 1
+                break
+            start = ring.read_index
+            taken = self.sink.write(ring.view[start : start + span])
+            if taken is None:
+                taken = span
+            ring.commit_read(taken)
+            if self._incoming is not None:
+                self._boundary -= taken
+            sent += taken
+            if taken < span:
+                break  # sink is full
+        self.bytes_played += sent
+        if not self.eof and ring.used < self.low_water:
+            self.low_water = ring.used
+        ended = self.finished
+        if ended:
+            self.is_playing = False
+        # Notify last: the callback may start another track.
+        if self.on_track_end is not None:
+            if switched:
+                self.on_track_end(True)
+            if ended:
+                self.on_track_end(False)
+        return sent
+
+    def pump(self, nbytes):
+        """One scheduler step: top up the ring, then feed the sink."""
+        self.fill()
+        return self.feed(nbytes)
+
+    # Helpers
+
+    def _open_source(self, track):
+        f = self._open(track.path)
+        source = open_source(f)
+        if source is None:
+            f.close()
+            raise ValueError("unsupported audio format")
+        return source
+
+    def _take_preloaded(self, track):
+        """Return (source, filled) if `track` is the preloaded one; drop any other preload."""
+        # Compare paths: track objects may be fresh views of the same row.
+        if self._next is not None and self._next[0].path == track.path:
+            _, source, filled = self._next
+            self._next = None
+            return source, filled
+        self._drop_preloaded()
+        return None
+
+    def _drop_preloaded(self):
+        if self._next is not None:
+            self._next[1].close()
+            self._next = None
+
+    def _chain_preloaded(self):
+        """At the end of the current file, continue with the preloaded track if it fits."""
+        if self._next is None or self.source is None or self._incoming is not None:
+            return False
+        track, source, filled = self._next
+        current, upcoming = self.source.layout, source.layout
+        if (current.sample_rate, current.channels, current.bits_per_sample) != (
+            upcoming.sample_rate,
+            upcoming.channels,
+            upcoming.bits_per_sample,
+        ):
+            return False  # the sink must be reconfigured; leave it to `play`
+        if self.ring.free() < filled:
+            return False
+        self._next = None
+        self._boundary = self.ring.used
+        self._incoming = track
+        self._copy_in(self._preload_view[:filled])
+        self.source.close()
+        self.source = source
+        self.eof = False
+        return True
+
+    def _copy_in(self, data):
+        """Append `data` to the ring, wrapping as needed (caller checks it fits)."""
+        ring = self.ring
+        done = 0
+        while done < len(data):
+            index = ring.write_index
+            n = min(len(data) - done, ring.capacity - index)
+            ring.view[index : index + n] = data[done : done + n]
+            ring.commit_write(n)
+            done += n
@@ -0,0 +1,98 @@
+"""
+Input coalescing: turn bursts of queued button events into multi-step moves.
+
+A held key (or a burst typed ahead) arrives as many identical events; the
+app should apply them as one `DOWN x 37` and render once, so scroll speed is
+set by the input rate, not by render cost. Holding UP/DOWN also accelerates,
+ending in page jumps.
+"""
+
+import time
+
+from .models import ButtonEvent
+
+try:
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+except AttributeError:  # CPython
+
+    def _ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def _ticks_diff(end, start):
+        return end - start
+
+# Events whose repeats can be merged into one (event, steps) move.
+COALESCED = (ButtonEvent.UP, ButtonEvent.DOWN, ButtonEvent.VOLUME_UP, ButtonEvent.VOLUME_DOWN)
+SCROLL = (ButtonEvent.UP, ButtonEvent.DOWN)
+
+# A gap longer than this between repeats ends a hold.
+REPEAT_GAP_MS = 300
+# (held for at least ms, rows per repeat), in increasing order.
+ACCELERATION = ((0, 1), (600, 2), (1500, 4))
+# Past this, every repeat jumps a whole page.
+PAGE_AFTER_MS = 3000
+
+
+def coalesce(events):
+    """Merge runs of identical COALESCED events: [DOWN, DOWN, SELECT] -> [[DOWN, 2], [SELECT, 1]]."""
+    moves = []
+    for event in events:
+        if moves and moves[-1][0] == event and event in COALESCED:
+            moves[-1][1] += 1
+        else:
+            moves.append([event, 1])
+    return moves
+
+
+class InputCoalescer:
+    """
+    Wraps an `InputSource`: `read_batch()` drains whatever events are queued
+    and returns coalesced (event, steps) moves for `PlayerApp.handle_batch`.
+
+    UP/DOWN that keep arriving with gaps under REPEAT_GAP_MS count as a hold;
+    the longer the hold, the more rows each repeat moves (ACCELERATION), and
+    after PAGE_AFTER_MS each repeat moves `page_rows()` rows.
+    """
+
+    def __init__(self, source, page_rows=None, clock=None, max_events=64):
+        self.source = source
+        self.page_rows = page_rows
+        self._clock = clock if clock is not None else _ticks_ms
+        self.max_events = max_events
+        self._held = None  # event being held
+        self._hold_start = 0
+        self._last_seen = 0
+
+    def read_batch(self):
+        events = []
+        while len(events) < self.max_events:
+            event = self.source.read_event()
+            if event is None:
+                break
+            events.append(event)
+        if not events:
+            return []
+        moves = coalesce(events)
+        now = self._clock()
+        for move in moves:
+            if move[0] in SCROLL:
+                move[1] *= self._repeat_steps(move[0], now)
+            else:
+                self._held = None
+        return moves
+
+    def _repeat_steps(self, event, now):
+        """Rows per repeat of `event` arriving at `now`, updating the hold state."""
+        if event != self._held or _ticks_diff(now, self._last_seen) > REPEAT_GAP_MS:
+            self._held = event
+            self._hold_start = now
+        self._last_seen = now
+        held_ms = _ticks_diff(now, self._hold_start)
+        if held_ms >= PAGE_AFTER_MS and self.page_rows is not None:
+            return self.page_rows()
+        steps = 1
+        for after_ms, rate in ACCELERATION:
+            if held_ms >= after_ms:
+                steps = rate
+        return steps
@@ -8,7 +8,13 @@ from .models import ButtonEvent, Track
 
 
 class Screen(Protocol):
-    """Abstract display surface for both PC and ESP32 implementations."""
+    """
+    Abstract display surface for both PC and ESP32 implementations.
+
+    Screens may also provide `visible_rows() -> int`, the number of text rows
+    that fit (header included); PlayerApp then draws only that window of a
+    list. Without it every row is drawn.
+    """
 
     def clear(self) -> None: ...
 
@@ -18,7 +24,21 @@ class Screen(Protocol):
 
 
 class AudioBackend(Protocol):
-    """Abstract audio control; implementations may be real or stubbed."""
+    """
+    Abstract audio control; implementations may be real or stubbed.
+
+    `play` raises OSError or ValueError when the track cannot be opened;
+    PlayerApp then leaves playback stopped instead of showing it as playing.
+
+    Backends may also provide `preload(track)`: open the track that will
+    follow the current one and buffer its start, so the transition has no
+    gap. PlayerApp calls it with the next track of its play queue.
+
+    A backend that knows when a track ends exposes an `on_track_end`
+    attribute (initially None). PlayerApp sets it to a callback taking
+    `gapless`: True if the backend has already moved on to the preloaded
+    track, False if playback stopped and PlayerApp should start the next.
+    """
 
     def play(self, track: Track) -> None: ...
 
@@ -31,6 +51,16 @@ class AudioBackend(Protocol):
     def set_volume(self, level: int) -> None: ...
 
 
+class AudioSink(Protocol):
+    """PCM output (e.g. I2S) fed by a streaming AudioBackend."""
+
+    def configure(self, sample_rate: int, channels: int, bits_per_sample: int) -> None: ...
+
+    def write(self, data: memoryview) -> int:
+        """Consume a prefix of `data` (copying it) and return how many bytes were taken."""
+        ...
+
+
 class InputSource(Protocol):
     """Abstract input source to produce logical button events."""
 
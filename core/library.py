@@ -11,32 +11,179 @@ def _normalize(value, fallback):
     return stripped if stripped else fallback
 
 
+def _bisect_right(items, value, key=None):
+    """Insertion point after any equal entries (MicroPython has no `bisect`)."""
+    lo, hi = 0, len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probe = items[mid] if key is None else key(items[mid])
+        if value < probe:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
 class Library:
-    """Derived indexes for artist/album/track drilldown."""
+    """
+    Derived indexes for artist/album/track drilldown.
 
-    def __init__(self, tracks):
+    The views returned by `artists()`, `albums_for_artist()` and `tracks_for()`
+    are kept sorted as tracks change, so lookups never re-sort. They are shared
+    lists: callers must not mutate them.
+    """
+
+    def __init__(self, tracks, snapshot=None):
         self.tracks = tracks
+        # Bumped on every apply_changes so views can tell the lists changed.
+        self.version = 0
         self.artist_index = {}
+        # (artist, album) -> track indices in display order.
         self.album_index = {}
+        self._artists = []
+        self._albums = {}  # artist -> sorted album names
+        # Slots of removed tracks (set to None in `tracks`), reused by later additions.
+        self._free = [idx for idx, track in enumerate(self.tracks) if track is None]
+        if snapshot is not None:
+            self._load_snapshot(snapshot)
+            return
         for idx, track in enumerate(self.tracks):
-            artist = _normalize(track.artist, UNKNOWN_ARTIST)
-            album = _normalize(track.album, UNKNOWN_ALBUM)
-            self.artist_index.setdefault(artist, []).append(idx)
-            self.album_index.setdefault((artist, album), []).append(idx)
+            if track is not None:
+                artist, album = self._keys_for(idx)
+                self.artist_index.setdefault(artist, []).append(idx)
+                self.album_index.setdefault((artist, album), []).append(idx)
+        # Sort once up front instead of inserting track by track.
+        self._artists = sorted(self.artist_index)
+        for artist, album in self.album_index:
+            self._albums.setdefault(artist, []).append(album)
+        for albums in self._albums.values():
+            albums.sort()
+        for indices in self.album_index.values():
+            indices.sort(key=self._track_sort_key)
 
     def artists(self):
-        return sorted(self.artist_index.keys())
+        return self._artists
+
+    def artist_position(self, artist):
+        """Position of `artist` in `artists()`, or None if it has no tracks."""
+        pos = _bisect_right(self._artists, artist) - 1
+        if pos >= 0 and self._artists[pos] == artist:
+            return pos
+        return None
 
     def albums_for_artist(self, artist):
-        albums = [album for (artist_key, album) in self.album_index.keys() if artist_key == artist]
-        return sorted(set(albums))
+        return self._albums.get(artist, [])
 
     def tracks_for(self, artist, album):
-        indices = self.album_index.get((artist, album), [])
-        return sorted(indices, key=self._track_sort_key)
+        return self.album_index.get((artist, album), [])
+
+    def add_tracks(self, tracks):
+        """Append a batch of tracks (e.g. from a streaming scan); returns their indices."""
+        return self.apply_changes(added=tracks)
+
+    def apply_changes(self, added=(), removed=(), modified=()):
+        """
+        Update the track list and indexes in place without rebuilding.
+
+        `removed` are track indices whose slots become None, `modified` are
+        (index, track) replacements, and `added` tracks reuse freed slots
+        before being appended. Returns the indices assigned to `added`.
+        """
+        self.version += 1
+        for idx in removed:
+            if self.tracks[idx] is None:
+                continue
+            self._unindex(idx)
+            self.tracks[idx] = None
+            self._free.append(idx)
+        for idx, track in modified:
+            self._unindex(idx)
+            self.tracks[idx] = track
+            self._index(idx)
+        assigned = []
+        for track in added:
+            if self._free:
+                idx = self._free.pop()
+                self.tracks[idx] = track
+            else:
+                idx = len(self.tracks)
+                self.tracks.append(track)
+            self._index(idx)
+            assigned.append(idx)
+        return assigned
+
+    def _keys_for(self, idx):
+        track = self.tracks[idx]
+        return _normalize(track.artist, UNKNOWN_ARTIST), _normalize(track.album, UNKNOWN_ALBUM)
+
+    def _index(self, idx):
+        artist, album = self._keys_for(idx)
+        artist_tracks = self.artist_index.get(artist)
+        if artist_tracks is None:
+            artist_tracks = self.artist_index[artist] = []
+            self._artists.insert(_bisect_right(self._artists, artist), artist)
+            self._albums[artist] = []
+        artist_tracks.append(idx)
+        album_tracks = self.album_index.get((artist, album))
+        if album_tracks is None:
+            album_tracks = self.album_index[(artist, album)] = []
+            albums = self._albums[artist]
+            albums.insert(_bisect_right(albums, album), album)
+        sort_key = self._track_sort_key
+        album_tracks.insert(_bisect_right(album_tracks, sort_key(idx), sort_key), idx)
+
+    def _unindex(self, idx):
+        artist, album = self._keys_for(idx)
+        album_tracks = self.album_index.get((artist, album), [])
+        if idx in album_tracks:
+            album_tracks.remove(idx)
+            if not album_tracks:
+                del self.album_index[(artist, album)]
+                albums = self._albums[artist]
+                del albums[_bisect_right(albums, album) - 1]
+        artist_tracks = self.artist_index.get(artist, [])
+        if idx in artist_tracks:
+            artist_tracks.remove(idx)
+            if not artist_tracks:
+                del self.artist_index[artist]
+                del self._albums[artist]
+                del self._artists[_bisect_right(self._artists, artist) - 1]
 
     def _track_sort_key(self, idx):
         track = self.tracks[idx]
-        # Numbered tracks first; then title.
+        # Numbered tracks first; then title; then slot, so ties sort the same
+        # whether inserted one by one or rebuilt from scratch.
         number = track.track_number if track.track_number is not None else 10_000_000
-        return (number, track.title)
+        return (number, track.title, idx)
+
+    def snapshot(self):
+        """
+        Plain-data (JSON-friendly) copy of the indexes, pre-sorted in display
+        order, so a cached library can be restored without re-deriving them.
+        """
+        albums = []
+        for artist in self._artists:
+            for album in self._albums[artist]:
+                albums.append([artist, album, self.album_index[(artist, album)]])
+        return {"albums": albums}
+
+    def _load_snapshot(self, snapshot):
+        count = len(self.tracks)
+        previous = None
+        for artist, album, indices in snapshot["albums"]:
+            for idx in indices:
+                if not 0 <= idx < count:
+                    raise ValueError("snapshot index out of range")
+                if self.tracks[idx] is None or self._keys_for(idx) != (artist, album):
+                    raise ValueError("snapshot does not match tracks")
+            # Entries arrive in display order; that is what lets us skip sorting.
+            if previous is not None and not previous < (artist, album):
+                raise ValueError("snapshot out of order")
+            previous = (artist, album)
+            if artist not in self.artist_index:
+                self.artist_index[artist] = []
+                self._artists.append(artist)
+                self._albums[artist] = []
+            self.artist_index[artist].extend(indices)
+            self._albums[artist].append(album)
+            self.album_index[(artist, album)] = list(indices)
@@ -63,7 +63,8 @@ class PlayerState:
     """State shared across screens and platform implementations."""
 
     def __init__(self, tracks=None):
-        self.tracks = tracks or []
+        # Keep the caller's list (even if empty) so later appends stay shared.
+        self.tracks = tracks if tracks is not None else []
         # Root navigation
         self.root_index = 0  # which root menu item is highlighted
         self.current_screen = ScreenID.ROOT
@@ -72,7 +73,30 @@ class PlayerState:
         self.selected_artist_index = 0
         self.selected_album_index = 0
         self.selected_track_index = 0
+        # First visible row of each list; kept so the selection stays on screen.
+        self.artist_scroll_offset = 0
+        self.album_scroll_offset = 0
+        self.track_scroll_offset = 0
         # Playback
         self.playing_index = None
         self.is_playing = False
         self.volume = 50  # 0-100
+        self.shuffle = False  # applies to queues started from now on
+
+    def view_key(self):
+        """
+        Tuple of every field the UI draws from (scroll offsets are derived
+        at render time, so they are left out). Equal keys mean an identical frame.
+        """
+        return (
+            self.current_screen,
+            self.root_index,
+            self.library_level,
+            self.selected_artist_index,
+            self.selected_album_index,
+            self.selected_track_index,
+            self.playing_index,
+            self.is_playing,
+            self.volume,
+            self.shuffle,
+        )
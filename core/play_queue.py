@@ -0,0 +1,107 @@
+import random
+from array import array
+
+
+def queue_items(library, artist=None, album=None):
+    """
+    Track indices to play, in display order, as a compact array: one album,
+    every album of one artist, or (with neither given) the whole library.
+    """
+    if album is not None:
+        return array("I", library.tracks_for(artist, album))
+    artists = [artist] if artist is not None else library.artists()
+    items = array("I")
+    for name in artists:
+        for title in library.albums_for_artist(name):
+            items.extend(library.tracks_for(name, title))
+    return items
+
+
+def _randbelow(n):
+    """Uniform random integer in [0, n), from `getrandbits` (which MicroPython always has)."""
+    bits = 1
+    while (1 << bits) < n:
+        bits += 1
+    while True:
+        r = random.getrandbits(bits)
+        if r < n:
+            return r
+
+
+def _shuffled_positions(n, first):
+    """Random permutation of range(n) starting with `first`: in-place Fisher-Yates over the rest."""
+    order = array("H" if n <= 0x10000 else "I", range(n))
+    order[0], order[first] = first, 0
+    for i in range(n - 1, 1, -1):
+        j = 1 + _randbelow(i)
+        order[i], order[j] = order[j], order[i]
+    return order
+
+
+class PlayQueue:
+    """
+    Playback order over `items` (track indices; any indexable, e.g. an array
+    or a range) with O(1) next/previous.
+
+    Shuffle never copies `items`: it permutes an array of positions into it
+    (2 bytes per track up to 65536 tracks, 4 beyond) with Fisher-Yates, so
+    every order that begins with `items[start]` is equally likely.
+    """
+
+    def __init__(self, items, start=0, shuffle=False):
+        self.items = items
+        self.shuffle = shuffle
+        self._order = _shuffled_positions(len(items), start) if shuffle and items else None
+        self.position = 0 if shuffle else start
+        self._dropped = None  # set of track indices to skip, once any are dropped
+
+    def __len__(self):
+        return len(self.items)
+
+    def _at(self, position):
+        if self._order is not None:
+            return self.items[self._order[position]]
+        return self.items[position]
+
+    def _seek(self, position, step):
+        """First position from `position` (moving by `step`) whose track was not dropped, or None."""
+        while 0 <= position < len(self.items):
+            if self._dropped is None or self._at(position) not in self._dropped:
+                return position
+            position += step
+        return None
+
+    def drop(self, indices):
+        """
+        Skip track indices whose library slots were removed or reused since the
+        queue was built; next/prev/peek_next pass over them from now on.
+        """
+        if self._dropped is None:
+            self._dropped = set()
+        self._dropped.update(indices)
+
+    def current(self):
+        if not self.items:
+            return None
+        return self._at(self.position)
+
+    def peek_next(self):
+        """Track index that `next()` would move to, or None at the end."""
+        position = self._seek(self.position + 1, 1)
+        return None if position is None else self._at(position)
+
+    def next(self):
+        """Advance and return the new track index, or None (staying put) at the end."""
+        position = self._seek(self.position + 1, 1)
+        if position is None:
+            return None
+        self.position = position
+        return self._at(position)
+
+    def prev(self):
+        """Step back and return the new track index, or None (staying put) at the start."""
+        position = self._seek(self.position - 1, -1)
+        if position is None:
+            return None
+        self.position = position
+        return self._at(position)
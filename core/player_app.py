@@ -7,42 +7,150 @@ except ImportError:
 from .library import Library, UNKNOWN_ALBUM, UNKNOWN_ARTIST
 from .interfaces import AudioBackend, Screen
 from .models import ButtonEvent, LibraryLevel, PlayerState, ScreenID, Track
+from .play_queue import PlayQueue, queue_items
+
+# Page length for screens that don't report `visible_rows()`.
+DEFAULT_PAGE_ROWS = 10
 
 
 class PlayerApp:
     """Hardware-agnostic state machine for the MP3 player."""
 
-    def __init__(self, state: PlayerState, screen: Screen, audio_backend: AudioBackend) -> None:
+    def __init__(
+        self,
+        state: PlayerState,
+        screen: Screen,
+        audio_backend: AudioBackend,
+        library: Optional[Library] = None,
+    ) -> None:
         self.state = state
         self.screen = screen
         self.audio_backend = audio_backend
-        self.library = Library(state.tracks)
+        # Callers may pass a prebuilt (e.g. cached) Library over the same track list.
+        self.library = library if library is not None else Library(state.tracks)
         self._root_items: List[ScreenID] = [
             ScreenID.LIBRARY,
             ScreenID.NOW_PLAYING,
             ScreenID.SETTINGS,
         ]
+        # Playback order; set whenever playback starts from the library.
+        self.queue: Optional[PlayQueue] = None
+        if hasattr(audio_backend, "on_track_end"):
+            audio_backend.on_track_end = self.track_finished
+        # View key of the last rendered frame; None until the first render.
+        self._rendered_key = None
+        self.renders_performed = 0
+        self.renders_skipped = 0
+        # False when a scheduler calls render_if_changed() itself (coalescing
+        # several updates into one frame); input then only updates state.
+        self.auto_render = True
 
     def handle_button(self, event: ButtonEvent) -> None:
-        """Dispatch button input based on the current screen, then render."""
-        if event in (ButtonEvent.VOLUME_UP, ButtonEvent.VOLUME_DOWN):
-            self._handle_volume(event)
-            self.render()
-            return
+        """
+        Dispatch button input based on the current screen, then render if
+        anything visible changed (no-op keys leave the screen untouched) and
+        `auto_render` is on.
+        """
+        self._dispatch(event, 1)
+        self._updated()
 
-        if self.state.current_screen == ScreenID.ROOT:
-            self._handle_root_input(event)
+    def handle_batch(self, moves) -> None:
+        """
+        Apply a batch of (event, steps) moves, e.g. from `InputCoalescer`,
+        then render once. `steps` repeats UP/DOWN and volume events in a
+        single move (`DOWN x 37` is one clamp, not 37 updates); other events
+        are applied once.
+        """
+        for event, steps in moves:
+            self._dispatch(event, steps)
+        self._updated()
+
+    def page_rows(self) -> int:
+        """Rows in one page of the current list (a page jump's length)."""
+        rows = self._list_rows()
+        return rows if rows is not None else DEFAULT_PAGE_ROWS
+
+    def _dispatch(self, event: ButtonEvent, steps: int) -> None:
+        if event in (ButtonEvent.VOLUME_UP, ButtonEvent.VOLUME_DOWN):
+            self._handle_volume(event, steps)
+        elif self.state.current_screen == ScreenID.ROOT:
+            self._handle_root_input(event, steps)
         elif self.state.current_screen == ScreenID.LIBRARY:
-            self._handle_library_input(event)
+            self._handle_library_input(event, steps)
         elif self.state.current_screen == ScreenID.NOW_PLAYING:
-            self._handle_now_playing_input(event)
+            self._handle_now_playing_input(event, steps)
         elif self.state.current_screen == ScreenID.SETTINGS:
             self._handle_settings_input(event)
 
+    def add_tracks(self, tracks: List[Track]) -> List[int]:
+        """
+        Append a batch of tracks while the app is running (e.g. from a streaming
+        scan) and re-render. Returns the indices the tracks were stored at.
+        """
+        return self.apply_changes(added=tracks)
+
+    def apply_changes(self, added=(), removed=(), modified=()) -> List[int]:
+        """
+        `Library.apply_changes` for a running app (scan batches, tags parsed
+        after them), followed by a re-render. The highlighted artist stays on
+        the same name even if other artists sort in before it, and the queue
+        never plays a slot that was removed or reused under it.
+        """
+        if not (added or removed or modified):
+            return []
+        anchor = self._current_artist_label() if self.library.artist_index else None
+        # Slots that stop holding the file they held (removed, or re-pointed at
+        # another path) must leave the queue before `added` can reuse them.
+        stale = list(removed)
+        for idx, track in modified:
+            old = self._track_at(idx)
+            if old is not None and old.path != track.path:
+                stale.append(idx)
+        assigned = self.library.apply_changes(added, removed, modified)
+        if stale:
+            self._forget_tracks(stale)
+        if anchor is not None:
+            position = self.library.artist_position(anchor)
+            if position is not None:
+                self.state.selected_artist_index = position
+        if self.auto_render:
+            self.render()
+        return assigned
+
+    def track_finished(self, gapless: bool = False) -> None:
+        """
+        End-of-track callback from the audio backend: advance the queue with
+        no user input. With `gapless` the backend has already started the
+        preloaded next track, so only the state catches up.
+        """
+        next_index = self._step_queue(1)
+        if next_index is None:
+            self.state.is_playing = False
+        elif gapless:
+            self.state.playing_index = next_index
+            self._preload_next(next_index)
+        else:
+            self._start_playback(next_index, jump_to_now_playing=False)
+        self._updated()
+
+    def _view_key(self) -> tuple:
+        return (self.state.view_key(), self.library.version)
+
+    def _updated(self) -> None:
+        if self.auto_render:
+            self.render_if_changed()
+
+    def render_if_changed(self) -> None:
+        """Render unless the screen would be identical to the last frame."""
+        if self._view_key() == self._rendered_key:
+            self.renders_skipped += 1
+            return
         self.render()
 
     def render(self) -> None:
         """Render the current screen."""
+        self._rendered_key = self._view_key()
+        self.renders_performed += 1
         self.screen.clear()
         if self.state.current_screen == ScreenID.ROOT:
             self._render_root()
@@ -56,42 +164,49 @@ class PlayerApp:
 
     # Input handling
 
-    def _handle_root_input(self, event: ButtonEvent) -> None:
+    def _handle_root_input(self, event: ButtonEvent, steps: int) -> None:
         if event == ButtonEvent.UP:
-            self._move_root_selection(-1)
+            self._move_root_selection(-steps)
         elif event == ButtonEvent.DOWN:
-            self._move_root_selection(1)
+            self._move_root_selection(steps)
         elif event in (ButtonEvent.RIGHT, ButtonEvent.SELECT):
             self._enter_root_item()
+        elif event == ButtonEvent.PLAY_PAUSE and self._root_items[self.state.root_index] == ScreenID.LIBRARY:
+            self._play_queue(queue_items(self.library))
         # LEFT/BACK: no-op at root
 
-    def _handle_library_input(self, event: ButtonEvent) -> None:
+    def _handle_library_input(self, event: ButtonEvent, steps: int) -> None:
         level = self.state.library_level
         if level == LibraryLevel.ARTISTS:
             if event == ButtonEvent.UP:
-                self._move_artist_selection(-1)
+                self._move_artist_selection(-steps)
             elif event == ButtonEvent.DOWN:
-                self._move_artist_selection(1)
+                self._move_artist_selection(steps)
             elif event in (ButtonEvent.SELECT, ButtonEvent.RIGHT):
                 self._enter_albums()
+            elif event == ButtonEvent.PLAY_PAUSE and self.library.artists():
+                self._play_queue(queue_items(self.library, self._current_artist_label()))
             elif event in (ButtonEvent.LEFT, ButtonEvent.BACK):
                 self._go_to_root(ScreenID.LIBRARY)
         elif level == LibraryLevel.ALBUMS:
             if event == ButtonEvent.UP:
-                self._move_album_selection(-1)
+                self._move_album_selection(-steps)
             elif event == ButtonEvent.DOWN:
-                self._move_album_selection(1)
+                self._move_album_selection(steps)
             elif event in (ButtonEvent.SELECT, ButtonEvent.RIGHT):
                 self._enter_tracks()
+            elif event == ButtonEvent.PLAY_PAUSE:
+                artist = self._current_artist_label()
+                self._play_queue(queue_items(self.library, artist, self._current_album_label(artist)))
             elif event in (ButtonEvent.LEFT, ButtonEvent.BACK):
                 self.state.library_level = LibraryLevel.ARTISTS
                 self.state.selected_album_index = 0
                 self.state.selected_track_index = 0
         elif level == LibraryLevel.TRACKS:
             if event == ButtonEvent.UP:
-                self._move_track_selection(-1)
+                self._move_track_selection(-steps)
             elif event == ButtonEvent.DOWN:
-                self._move_track_selection(1)
+                self._move_track_selection(steps)
             elif event in (ButtonEvent.SELECT, ButtonEvent.RIGHT):
                 self._play_selected_track_and_jump()
             elif event == ButtonEvent.PLAY_PAUSE:
@@ -100,17 +215,21 @@ class PlayerApp:
                 self.state.library_level = LibraryLevel.ALBUMS
                 self.state.selected_track_index = 0
 
-    def _handle_now_playing_input(self, event: ButtonEvent) -> None:
+    def _handle_now_playing_input(self, event: ButtonEvent, steps: int) -> None:
         if event in (ButtonEvent.LEFT, ButtonEvent.BACK):
             self._go_to_root(ScreenID.NOW_PLAYING)
         elif event == ButtonEvent.PLAY_PAUSE:
             self._toggle_play_pause_on_index(self.state.playing_index)
-        # Other keys: no-op for now.
+        elif event == ButtonEvent.UP:
+            self._skip_track(-steps)
+        elif event == ButtonEvent.DOWN:
+            self._skip_track(steps)
 
     def _handle_settings_input(self, event: ButtonEvent) -> None:
         if event in (ButtonEvent.LEFT, ButtonEvent.BACK):
             self._go_to_root(ScreenID.SETTINGS)
-        # Other keys: no-op for now.
+        elif event in (ButtonEvent.SELECT, ButtonEvent.RIGHT):
+            self.state.shuffle = not self.state.shuffle
 
     # Rendering helpers
 
@@ -135,8 +254,10 @@ class PlayerApp:
         if not artists:
             self.screen.draw_text(0, 1, "(no tracks)")
             return
-        for idx, artist in enumerate(artists):
-            self._draw_row(idx + 1, artist, highlighted=idx == self.state.selected_artist_index)
+        selected = self.state.selected_artist_index
+        start, stop = self._window("artist_scroll_offset", selected, len(artists))
+        for idx in range(start, stop):
+            self._draw_row(idx - start + 1, artists[idx], highlighted=idx == selected)
 
     def _render_albums(self) -> None:
         artist = self._current_artist_label()
@@ -145,8 +266,10 @@ class PlayerApp:
         if not albums:
             self.screen.draw_text(0, 1, "(no albums)")
             return
-        for idx, album in enumerate(albums):
-            self._draw_row(idx + 1, album, highlighted=idx == self.state.selected_album_index)
+        selected = self.state.selected_album_index
+        start, stop = self._window("album_scroll_offset", selected, len(albums))
+        for idx in range(start, stop):
+            self._draw_row(idx - start + 1, albums[idx], highlighted=idx == selected)
 
     def _render_tracks(self) -> None:
         artist = self._current_artist_label()
@@ -156,9 +279,36 @@ class PlayerApp:
         if not tracks:
             self.screen.draw_text(0, 1, "(no tracks)")
             return
-        for idx, track_idx in enumerate(tracks):
-            track = self.state.tracks[track_idx]
-            self._draw_row(idx + 1, track.title, highlighted=idx == self.state.selected_track_index)
+        selected = self.state.selected_track_index
+        start, stop = self._window("track_scroll_offset", selected, len(tracks))
+        for idx in range(start, stop):
+            track = self.state.tracks[tracks[idx]]
+            self._draw_row(idx - start + 1, track.title, highlighted=idx == selected)
+
+    def _list_rows(self) -> Optional[int]:
+        """Rows available below the header, or None if the screen is unbounded."""
+        visible_rows = getattr(self.screen, "visible_rows", None)
+        if visible_rows is None:
+            return None
+        return max(1, visible_rows() - 1)
+
+    def _window(self, offset_attr: str, selected: int, count: int) -> tuple:
+        """
+        Return the (start, stop) slice of a `count`-item list to draw, scrolling
+        the stored offset just enough to keep `selected` visible.
+        """
+        rows = self._list_rows()
+        if rows is None or count <= rows:
+            setattr(self.state, offset_attr, 0)
+            return 0, count
+        offset = getattr(self.state, offset_attr)
+        if selected < offset:
+            offset = selected
+        elif selected >= offset + rows:
+            offset = selected - rows + 1
+        offset = max(0, min(offset, count - rows))
+        setattr(self.state, offset_attr, offset)
+        return offset, offset + rows
 
     def _render_now_playing(self) -> None:
         self.screen.draw_text(0, 0, "Now Playing")
@@ -170,12 +320,18 @@ class PlayerApp:
         status = "Playing" if self.state.is_playing else "Paused"
         artist = track.artist if track.artist else UNKNOWN_ARTIST
         self.screen.draw_text(0, 1, f"{track.title} - {artist}")
-        self.screen.draw_text(0, 2, f"{status}")
+        duration = self._format_duration(track.duration_secs)
+        self.screen.draw_text(0, 2, f"{status} {duration}" if duration else status)
         self.screen.draw_text(0, 3, f"Vol: {self.state.volume}")
 
+    def _format_duration(self, secs: Optional[int]) -> str:
+        if not secs:
+            return ""
+        return f"{secs // 60}:{secs % 60:02d}"
+
     def _render_settings(self) -> None:
         self.screen.draw_text(0, 0, "Settings")
-        self.screen.draw_text(0, 1, "(stub)")
+        self._draw_row(1, f"Shuffle: {'On' if self.state.shuffle else 'Off'}", highlighted=True)
 
     # Playback helpers
 
@@ -197,19 +353,17 @@ class PlayerApp:
 
         if self.state.playing_index == target_index and not self.state.is_playing:
             self.audio_backend.resume()
+            self.state.is_playing = True
         else:
             # Start or switch track.
-            self.audio_backend.play(track)
-            self.state.playing_index = target_index
-
-        self.state.is_playing = True
+            self._begin_track(target_index, track)
 
-    def _handle_volume(self, event: ButtonEvent) -> None:
+    def _handle_volume(self, event: ButtonEvent, steps: int = 1) -> None:
         delta = 0
         if event == ButtonEvent.VOLUME_UP:
-            delta = 5
+            delta = 5 * steps
         elif event == ButtonEvent.VOLUME_DOWN:
-            delta = -5
+            delta = -5 * steps
         if delta == 0:
             return
         new_level = max(0, min(100, self.state.volume + delta))
@@ -221,27 +375,104 @@ class PlayerApp:
         idx = self._current_track_index_from_library()
         if idx is None:
             return
+        self.queue = self._album_queue_from_selection()
         self._start_playback(idx, jump_to_now_playing=True)
 
     def _play_pause_selected_track(self) -> None:
         idx = self._current_track_index_from_library()
         if idx is None:
             return
+        if idx != self.state.playing_index:
+            self.queue = self._album_queue_from_selection()
         self._toggle_play_pause_on_index(idx)
 
+    def _album_queue_from_selection(self) -> PlayQueue:
+        """Queue the selected album, starting at the selected track."""
+        artist = self._current_artist_label()
+        items = queue_items(self.library, artist, self._current_album_label(artist))
+        start = max(0, min(self.state.selected_track_index, len(items) - 1))
+        return PlayQueue(items, start, self.state.shuffle)
+
+    def _play_queue(self, items) -> None:
+        """Start playing `items` (track indices) from the top, shuffled if enabled."""
+        if not items:
+            return
+        self.queue = PlayQueue(items, shuffle=self.state.shuffle)
+        index = self.queue.current()
+        if self._track_at(index) is None:
+            index = self._step_queue(1)
+            if index is None:
+                return
+        self._start_playback(index, jump_to_now_playing=False)
+
+    def _step_queue(self, direction: int) -> Optional[int]:
+        """Move `direction` (+1/-1) along the queue, skipping removed tracks; None at either end."""
+        if self.queue is None:
+            return None
+        while True:
+            index = self.queue.next() if direction > 0 else self.queue.prev()
+            if index is None or self._track_at(index) is not None:
+                return index
+
+    def _skip_track(self, delta: int) -> None:
+        """Move `delta` tracks along the queue (stopping at either end), then start that track once."""
+        index = None
+        for _ in range(abs(delta)):
+            step = self._step_queue(1 if delta > 0 else -1)
+            if step is None:
+                break
+            index = step
+        if index is not None:
+            self._start_playback(index, jump_to_now_playing=False)
+
     def _start_playback(self, target_index: int, jump_to_now_playing: bool) -> None:
         if self.state.playing_index is not None and self.state.playing_index != target_index:
             self.audio_backend.stop()
         track = self._track_at(target_index)
-        if track is None:
+        if track is None or not self._begin_track(target_index, track):
             return
-        self.audio_backend.play(track)
-        self.state.playing_index = target_index
-        self.state.is_playing = True
         if jump_to_now_playing:
             self.state.current_screen = ScreenID.NOW_PLAYING
             self.state.root_index = self._root_index_for(ScreenID.NOW_PLAYING)
 
+    def _begin_track(self, index: int, track: Track) -> bool:
+        """
+        Start `track` on the backend and mark it playing. A track the backend
+        cannot open (OSError/ValueError from `play`) leaves playback stopped.
+        """
+        try:
+            self.audio_backend.play(track)
+        except (OSError, ValueError):
+            self.state.playing_index = None
+            self.state.is_playing = False
+            return False
+        self.state.playing_index = index
+        self.state.is_playing = True
+        self._preload_next(index)
+        return True
+
+    def _forget_tracks(self, indices: List[int]) -> None:
+        """Stop a track whose slot went stale and drop stale slots from the queue."""
+        if self.state.playing_index in indices:
+            self.audio_backend.stop()
+            self.state.playing_index = None
+            self.state.is_playing = False
+        if self.queue is None:
+            return
+        upcoming = self.queue.peek_next()
+        self.queue.drop(indices)
+        if self.state.playing_index is not None and self.queue.peek_next() != upcoming:
+            self._preload_next(self.state.playing_index)  # the buffered next track is gone
+
+    def _preload_next(self, index: int) -> None:
+        """Let a backend that supports it buffer the queue's next track ahead of time."""
+        preload = getattr(self.audio_backend, "preload", None)
+        if preload is None or self.queue is None or self.queue.current() != index:
+            return
+        track = self._track_at(self.queue.peek_next())
+        if track is not None:
+            preload(track)
+
     # Selection helpers
 
     def _move_root_selection(self, delta: int) -> None:
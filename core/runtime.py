@@ -0,0 +1,98 @@
+"""
+Cooperative runtime: one asyncio loop drives a PlayerApp.
+
+Input sources, timers and background work never touch the app directly.
+They `post` button events or `call` functions onto one queue, and a single
+dispatcher task applies them in order, so the app needs no locks. Only
+`Event`, `create_task`, `sleep`, `gather` and `run` are used, which
+MicroPython's asyncio (uasyncio) provides too.
+"""
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+
+
+class Runtime:
+    """
+    Event dispatcher for `app` plus helpers to run tasks beside it.
+
+    `on_render`, if set, is called after any dispatched item that made the
+    app render.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.running = False
+        self.on_render = None
+        self.dispatched = 0
+        self.error = None  # first exception raised by a task; `run` re-raises it
+        self._pending = []  # (fn, args); fn None means args is a ButtonEvent
+        self._wake = asyncio.Event()
+        self._done = asyncio.Event()
+
+    def post(self, event):
+        """Queue a button event for `app.handle_button`."""
+        self._pending.append((None, event))
+        self._wake.set()
+
+    def call(self, fn, *args):
+        """Queue `fn(*args)` to run on the dispatcher, in order with input events."""
+        self._pending.append((fn, args))
+        self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._done.set()
+        self._wake.set()
+
+    async def dispatch(self):
+        while self.running:
+            await self._wake.wait()
+            self._wake.clear()
+            pending, self._pending = self._pending, []
+            for fn, args in pending:
+                if not self.running:
+                    break
+                self._apply(fn, args)
+
+    def _apply(self, fn, args):
+        renders = self.app.renders_performed
+        if fn is None:
+            self.app.handle_button(args)
+        else:
+            fn(*args)
+        self.dispatched += 1
+        if self.on_render is not None and self.app.renders_performed != renders:
+            self.on_render()
+
+    async def every(self, interval_ms, fn):
+        """Task body: queue `fn()` every `interval_ms` until the runtime stops."""
+        while self.running:
+            await asyncio.sleep(interval_ms / 1000)
+            self.call(fn)
+
+    async def _guard(self, coro):
+        try:
+            await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if self.error is None:
+                self.error = exc
+            self.stop()
+
+    async def run(self, *coros):
+        """Run the dispatcher and `coros` as tasks until `stop()` (or a task fails)."""
+        self.running = True
+        self._done.clear()
+        tasks = [asyncio.create_task(self._guard(self.dispatch()))]
+        for coro in coros:
+            tasks.append(asyncio.create_task(self._guard(coro)))
+        await self._done.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.error is not None:
+            raise self.error
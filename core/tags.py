@@ -0,0 +1,469 @@
+"""
+Header-only metadata extraction for .mp3, .flac and .wav files.
+
+Pure Python with no imports so it runs on CPython and MicroPython alike.
+Only the header bytes needed are read (bounded reads, large frames such as
+cover art are skipped with seek), and durations come from header fields
+rather than decoding audio.
+"""
+
+# Read caps; anything larger is skipped rather than loaded.
+MAX_TEXT_FRAME = 1024  # one ID3 text frame
+MAX_COMMENT_BLOCK = 65536  # FLAC VORBIS_COMMENT / WAV LIST chunk
+MAX_SYNC_SCAN = 65536  # bytes searched for the first MPEG frame
+_SCAN_CHUNK = 4096
+_MAX_CHUNKS = 64  # RIFF chunks / FLAC blocks walked before giving up
+
+
+class TagInfo:
+    """Metadata found in a file header; fields are None when not present."""
+
+    def __init__(self):
+        self.title = None
+        self.artist = None
+        self.album = None
+        self.track_number = None
+        self.duration_secs = None
+
+
+def read_tags(path):
+    """Read metadata for `path` based on its extension; unknown types give an empty TagInfo."""
+    lower = path.lower()
+    if lower.endswith(".mp3"):
+        parser = parse_mp3
+    elif lower.endswith(".flac"):
+        parser = parse_flac
+    elif lower.endswith(".wav"):
+        parser = parse_wav
+    else:
+        return TagInfo()
+    with open(path, "rb") as f:
+        return parser(f)
+
+
+# Shared helpers
+
+
+def _be(data):
+    return int.from_bytes(data, "big")
+
+
+def _le(data):
+    return int.from_bytes(data, "little")
+
+
+def _syncsafe(data):
+    value = 0
+    for byte in data:
+        value = (value << 7) | (byte & 0x7F)
+    return value
+
+
+def _file_size(f):
+    f.seek(0, 2)
+    size = f.tell()
+    return size
+
+
+def _latin1(data):
+    return "".join([chr(b) for b in data])
+
+
+def _utf16(data, big_endian):
+    chars = []
+    i = 0
+    n = len(data) - 1
+    while i < n:
+        unit = (data[i] << 8) | data[i + 1] if big_endian else data[i] | (data[i + 1] << 8)
+        i += 2
+        if 0xD800 <= unit < 0xDC00 and i < n:
+            low = (data[i] << 8) | data[i + 1] if big_endian else data[i] | (data[i + 1] << 8)
+            if 0xDC00 <= low < 0xE000:
+                i += 2
+                unit = 0x10000 + ((unit - 0xD800) << 10) + (low - 0xDC00)
+        chars.append(chr(unit))
+    return "".join(chars)
+
+
+def _utf8(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeError:
+        return _latin1(data)
+
+
+def _clean(text):
+    if text is None:
+        return None
+    text = text.strip("\x00").strip()
+    return text if text else None
+
+
+def _track_number(text):
+    """Parse "3", "03" or "3/12" into an int; absurd values (over 0x7FFFFFFF) give None."""
+    text = _clean(text)
+    if text is None:
+        return None
+    digits = text.split("/")[0].strip()
+    if not digits.isdigit():
+        return None
+    number = int(digits)
+    return number if number <= 0x7FFFFFFF else None
+
+
+def _seconds(value):
+    return int(value + 0.5)
+
+
+def _apply_field(info, key, value):
+    """Store a text field by canonical key if it is not already set."""
+    if key == "title" and info.title is None:
+        info.title = _clean(value)
+    elif key == "artist" and info.artist is None:
+        info.artist = _clean(value)
+    elif key == "album" and info.album is None:
+        info.album = _clean(value)
+    elif key == "track" and info.track_number is None:
+        info.track_number = _track_number(value)
+
+
+# MP3: ID3v2 / ID3v1 tags + first MPEG frame (Xing/Info/VBRI or CBR estimate)
+
+_ID3_FIELDS = {
+    "TIT2": "title",
+    "TPE1": "artist",
+    "TALB": "album",
+    "TRCK": "track",
+    "TT2": "title",
+    "TP1": "artist",
+    "TAL": "album",
+    "TRK": "track",
+}
+
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Version bits -> (table version, sample rates); 1 is reserved.
+_MPEG_VERSIONS = {
+    0: (2, (11025, 12000, 8000)),  # MPEG 2.5
+    2: (2, (22050, 24000, 16000)),  # MPEG 2
+    3: (1, (44100, 48000, 32000)),  # MPEG 1
+}
+
+
+def _decode_id3_text(data):
+    if not data:
+        return None
+    encoding = data[0]
+    body = data[1:]
+    if encoding == 1 or encoding == 2:
+        # UTF-16 (BOM) / UTF-16BE; values end at a double null on a code unit boundary.
+        big_endian = encoding == 2
+        if body[:2] == b"\xff\xfe":
+            big_endian, body = False, body[2:]
+        elif body[:2] == b"\xfe\xff":
+            big_endian, body = True, body[2:]
+        end = 0
+        while end + 1 < len(body) and not (body[end] == 0 and body[end + 1] == 0):
+            end += 2
+        return _utf16(body[:end], big_endian)
+    end = body.find(b"\x00")
+    if end >= 0:
+        body = body[:end]
+    return _utf8(body) if encoding == 3 else _latin1(body)
+
+
+def _read_id3v2(f, info):
+    """Parse an ID3v2 tag at the current position; return the offset where audio starts."""
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    major = header[3]
+    flags = header[5]
+    tag_end = 10 + _syncsafe(header[6:10])
+    if major == 4 and flags & 0x10:
+        tag_end += 10  # footer
+    if major < 2 or major > 4:
+        return tag_end
+
+    pos = 10
+    if flags & 0x40 and major >= 3:
+        ext = f.read(4)
+        pos += _syncsafe(ext) if major == 4 else 4 + _be(ext)
+    unsync = flags & 0x80 and major < 4
+    header_len = 6 if major == 2 else 10
+
+    while pos + header_len <= tag_end:
+        f.seek(pos)
+        frame = f.read(header_len)
+        if len(frame) < header_len or frame[0] == 0:
+            break  # padding
+        if major == 2:
+            frame_id = _latin1(frame[:3])
+            size = _be(frame[3:6])
+            fmt_flags = 0
+        else:
+            frame_id = _latin1(frame[:4])
+            size = _syncsafe(frame[4:8]) if major == 4 else _be(frame[4:8])
+            fmt_flags = frame[9]
+        pos += header_len
+        key = _ID3_FIELDS.get(frame_id)
+        if key is not None and 0 < size <= MAX_TEXT_FRAME:
+            # Skip compressed/encrypted frames (v2.3: 0x80/0x40, v2.4: 0x08/0x04).
+            skip = fmt_flags & (0xC0 if major == 3 else 0x0C)
+            if not skip:
+                data = f.read(size)
+                if major == 4 and fmt_flags & 0x01:
+                    data = data[4:]  # data length indicator
+                if unsync or (major == 4 and fmt_flags & 0x02):
+                    data = data.replace(b"\xff\x00", b"\xff")
+                _apply_field(info, key, _decode_id3_text(data))
+        pos += size
+    return tag_end
+
+
+def _read_id3v1(f, info, file_size):
+    """Fill missing fields from a trailing ID3v1 tag; return its size (0 or 128)."""
+    if file_size < 128:
+        return 0
+    f.seek(file_size - 128)
+    data = f.read(128)
+    if data[:3] != b"TAG":
+        return 0
+    _apply_field(info, "title", _latin1(data[3:33]))
+    _apply_field(info, "artist", _latin1(data[33:63]))
+    _apply_field(info, "album", _latin1(data[63:93]))
+    if data[125] == 0 and data[126] != 0 and info.track_number is None:
+        info.track_number = data[126]
+    return 128
+
+
+def _parse_frame_header(b):
+    """Return (table_version, layer, bitrate_kbps, sample_rate, mono, frame_len) or None."""
+    if b[0] != 0xFF or (b[1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (b[1] >> 3) & 0x03
+    layer = 4 - ((b[1] >> 1) & 0x03)
+    bitrate_idx = b[2] >> 4
+    rate_idx = (b[2] >> 2) & 0x03
+    if version_bits not in _MPEG_VERSIONS or layer == 4 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    version, rates = _MPEG_VERSIONS[version_bits]
+    bitrate = _BITRATES[(version, layer)][bitrate_idx]
+    sample_rate = rates[rate_idx]
+    padding = (b[2] >> 1) & 0x01
+    if layer == 1:
+        frame_len = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 3 and version == 2:
+        frame_len = 72 * bitrate * 1000 // sample_rate + padding
+    else:
+        frame_len = 144 * bitrate * 1000 // sample_rate + padding
+    return version, layer, bitrate, sample_rate, (b[3] >> 6) == 3, frame_len
+
+
+def _find_first_frame(f, start):
+    """Scan at most MAX_SYNC_SCAN bytes from `start` for an MPEG frame; return (offset, bytes)."""
+    offset = start
+    carry = b""
+    while offset - start < MAX_SYNC_SCAN:
+        f.seek(offset)
+        chunk = f.read(_SCAN_CHUNK)
+        if not chunk:
+            return None
+        window = carry + chunk
+        base = offset - len(carry)
+        i = window.find(b"\xff")
+        while 0 <= i <= len(window) - 4:
+            if _parse_frame_header(window[i : i + 4]) is not None:
+                f.seek(base + i)
+                return base + i, f.read(256)
+            i = window.find(b"\xff", i + 1)
+        carry = window[-3:]
+        offset += len(chunk)
+    return None
+
+
+def parse_mp3(f):
+    info = TagInfo()
+    file_size = _file_size(f)
+    f.seek(0)
+    audio_start = _read_id3v2(f, info)
+    audio_end = file_size - _read_id3v1(f, info, file_size)
+
+    found = _find_first_frame(f, audio_start)
+    if found is None:
+        return info
+    offset, frame = found
+    version, layer, bitrate, sample_rate, mono, _ = _parse_frame_header(frame[:4])
+    samples_per_frame = 384 if layer == 1 else (576 if layer == 3 and version == 2 else 1152)
+
+    if version == 1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    xing = 4 + side_info
+    frames = None
+    if frame[xing : xing + 4] in (b"Xing", b"Info"):
+        if _be(frame[xing + 4 : xing + 8]) & 0x01:
+            frames = _be(frame[xing + 8 : xing + 12])
+    elif frame[36:40] == b"VBRI":
+        frames = _be(frame[50:54])
+
+    if frames:
+        info.duration_secs = _seconds(frames * samples_per_frame / sample_rate)
+    elif audio_end > offset:
+        info.duration_secs = _seconds((audio_end - offset) * 8 / (bitrate * 1000))
+    return info
+
+
+# FLAC: STREAMINFO + VORBIS_COMMENT metadata blocks
+
+_VORBIS_FIELDS = {"TITLE": "title", "ARTIST": "artist", "ALBUM": "album", "TRACKNUMBER": "track"}
+
+
+def _parse_vorbis_comment(data, info):
+    if len(data) < 8:
+        return
+    pos = 4 + _le(data[0:4])  # skip vendor string
+    if pos + 4 > len(data):
+        return
+    count = _le(data[pos : pos + 4])
+    pos += 4
+    for _ in range(count):
+        if pos + 4 > len(data):
+            return
+        length = _le(data[pos : pos + 4])
+        pos += 4
+        entry = data[pos : pos + length]
+        pos += length
+        eq = entry.find(b"=")
+        if eq <= 0:
+            continue
+        key = _VORBIS_FIELDS.get(_latin1(entry[:eq]).upper())
+        if key is not None:
+            _apply_field(info, key, _utf8(entry[eq + 1 :]))
+
+
+def parse_flac(f):
+    info = TagInfo()
+    f.seek(0)
+    start = _read_id3v2(f, TagInfo())  # tolerate (and ignore) a leading ID3 tag
+    f.seek(start)
+    if f.read(4) != b"fLaC":
+        return info
+    pos = start + 4
+    for _ in range(_MAX_CHUNKS):
+        f.seek(pos)
+        header = f.read(4)
+        if len(header) < 4:
+            break
+        last = header[0] & 0x80
+        block_type = header[0] & 0x7F
+        length = _be(header[1:4])
+        if block_type == 0 and length >= 18:
+            b = f.read(18)
+            sample_rate = (b[10] << 12) | (b[11] << 4) | (b[12] >> 4)
+            total = ((b[13] & 0x0F) << 32) | _be(b[14:18])
+            if sample_rate and total:
+                info.duration_secs = _seconds(total / sample_rate)
+        elif block_type == 4 and length <= MAX_COMMENT_BLOCK:
+            _parse_vorbis_comment(f.read(length), info)
+        pos += 4 + length
+        if last:
+            break
+    return info
+
+
+# WAV: RIFF fmt/data chunks + optional LIST/INFO
+
+_RIFF_INFO_FIELDS = {b"INAM": "title", b"IART": "artist", b"IPRD": "album", b"ITRK": "track", b"IPRT": "track"}
+
+
+def _parse_riff_info(data, info):
+    pos = 4  # after b"INFO"
+    while pos + 8 <= len(data):
+        key = _RIFF_INFO_FIELDS.get(data[pos : pos + 4])
+        length = _le(data[pos + 4 : pos + 8])
+        value = data[pos + 8 : pos + 8 + length]
+        if key is not None:
+            _apply_field(info, key, _utf8(value))
+        pos += 8 + length + (length & 1)
+
+
+class WavLayout:
+    """PCM format and data-chunk position of a WAV file (for streaming playback)."""
+
+    def __init__(self):
+        self.audio_format = None  # 1 = integer PCM
+        self.channels = None
+        self.sample_rate = None
+        self.byte_rate = None
+        self.block_align = None
+        self.bits_per_sample = None
+        self.data_offset = None
+        self.data_size = None
+
+
+def _riff_chunks(f, file_size):
+    """Yield (chunk_id, body_offset, size) with the file positioned at the body."""
+    pos = 12
+    for _ in range(_MAX_CHUNKS):
+        if pos + 8 > file_size:
+            return
+        f.seek(pos)
+        chunk = f.read(8)
+        size = _le(chunk[4:8])
+        yield chunk[:4], pos + 8, size
+        pos += 8 + size + (size & 1)
+
+
+def _is_wave(f):
+    f.seek(0)
+    header = f.read(12)
+    return len(header) == 12 and header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def read_wav_layout(f):
+    """Return the WavLayout of an open WAV file, or None without fmt and data chunks."""
+    if not _is_wave(f):
+        return None
+    file_size = _file_size(f)
+    layout = WavLayout()
+    for chunk_id, offset, size in _riff_chunks(f, file_size):
+        if chunk_id == b"fmt " and size >= 16:
+            fmt = f.read(16)
+            layout.audio_format = _le(fmt[0:2])
+            layout.channels = _le(fmt[2:4])
+            layout.sample_rate = _le(fmt[4:8])
+            layout.byte_rate = _le(fmt[8:12])
+            layout.block_align = _le(fmt[12:14])
+            layout.bits_per_sample = _le(fmt[14:16])
+        elif chunk_id == b"data":
+            layout.data_offset = offset
+            # Streams with an unknown length often store 0 or 0xFFFFFFFF here.
+            layout.data_size = size if 0 < size < 0xFFFFFFFF else file_size - offset
+            layout.data_size = min(layout.data_size, file_size - offset)
+            break
+    if layout.byte_rate is None or layout.data_offset is None:
+        return None
+    return layout
+
+
+def parse_wav(f):
+    info = TagInfo()
+    if not _is_wave(f):
+        return info
+    layout = read_wav_layout(f)
+    for chunk_id, _, size in _riff_chunks(f, _file_size(f)):
+        if chunk_id == b"LIST" and size <= MAX_COMMENT_BLOCK:
+            data = f.read(size)
+            if data[:4] == b"INFO":
+                _parse_riff_info(data, info)
+    if layout is not None and layout.byte_rate and layout.data_size:
+        info.duration_secs = _seconds(layout.data_size / layout.byte_rate)
+    return info
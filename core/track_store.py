@@ -0,0 +1,218 @@
+from array import array
+
+from .models import Track
+
+_NO_NUMBER = -1
+# Column limits: array("i") track numbers, array("I") durations, array("H") string lengths.
+MAX_TRACK_NUMBER = 0x7FFFFFFF
+MAX_DURATION = 0xFFFFFFFF
+MAX_STRING_BYTES = 0xFFFF
+
+
+def _clip_utf8(data, limit):
+    """Cut encoded text to at most `limit` bytes without splitting a character."""
+    if len(data) <= limit:
+        return data
+    end = limit
+    while end > 0 and data[end] & 0xC0 == 0x80:
+        end -= 1
+    return data[:end]
+
+
+class TrackView:
+    """Lightweight read-only Track stand-in for one TrackStore row."""
+
+    __slots__ = ("_store", "_idx")
+
+    def __init__(self, store, idx):
+        self._store = store
+        self._idx = idx
+
+    @property
+    def id(self):
+        return self._store.id_at(self._idx)
+
+    @property
+    def title(self):
+        return self._store.title_at(self._idx)
+
+    @property
+    def artist(self):
+        return self._store.artist_at(self._idx)
+
+    @property
+    def album(self):
+        return self._store.album_at(self._idx)
+
+    @property
+    def track_number(self):
+        return self._store.track_number_at(self._idx)
+
+    @property
+    def duration_secs(self):
+        return self._store.duration_at(self._idx)
+
+    @property
+    def path(self):
+        return self._store.path_at(self._idx)
+
+    def to_track(self):
+        return Track(
+            id=self.id,
+            title=self.title,
+            artist=self.artist,
+            album=self.album,
+            track_number=self.track_number,
+            duration_secs=self.duration_secs,
+            path=self.path,
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, TrackView) and other._store is self._store and other._idx == self._idx
+
+    def __hash__(self):
+        return hash((id(self._store), self._idx))
+
+
+class TrackStore:
+    """
+    Columnar, list-like track container for large libraries and small heaps.
+
+    Artist/album names are interned in a string table, numbers and durations
+    live in typed arrays, and titles/paths are packed UTF-8 blobs addressed by
+    offset. Indexing returns a TrackView (or None for removed slots), so it can
+    stand in for the plain `List[Track]` used by PlayerState, Library and
+    PlayerApp. Replacing a row appends its strings; the old bytes are not reclaimed.
+
+    Values that do not fit a column are normalised on write: track numbers
+    outside 0..MAX_TRACK_NUMBER become None, durations are clamped and titles
+    cut to MAX_STRING_BYTES. A longer path cannot be stored and raises
+    ValueError, leaving the row unchanged.
+    """
+
+    def __init__(self, tracks=None):
+        self._names = [None]  # interned artist/album strings; 0 means None
+        self._name_ids = {}
+        self._artist = array("I")
+        self._album = array("I")
+        self._number = array("i")
+        self._duration = array("I")
+        self._live = bytearray()
+        self._titles = bytearray()
+        self._title_start = array("I")
+        self._title_len = array("H")
+        self._paths = bytearray()
+        self._path_start = array("I")
+        self._path_len = array("H")
+        self._ids = {}  # row -> id, only where the id is not the path
+        if tracks:
+            self.extend(tracks)
+
+    # List protocol
+
+    def __len__(self):
+        return len(self._live)
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += len(self._live)
+        if not self._live[idx]:
+            return None
+        return TrackView(self, idx)
+
+    def __setitem__(self, idx, track):
+        if idx < 0:
+            idx += len(self._live)
+        if track is None:
+            self._live[idx] = 0
+            self._ids.pop(idx, None)
+            return
+        self._write(idx, track)
+
+    def __iter__(self):
+        for idx in range(len(self._live)):
+            yield self[idx]
+
+    def append(self, track):
+        idx = len(self._live)
+        self._live.append(0)
+        self._artist.append(0)
+        self._album.append(0)
+        self._number.append(_NO_NUMBER)
+        self._duration.append(0)
+        self._title_start.append(0)
+        self._title_len.append(0)
+        self._path_start.append(0)
+        self._path_len.append(0)
+        if track is not None:
+            self._write(idx, track)
+
+    def extend(self, tracks):
+        for track in tracks:
+            self.append(track)
+
+    # Field accessors (used by TrackView)
+
+    def id_at(self, idx):
+        track_id = self._ids.get(idx)
+        return self.path_at(idx) if track_id is None else track_id
+
+    def title_at(self, idx):
+        start = self._title_start[idx]
+        return str(self._titles[start : start + self._title_len[idx]], "utf-8")
+
+    def artist_at(self, idx):
+        return self._names[self._artist[idx]]
+
+    def album_at(self, idx):
+        return self._names[self._album[idx]]
+
+    def track_number_at(self, idx):
+        number = self._number[idx]
+        return None if number == _NO_NUMBER else number
+
+    def duration_at(self, idx):
+        return self._duration[idx]
+
+    def path_at(self, idx):
+        start = self._path_start[idx]
+        return str(self._paths[start : start + self._path_len[idx]], "utf-8")
+
+    # Internals
+
+    def _intern(self, name):
+        if name is None:
+            return 0
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+    def _write(self, idx, track):
+        # Check and convert everything first so a bad value never leaves a half-written row.
+        path = (track.path or "").encode("utf-8")
+        if len(path) > MAX_STRING_BYTES:
+            raise ValueError("track path too long")
+        title = _clip_utf8((track.title or "").encode("utf-8"), MAX_STRING_BYTES)
+        number = track.track_number
+        if number is None or not 0 <= number <= MAX_TRACK_NUMBER:
+            number = _NO_NUMBER
+        duration = min(max(0, int(track.duration_secs or 0)), MAX_DURATION)
+
+        self._artist[idx] = self._intern(track.artist)
+        self._album[idx] = self._intern(track.album)
+        self._number[idx] = number
+        self._duration[idx] = duration
+        self._title_start[idx] = len(self._titles)
+        self._title_len[idx] = len(title)
+        self._titles.extend(title)
+        self._path_start[idx] = len(self._paths)
+        self._path_len[idx] = len(path)
+        self._paths.extend(path)
+        if track.id != track.path:
+            self._ids[idx] = track.id
+        else:
+            self._ids.pop(idx, None)
+        self._live[idx] = 1
@@ -0,0 +1,121 @@
+"""Sector cache for a MicroPython block device (e.g. `sdcard.SDCard`).
+
+Mount it in place of the card:
+    os.mount(blockcache.BlockCache(sdcard.SDCard(spi, cs)), "/sd")
+"""
+
+BLOCK_SIZE = 512
+_IOCTL_INIT = 1
+_IOCTL_BLOCK_COUNT = 4
+
+
+class BlockCache:
+    """
+    LRU cache of `blocks` preallocated 512-byte sectors over `device`.
+
+    - Small reads (FAT and directory sectors) are served from the pool.
+    - A miss right after the previous read fetches `read_ahead` sectors in
+      one multi-block transfer, so sequential small reads mostly hit.
+    - Reads longer than `bypass_blocks` (bulk file data) go straight to the
+      device without evicting metadata.
+    - Writes go through to the device and refresh any cached copy.
+
+    Size the pool to the heap: 16 sectors (8 KB) suits a WROOM, while a
+    WROVER's PSRAM can hold a few hundred. `hits`, `misses`, `prefetched`
+    and `bypassed` count sectors to help tune it.
+    """
+
+    def __init__(self, device, blocks=16, read_ahead=4, bypass_blocks=None):
+        self.device = device
+        self.read_ahead = max(1, min(read_ahead, blocks))
+        self.bypass_blocks = self.read_ahead if bypass_blocks is None else bypass_blocks
+        self._pool = bytearray(blocks * BLOCK_SIZE)
+        self._view = memoryview(self._pool)
+        self._ahead = memoryview(bytearray(self.read_ahead * BLOCK_SIZE))
+        self._slots = {}  # block number -> slot
+        self._block_at = [-1] * blocks  # slot -> block number
+        self._used = [0] * blocks  # slot -> LRU tick
+        self._tick = 0
+        self._next = -1  # block after the previous read, for sequential detection
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.bypassed = 0
+
+    def readblocks(self, block_num, buf):
+        nblocks = len(buf) // BLOCK_SIZE
+        sequential = block_num == self._next
+        self._next = block_num + nblocks
+        if nblocks > self.bypass_blocks:
+            self.bypassed += nblocks
+            self.device.readblocks(block_num, buf)
+            return
+        out = memoryview(buf)
+        for i in range(nblocks):
+            block = block_num + i
+            slot = self._slots.get(block)
+            if slot is None:
+                self.misses += 1
+                slot = self._fetch(block, sequential or i > 0)
+            else:
+                self.hits += 1
+            self._tick += 1
+            self._used[slot] = self._tick
+            start = slot * BLOCK_SIZE
+            out[i * BLOCK_SIZE : (i + 1) * BLOCK_SIZE] = self._view[start : start + BLOCK_SIZE]
+
+    def writeblocks(self, block_num, buf):
+        self.device.writeblocks(block_num, buf)
+        data = memoryview(buf)
+        for i in range(len(buf) // BLOCK_SIZE):
+            slot = self._slots.get(block_num + i)
+            if slot is not None:
+                start = slot * BLOCK_SIZE
+                self._view[start : start + BLOCK_SIZE] = data[i * BLOCK_SIZE : (i + 1) * BLOCK_SIZE]
+
+    def ioctl(self, op, arg):
+        if op == _IOCTL_INIT:
+            self.invalidate()  # the card may have been swapped
+        return self.device.ioctl(op, arg)
+
+    def invalidate(self):
+        self._slots = {}
+        for slot in range(len(self._block_at)):
+            self._block_at[slot] = -1
+            self._used[slot] = 0
+        self._next = -1
+
+    def _fetch(self, block, sequential):
+        """Load `block` (plus read-ahead when sequential) into the pool; returns its slot."""
+        count = 1
+        if sequential and self.read_ahead > 1:
+            total = self.device.ioctl(_IOCTL_BLOCK_COUNT, 0)
+            count = max(1, min(self.read_ahead, total - block))
+        # Read into the staging buffer first so a failed transfer leaves no half-filled slot.
+        self.device.readblocks(block, self._ahead[: count * BLOCK_SIZE])
+        self.prefetched += count - 1
+        first = -1
+        for i in range(count):
+            if i > 0 and block + i in self._slots:
+                continue  # never overwrite a cached (possibly newer) copy
+            slot = self._claim(block + i)
+            start = slot * BLOCK_SIZE
+            self._view[start : start + BLOCK_SIZE] = self._ahead[i * BLOCK_SIZE : (i + 1) * BLOCK_SIZE]
+            if i == 0:
+                first = slot
+        return first
+
+    def _claim(self, block):
+        """Evict the least recently used slot and assign it to `block`."""
+        victim = 0
+        for slot in range(1, len(self._used)):
+            if self._used[slot] < self._used[victim]:
+                victim = slot
+        old = self._block_at[victim]
+        if old >= 0:
+            del self._slots[old]
+        self._block_at[victim] = block
+        self._slots[block] = victim
+        self._tick += 1
+        self._used[victim] = self._tick
+        return victim
@@ -50,6 +50,9 @@ def main() -> int:
         os.mount(sd, vfs_mount)
         print("Mounted", vfs_mount)
         print("Root entries:", os.listdir(vfs_mount))
+        # Raw sequential reads: one CMD17 per sector vs CMD18 runs of 16 sectors.
+        print("Read KB/s (CMD17):", sdcard.read_throughput(sd, blocks=256, blocks_per_read=1))
+        print("Read KB/s (CMD18):", sdcard.read_throughput(sd, blocks=256, blocks_per_read=16))
     except Exception as exc:  # noqa: BLE001
         sys.print_exception(exc)
         return 1
@@ -6,21 +6,87 @@ Based on the reference driver from micropython-lib.
 
 import time
 
+try:
+    _ticks_us = time.ticks_us
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+    _sleep_ms = time.sleep_ms
+except AttributeError:  # CPython (tests)
+
+    def _ticks_us():
+        return int(time.perf_counter() * 1_000_000)
+
+    def _ticks_ms():
+        return int(time.perf_counter() * 1000)
+
+    def _ticks_diff(end, start):
+        return end - start
+
+    def _sleep_ms(ms):
+        time.sleep(ms / 1000)
+
+# Cards must be identified at 100-400 kHz; the requested rate applies afterwards.
+INIT_BAUDRATE = 400_000
+BLOCK_SIZE = 512
+# Upper bounds on waiting for a data token / for the card to finish programming.
+READ_TIMEOUT_MS = 200
+WRITE_TIMEOUT_MS = 500
+
+# Block device ioctl ops (MicroPython `os.AbstractBlockDev`).
+IOCTL_INIT = 1
+IOCTL_DEINIT = 2
+IOCTL_SYNC = 3
+IOCTL_BLOCK_COUNT = 4
+IOCTL_BLOCK_SIZE = 5
+IOCTL_BLOCK_ERASE = 6
+
+_OCR_CCS = 0x40  # in the first OCR byte: card uses block (not byte) addresses
+
+_TOKEN_DATA = 0xFE  # start of a single-block read/write, and of each CMD18 block
+_TOKEN_MULTI_WRITE = b"\xFC"  # start of each CMD25 block
+_TOKEN_STOP_TRAN = b"\xFD"  # ends a CMD25 write
+
 
 class SDCard:
+    """
+    Block device for an SD card in SPI mode (mountable with `os.mount`).
+
+    The card is initialised once, at INIT_BAUDRATE, then the bus is ramped up
+    to `baudrate`. A transfer that fails triggers one re-initialisation and a
+    retry before the error is raised.
+
+    Transfers poll and discard through preallocated buffers (`readinto` with
+    0xFF on MOSI) so block reads and writes do not allocate per byte. A
+    multi-block read lands each sector in a preallocated 512-byte buffer and
+    copies it into place, so it allocates nothing per sector. A multi-block
+    write slices its sector views before sending CMD25 (machine.SPI.write
+    takes no offset), keeping allocation out of the token/data/busy loop.
+    """
+
     def __init__(self, spi, cs, baudrate=5_000_000):
         self.spi = spi
         self.cs = cs
+        self.baudrate = baudrate
         self.cmdbuf = bytearray(6)
         self.dummybuf = bytearray(512)
         self.token = bytearray(1)
-        self.sectors = None
-        self.init_spi(baudrate)
+        self.crcbuf = bytearray(2)
+        self.sectors = 0  # read from the CSD during init
+        self.cdv = 1  # address multiplier: 1 for SDHC/SDXC, 512 for byte-addressed SDSC
+        self.reinits = 0
+        self._start()
 
-        # Basic init sequence
+    def _start(self):
+        self.init_spi(INIT_BAUDRATE)
         self._init_spi_mode()
         if not self._init_card():
             raise OSError("no sd card")
+        self.init_spi(self.baudrate)
+
+    def _recover(self):
+        self.reinits += 1
+        self.cs(1)
+        self._start()
 
     def init_spi(self, baudrate):
         try:
@@ -35,7 +101,12 @@ class SDCard:
         for _ in range(10):
             self.spi.write(b"\xFF")
 
-    def _cmd(self, cmd, arg, crc=0x95, read_len=0):
+    def _cmd(self, cmd, arg, crc=0x95, release=True, skip1=False):
+        """
+        Send a command and return its R1 byte. With `release=False` CS stays
+        low for a following data phase. `skip1` drops the stuff byte a card
+        sends before answering CMD12.
+        """
         buf = self.cmdbuf
         buf[0] = 0x40 | cmd
         buf[1] = (arg >> 24) & 0xFF
@@ -46,101 +117,232 @@ class SDCard:
 
         self.cs(0)
         self.spi.write(buf)
+        if skip1:
+            self._read_byte()
         resp = 0xFF
         for _ in range(100):
-            resp = self.spi.read(1)[0]
+            resp = self._read_byte()
             if not (resp & 0x80):
                 break
-        data = b""
-        if read_len:
-            data = self.spi.read(read_len)
+        if release:
+            self.cs(1)
+            self.spi.write(b"\xFF")
+        return resp
+
+    def _cmd_read(self, cmd, arg, crc, read_len):
+        """Init-time command with a trailing response (R3/R7): returns (R1, bytes)."""
+        resp = self._cmd(cmd, arg, crc, release=False)
+        data = self.spi.read(read_len, 0xFF)
         self.cs(1)
         self.spi.write(b"\xFF")
         return resp, data
 
+    def _read_byte(self):
+        self.spi.readinto(self.token, 0xFF)
+        return self.token[0]
+
     def _cmd_nodata(self, cmd):
         self.cs(1)
         self.spi.write(b"\xFF")
-        resp, _ = self._cmd(cmd, 0)
+        resp = self._cmd(cmd, 0)
         self.cs(1)
         self.spi.write(b"\xFF")
         return resp
 
     def _init_card(self):
-        r, _ = self._cmd(0, 0)
+        r = self._cmd(0, 0)
         if r != 1:
             return False
 
-        r, r7 = self._cmd(8, 0x1AA, crc=0x87, read_len=4)
+        r, r7 = self._cmd_read(8, 0x1AA, 0x87, 4)
         if r not in (1, 5):
             return False
+        # CMD8 is illegal (5) on v1 cards, which must not be offered high capacity.
+        hcs = 0x40000000 if r == 1 else 0
         for i in range(200):  # ~10s max with 50 ms sleeps
-            r, _ = self._cmd(55, 0)
-            r, _ = self._cmd(41, 0x40000000)
+            r = self._cmd(55, 0)
+            r = self._cmd(41, hcs)
             if r == 0:
                 break
             if i % 50 == 0:
                 print("ACMD41 waiting...", i)
-            time.sleep_ms(50)
+            _sleep_ms(50)
         if r != 0:
             return False
-        self._cmd(16, 512)
-        return True
+        r, ocr = self._cmd_read(58, 0, 0x95, 4)
+        self.cdv = 1 if r == 0 and ocr[0] & _OCR_CCS else BLOCK_SIZE
+        self._cmd(16, BLOCK_SIZE)
+        self.sectors = self._read_capacity()
+        return self.sectors > 0
+
+    def _read_capacity(self):
+        """Sector count from the CSD register (CMD9), or 0 if it cannot be read."""
+        resp = self._cmd(9, 0, release=False)
+        if resp != 0:
+            self.cs(1)
+            return 0
+        self._wait_token()
+        csd = bytearray(16)
+        self.spi.readinto(csd, 0xFF)
+        self.spi.readinto(self.crcbuf, 0xFF)
+        self.cs(1)
+        self.spi.write(b"\xFF")
+        if csd[0] >> 6 == 1:  # CSD v2 (SDHC/SDXC): capacity = (C_SIZE + 1) * 512 KiB
+            c_size = ((csd[7] & 0x3F) << 16) | (csd[8] << 8) | csd[9]
+            return (c_size + 1) * 1024
+        # CSD v1 (SDSC): (C_SIZE + 1) * 2^(C_SIZE_MULT + 2) blocks of 2^READ_BL_LEN bytes.
+        read_bl_len = csd[5] & 0x0F
+        c_size = ((csd[6] & 0x03) << 10) | (csd[7] << 2) | (csd[8] >> 6)
+        c_size_mult = ((csd[9] & 0x03) << 1) | (csd[10] >> 7)
+        return ((c_size + 1) << (c_size_mult + 2 + read_bl_len)) // BLOCK_SIZE
+
+    def _check_range(self, block_num, buf):
+        if len(buf) % BLOCK_SIZE:
+            raise OSError("buffer is not a whole number of blocks")
+        if block_num < 0 or block_num + len(buf) // BLOCK_SIZE > self.sectors:
+            raise OSError("block out of range")
 
     def readblocks(self, block_num, buf):
-        if block_num == 0:
-            raise OSError("refusing to read block 0")
-        if not self._init_card():
-            raise OSError("no sd card")
-        nblocks = len(buf) // 512
-        for i in range(nblocks):
-            self._read_block(block_num + i, memoryview(buf)[i * 512 : (i + 1) * 512])
+        self._check_range(block_num, buf)
+        try:
+            self._read(block_num, buf)
+        except OSError:
+            self._recover()
+            self._read(block_num, buf)
 
     def writeblocks(self, block_num, buf):
-        if block_num == 0:
-            raise OSError("refusing to write block 0")
-        if not self._init_card():
-            raise OSError("no sd card")
-        nblocks = len(buf) // 512
-        for i in range(nblocks):
-            self._write_block(block_num + i, memoryview(buf)[i * 512 : (i + 1) * 512])
+        self._check_range(block_num, buf)
+        try:
+            self._write(block_num, buf)
+        except OSError:
+            self._recover()
+            self._write(block_num, buf)
+
+    def _read(self, block_num, buf):
+        nblocks = len(buf) // BLOCK_SIZE
+        if nblocks == 1:
+            self._read_block(block_num, buf)
+        else:
+            self._read_blocks(block_num, buf, nblocks)
+
+    def _write(self, block_num, buf):
+        nblocks = len(buf) // BLOCK_SIZE
+        if nblocks == 1:
+            self._write_block(block_num, buf)
+        else:
+            self._write_blocks(block_num, buf, nblocks)
+
+    def _wait_token(self):
+        start = _ticks_ms()
+        while True:
+            tok = self._read_byte()
+            if tok == _TOKEN_DATA:
+                return
+            if tok != 0xFF:
+                raise OSError("read error token")
+            if _ticks_diff(_ticks_ms(), start) > READ_TIMEOUT_MS:
+                raise OSError("timeout waiting for data")
+
+    def _wait_not_busy(self):
+        # The card holds MISO low while it is programming.
+        start = _ticks_ms()
+        while self._read_byte() == 0:
+            if _ticks_diff(_ticks_ms(), start) > WRITE_TIMEOUT_MS:
+                self.cs(1)
+                raise OSError("timeout waiting for card")
 
     def _read_block(self, block_num, buf):
-        self.cs(0)
-        resp, _ = self._cmd(17, block_num)
+        resp = self._cmd(17, block_num * self.cdv, release=False)
         if resp != 0:
             self.cs(1)
             raise OSError("read error")
-        while True:
-            tok = self.spi.read(1)[0]
-            if tok == 0xFE:
-                break
-        self.spi.readinto(buf)
-        self.spi.read(2)
+        self._wait_token()
+        self.spi.readinto(buf, 0xFF)
+        self.spi.readinto(self.crcbuf, 0xFF)
+        self.cs(1)
+        self.spi.write(b"\xFF")
+
+    def _read_blocks(self, block_num, buf, nblocks):
+        """CMD18: one command for `nblocks` consecutive sectors, ended by CMD12."""
+        resp = self._cmd(18, block_num * self.cdv, release=False)
+        if resp != 0:
+            self.cs(1)
+            raise OSError("read error")
+        sector = self.dummybuf
+        offset = 0
+        for _ in range(nblocks):
+            self._wait_token()
+            self.spi.readinto(sector, 0xFF)
+            self.spi.readinto(self.crcbuf, 0xFF)
+            buf[offset : offset + BLOCK_SIZE] = sector
+            offset += BLOCK_SIZE
+        resp = self._cmd(12, 0, crc=0xFF, release=False, skip1=True)
+        self._wait_not_busy()
         self.cs(1)
         self.spi.write(b"\xFF")
+        if resp != 0:
+            raise OSError("stop transmission error")
 
     def _write_block(self, block_num, buf):
-        self.cs(0)
-        resp, _ = self._cmd(24, block_num)
+        resp = self._cmd(24, block_num * self.cdv, release=False)
         if resp != 0:
             self.cs(1)
             raise OSError("write error")
         self.spi.write(b"\xFE")
         self.spi.write(buf)
         self.spi.write(b"\xFF\xFF")
-        resp = self.spi.read(1)[0]
+        resp = self._read_byte()
         if (resp & 0x1F) != 0x05:
             self.cs(1)
             raise OSError("reject")
-        while self.spi.read(1)[0] == 0:
-            pass
+        self._wait_not_busy()
+        self.cs(1)
+        self.spi.write(b"\xFF")
+
+    def _write_blocks(self, block_num, buf, nblocks):
+        """CMD25: stream `nblocks` sectors behind one command, ended by the stop token."""
+        mv = memoryview(buf)
+        sectors = [mv[i * BLOCK_SIZE : (i + 1) * BLOCK_SIZE] for i in range(nblocks)]
+        resp = self._cmd(25, block_num * self.cdv, release=False)
+        if resp != 0:
+            self.cs(1)
+            raise OSError("write error")
+        for sector in sectors:
+            self.spi.write(_TOKEN_MULTI_WRITE)
+            self.spi.write(sector)
+            self.spi.write(b"\xFF\xFF")
+            resp = self._read_byte()
+            if (resp & 0x1F) != 0x05:
+                self.cs(1)
+                raise OSError("reject")
+            self._wait_not_busy()
+        self.spi.write(_TOKEN_STOP_TRAN)
+        self._read_byte()  # the card starts signalling busy one byte after the token
+        self._wait_not_busy()
         self.cs(1)
         self.spi.write(b"\xFF")
 
     def ioctl(self, op, arg):
-        if op == 4:  # get number of blocks
-            if self.sectors is None:
-                self.sectors = 1024 * 1024  # dummy fallback
+        if op == IOCTL_BLOCK_COUNT:
             return self.sectors
-        return 0
+        if op == IOCTL_BLOCK_SIZE:
+            return BLOCK_SIZE
+        if op in (IOCTL_INIT, IOCTL_DEINIT, IOCTL_SYNC, IOCTL_BLOCK_ERASE):
+            # Writes complete before writeblocks returns, and SD erase is implicit.
+            return 0
+        return None
+
+
+def read_throughput(sd, start_block=0, blocks=2048, blocks_per_read=16):
+    """
+    Read `blocks` sequential sectors from `start_block`, `blocks_per_read`
+    at a time (1 forces CMD17 per sector), and return the rate in KB/s.
+    """
+    buf = bytearray(512 * blocks_per_read)
+    done = 0
+    start = _ticks_us()
+    while done < blocks:
+        sd.readblocks(start_block + done, buf)
+        done += blocks_per_read
+    elapsed_us = max(1, _ticks_diff(_ticks_us(), start))
+    return done * 512 * 1_000_000 // 1024 // elapsed_us
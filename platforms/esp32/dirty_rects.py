@@ -0,0 +1,102 @@
+"""Dirty-rectangle bookkeeping for partial display refreshes (pure Python, no hardware imports)."""
+
+# A merge is worth it when the bounding box wastes fewer pixels than this;
+# each extra window costs a CASET/RASET/RAMWR round trip on the SPI bus.
+MERGE_SLACK_PX = 512
+
+
+def clip(rect, width, height):
+    """Clip (x, y, w, h) to the screen; returns None if nothing is left."""
+    x, y, w, h = rect
+    x0 = max(0, x)
+    y0 = max(0, y)
+    x1 = min(width, x + w)
+    y1 = min(height, y + h)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _bounds(a, b):
+    x0 = min(a[0], b[0])
+    y0 = min(a[1], b[1])
+    x1 = max(a[0] + a[2], b[0] + b[2])
+    y1 = max(a[1] + a[3], b[1] + b[3])
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def coalesce(rects, slack=MERGE_SLACK_PX):
+    """
+    Merge rectangles whose bounding box costs at most `slack` pixels more
+    than the two areas combined (this always merges overlapping rects).
+    Returns a list sorted top to bottom.
+    """
+    pending = sorted(rects, key=lambda r: (r[1], r[0]))
+    merged = True
+    while merged and len(pending) > 1:
+        merged = False
+        out = []
+        for rect in pending:
+            for i in range(len(out)):
+                other = out[i]
+                box = _bounds(other, rect)
+                if box[2] * box[3] <= other[2] * other[3] + rect[2] * rect[3] + slack:
+                    out[i] = box
+                    merged = True
+                    break
+            else:
+                out.append(rect)
+        pending = sorted(out, key=lambda r: (r[1], r[0]))
+    return pending
+
+
+class DirtyTracker:
+    """
+    Derive the regions that changed between two frames from their draw ops.
+
+    Each frame is a set of hashable draw ops with the rectangle they paint.
+    Because the renderer clears and redraws every frame, a pixel can only
+    differ from the last frame where an op was added or dropped, so only
+    those rectangles need to reach the panel. Ops are compared as a set:
+    reordering overlapping ops without changing them is not detected.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._previous = {}
+        self._current = {}
+        self._full = True  # first frame: panel contents unknown
+
+    def begin_frame(self):
+        self._current = {}
+
+    def add(self, op, rect):
+        self._current[op] = rect
+
+    def mark_all(self):
+        """Force the next `take()` to return the whole screen (e.g. after untracked drawing)."""
+        self._full = True
+
+    def take(self):
+        """Return coalesced dirty rects since the last call and make this frame the baseline."""
+        if self._full:
+            rects = [(0, 0, self.width, self.height)]
+            self._full = False
+        else:
+            changed = []
+            for op, rect in self._current.items():
+                if op not in self._previous:
+                    changed.append(rect)
+            for op, rect in self._previous.items():
+                if op not in self._current:
+                    changed.append(rect)
+            rects = []
+            for rect in changed:
+                rect = clip(rect, self.width, self.height)
+                if rect is not None:
+                    rects.append(rect)
+            rects = coalesce(rects)
+        self._previous = self._current
+        self._current = dict(self._previous)
+        return rects
@@ -1,21 +1,195 @@
-"""Stub audio backend for ESP32 Prototype 1."""
+"""Audio backend for ESP32 Prototype 1: streams WAV files from the SD card."""
 
-from core.interfaces import AudioBackend
+import time
+
+from core.audio_stream import StreamingPlayer
 from core.models import Track
 
 
-class EspAudioBackend(AudioBackend):
-    def play(self, track: Track) -> None:
-        print("PLAY:", track.title)
+class PacedSink:
+    """
+    Base for sinks that drain at the playback rate. `accept(n)` says how
+    much of an `n`-byte write fits in a `buffer_bytes` output buffer that
+    has been draining since the last write, so writes never block the loop.
+    """
+
+    def __init__(self, buffer_bytes):
+        self.buffer_bytes = buffer_bytes
+        self.byte_rate = 0
+        self._room = buffer_bytes
+        self._last = time.ticks_ms()
+
+    def configure(self, sample_rate, channels, bits_per_sample):
+        self.byte_rate = sample_rate * channels * bits_per_sample // 8
+        self._room = self.buffer_bytes
+        self._last = time.ticks_ms()
+
+    def accept(self, n):
+        now = time.ticks_ms()
+        drained = time.ticks_diff(now, self._last) * self.byte_rate // 1000
+        self._last = now
+        self._room = min(self.buffer_bytes, self._room + drained)
+        n = min(n, self._room) & ~3  # frame-aligned for 16-bit mono/stereo
+        self._room -= n
+        return n
+
+
+class LogSink(PacedSink):
+    """Sink that discards PCM at the playback rate; stands in until the board has an I2S DAC fitted."""
+
+    def __init__(self, buffer_bytes=8192):
+        super().__init__(buffer_bytes)
+
+    def configure(self, sample_rate, channels, bits_per_sample):
+        super().configure(sample_rate, channels, bits_per_sample)
+        print("AUDIO:", sample_rate, "Hz,", channels, "ch,", bits_per_sample, "bit")
+
+    def write(self, data):
+        return self.accept(len(data))
+
+
+class I2SSink(PacedSink):
+    """PCM sink on the ESP32's I2S peripheral (e.g. a PCM5102 or MAX98357 DAC)."""
+
+    def __init__(self, sck, ws, sd, i2s_id=0, ibuf=20000):
+        super().__init__(ibuf)
+        self.pins = (sck, ws, sd)
+        self.i2s_id = i2s_id
+        self.i2s = None
+
+    def configure(self, sample_rate, channels, bits_per_sample):
+        from machine import I2S, Pin
+
+        super().configure(sample_rate, channels, bits_per_sample)
+        if self.i2s is not None:
+            self.i2s.deinit()
+        sck, ws, sd = self.pins
+        self.i2s = I2S(
+            self.i2s_id,
+            sck=Pin(sck),
+            ws=Pin(ws),
+            sd=Pin(sd),
+            mode=I2S.TX,
+            bits=bits_per_sample,
+            format=I2S.STEREO if channels == 2 else I2S.MONO,
+            rate=sample_rate,
+            ibuf=self.buffer_bytes,
+        )
+
+    def write(self, data):
+        # Blocking write, but only of what the DMA buffer has room for, so it returns at once.
+        n = self.accept(len(data))
+        if n:
+            self.i2s.write(data[:n])
+        return n
+
 
-    def pause(self) -> None:
-        print("PAUSE")
+_ZEROS = memoryview(bytearray(1024))
 
-    def resume(self) -> None:
-        print("RESUME")
 
-    def stop(self) -> None:
-        print("STOP")
+class SilentWav:
+    """
+    Read-only file object for a 16-bit mono WAV of `seconds` of silence,
+    synthesised as it is read (nothing is buffered), so the demo can play
+    its mock library on a board without an SD card.
+    """
+
+    def __init__(self, seconds, sample_rate=22050):
+        byte_rate = sample_rate * 2
+        data_size = int(seconds * byte_rate)
+        self._header = (
+            b"RIFF"
+            + (36 + data_size).to_bytes(4, "little")
+            + b"WAVEfmt "
+            + (16).to_bytes(4, "little")
+            + (1).to_bytes(2, "little")  # PCM
+            + (1).to_bytes(2, "little")  # mono
+            + sample_rate.to_bytes(4, "little")
+            + byte_rate.to_bytes(4, "little")
+            + (2).to_bytes(2, "little")  # block align
+            + (16).to_bytes(2, "little")  # bits per sample
+            + b"data"
+            + data_size.to_bytes(4, "little")
+        )
+        self._size = len(self._header) + data_size
+        self._pos = 0
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def read(self, n=-1):
+        end = self._size if n < 0 else min(self._size, self._pos + n)
+        buf = bytearray(max(0, end - self._pos))
+        self.readinto(buf)
+        return bytes(buf)
+
+    def readinto(self, buf):
+        n = max(0, min(len(buf), self._size - self._pos))
+        mv = memoryview(buf)
+        i = 0
+        while i < n and self._pos + i < len(self._header):
+            mv[i] = self._header[self._pos + i]
+            i += 1
+        while i < n:  # silence, copied from a shared block of zeros
+            step = min(n - i, len(_ZEROS))
+            mv[i : i + step] = _ZEROS[:step]
+            i += step
+        self._pos += n
+        return n
+
+    def close(self):
+        pass
+
+
+def card_or_silence(durations):
+    """
+    StreamingPlayer opener for the demo: the file itself when it can be
+    opened, else `SilentWav` of the track's duration (`durations` maps path
+    to seconds).
+    """
+
+    def opener(path):
+        try:
+            return open(path, "rb")
+        except OSError:
+            return SilentWav(durations.get(path, 1))
+
+    return opener
+
+
+class EspAudioBackend(StreamingPlayer):
+    """
+    StreamingPlayer with device defaults, serviced by the audio and sd jobs
+    of `esp_runtime`. Failures to open a track are printed; `play` re-raises
+    them so PlayerApp does not show the track as playing, while a failed
+    `preload` only means the next transition is not gapless.
+    """
+
+    def __init__(self, sink=None, buffer_size=32768, chunk_size=4096, opener=None):
+        super().__init__(sink if sink is not None else LogSink(), buffer_size, chunk_size, opener)
+
+    def play(self, track: Track) -> None:
+        print("PLAY:", track.title)
+        try:
+            super().play(track)
+        except (OSError, ValueError) as exc:
+            print("PLAY failed:", track.path, exc)
+            raise
+
+    def preload(self, track: Track) -> None:
+        try:
+            super().preload(track)
+        except (OSError, ValueError) as exc:
+            print("PRELOAD failed:", track.path, exc)
 
     def set_volume(self, level: int) -> None:
         print("VOLUME:", level)
+        super().set_volume(level)
@@ -0,0 +1,173 @@
+"""
+Cooperative runtime for the ESP32: prioritised periodic jobs on asyncio.
+
+Pure Python (only `time` and core imports), so tests drive it under CPython
+asyncio with fake hardware.
+"""
+
+import time
+
+from core.input_coalescer import InputCoalescer
+from core.runtime import Runtime, asyncio
+
+try:
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+    _ticks_add = time.ticks_add
+except AttributeError:  # CPython (tests)
+
+    def _ticks_ms():
+        return int(time.perf_counter() * 1000)
+
+    def _ticks_diff(end, start):
+        return end - start
+
+    def _ticks_add(ticks, delta):
+        return ticks + delta
+
+# (period_ms, budget_ms, priority) per job; a lower priority number is more urgent.
+AUDIO_JOB = (5, 2, 0)  # sink top-up from the ring buffer
+INPUT_JOB = (10, 1, 1)  # button polling
+SD_JOB = (20, 8, 2)  # ring buffer refill from the card
+RENDER_JOB = (50, 30, 3)  # at most 20 frames/s, coalescing all input since the last one
+
+
+class Job:
+    """
+    A periodic unit of work. `step(deadline)` runs once per `period_ms` and
+    should return by `deadline`, a ticks_ms value `budget_ms` after it
+    started; `overruns` counts the steps that did not. A job that comes due
+    while a more urgent one is overdue lets that one run first.
+    """
+
+    def __init__(self, name, step, period_ms, budget_ms, priority):
+        self.name = name
+        self.step = step
+        self.period_ms = period_ms
+        self.budget_ms = budget_ms
+        self.priority = priority
+        self.next_due = 0
+        self.runs = 0
+        self.overruns = 0
+        self.worst_run_ms = 0
+        self.worst_lag_ms = 0  # latest start relative to when the step was due
+
+
+class LatencyMonitor:
+    """Measures loop responsiveness: how late a task sleeping `interval_ms` wakes up."""
+
+    def __init__(self, interval_ms=10):
+        self.interval_ms = interval_ms
+        self.samples = 0
+        self.last_lag_ms = 0
+        self.worst_lag_ms = 0
+        self.total_lag_ms = 0
+
+    def mean_lag_ms(self):
+        return self.total_lag_ms / self.samples if self.samples else 0
+
+    async def run(self, runtime):
+        while runtime.running:
+            start = _ticks_ms()
+            await asyncio.sleep(self.interval_ms / 1000)
+            lag = max(0, _ticks_diff(_ticks_ms(), start) - self.interval_ms)
+            self.samples += 1
+            self.last_lag_ms = lag
+            self.total_lag_ms += lag
+            if lag > self.worst_lag_ms:
+                self.worst_lag_ms = lag
+
+
+class EspRuntime(Runtime):
+    """Runtime that also runs each added Job as its own task, plus a LatencyMonitor."""
+
+    def __init__(self, app, monitor_interval_ms=10):
+        super().__init__(app)
+        self.jobs = []  # kept sorted by priority
+        self.monitor = LatencyMonitor(monitor_interval_ms)
+
+    def add_job(self, name, step, period_ms, budget_ms, priority):
+        job = Job(name, step, period_ms, budget_ms, priority)
+        self.jobs.append(job)
+        self.jobs.sort(key=lambda j: j.priority)
+        return job
+
+    def report(self):
+        lines = ["loop lag: worst %d ms, mean %.1f ms" % (self.monitor.worst_lag_ms, self.monitor.mean_lag_ms())]
+        for job in self.jobs:
+            lines.append(
+                "%s: %d runs, %d over budget, worst run %d ms, worst lag %d ms"
+                % (job.name, job.runs, job.overruns, job.worst_run_ms, job.worst_lag_ms)
+            )
+        return "\n".join(lines)
+
+    def _preempted(self, job):
+        """True while a more urgent job is due but has not run yet."""
+        now = _ticks_ms()
+        for other in self.jobs:
+            if other.priority >= job.priority:
+                return False
+            if _ticks_diff(now, other.next_due) >= 0:
+                return True
+        return False
+
+    async def _run_job(self, job):
+        job.next_due = _ticks_ms()
+        while self.running:
+            await asyncio.sleep(max(0, _ticks_diff(job.next_due, _ticks_ms())) / 1000)
+            while self._preempted(job):
+                await asyncio.sleep(0)
+            start = _ticks_ms()
+            lag = _ticks_diff(start, job.next_due)
+            if lag > job.worst_lag_ms:
+                job.worst_lag_ms = lag
+            job.step(_ticks_add(start, job.budget_ms))
+            end = _ticks_ms()
+            spent = _ticks_diff(end, start)
+            job.runs += 1
+            if spent > job.budget_ms:
+                job.overruns += 1
+            if spent > job.worst_run_ms:
+                job.worst_run_ms = spent
+            job.next_due = _ticks_add(job.next_due, job.period_ms)
+            if _ticks_diff(end, job.next_due) > 0:
+                job.next_due = end  # fell behind: skip the missed periods rather than burst
+
+    async def run(self, *coros):
+        tasks = [self.monitor.run(self)]
+        for job in self.jobs:
+            tasks.append(self._run_job(job))
+        for coro in coros:
+            tasks.append(coro)
+        await Runtime.run(self, *tasks)
+
+
+def add_player_jobs(runtime, app, audio, source):
+    """
+    Standard job set: audio sink top-up, button polling, SD refill of the
+    audio ring and coalesced rendering. Rendering moves to the render job,
+    so `app.auto_render` is switched off. Buttons queued since the last poll
+    reach the app as one coalesced, accelerated batch. End-of-track
+    callbacks from `audio.feed` are queued on the runtime like input, rather
+    than running the app from inside the audio job.
+    """
+    app.auto_render = False
+    buttons = InputCoalescer(source, page_rows=app.page_rows)
+    audio.on_track_end = lambda gapless: runtime.call(app.track_finished, gapless)
+
+    def feed_audio(deadline):
+        audio.feed(audio.ring.capacity)  # the sink takes only what its DMA buffer has room for
+
+    def poll_input(deadline):
+        moves = buttons.read_batch()
+        if moves:
+            runtime.call(app.handle_batch, moves)
+
+    def refill_audio(deadline):
+        while _ticks_diff(deadline, _ticks_ms()) > 0 and audio.fill(max_reads=1):
+            pass
+
+    runtime.add_job("audio", feed_audio, *AUDIO_JOB)
+    runtime.add_job("input", poll_input, *INPUT_JOB)
+    runtime.add_job("sd", refill_audio, *SD_JOB)
+    runtime.add_job("render", lambda deadline: app.render_if_changed(), *RENDER_JOB)
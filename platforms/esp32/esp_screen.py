@@ -4,6 +4,9 @@ import framebuf
 import time
 from machine import Pin, SPI
 
+from dirty_rects import DirtyTracker
+from row_cache import RowCache
+
 
 class ST7789:
     """Minimal ST7789V2 driver with a framebuffer blit helper."""
@@ -95,6 +98,41 @@ class ST7789:
             self.spi.write(buf)
         finally:
             self.cs.on()
+        return len(buf)
+
+    def blit_rect(self, buf, x, y, w, h):
+        """
+        Write the (x, y, w, h) region of a full-screen RGB565 buffer (a
+        memoryview) to the panel, one row at a time; returns bytes sent.
+        """
+        if w == self.width:
+            # Full-width rows are contiguous in the buffer: one write.
+            start = y * self.width * 2
+            return self.blit_window(buf[start : start + w * h * 2], x, y, w, h)
+        self._set_window(x, y, x + w - 1, y + h - 1)
+        stride = self.width * 2
+        row_bytes = w * 2
+        offset = y * stride + x * 2
+        self.dc.on()
+        self.cs.off()
+        try:
+            for _ in range(h):
+                self.spi.write(buf[offset : offset + row_bytes])
+                offset += stride
+        finally:
+            self.cs.on()
+        return row_bytes * h
+
+    def blit_window(self, data, x, y, w, h):
+        """Write packed RGB565 `data` for exactly the (x, y, w, h) window."""
+        self._set_window(x, y, x + w - 1, y + h - 1)
+        self.dc.on()
+        self.cs.off()
+        try:
+            self.spi.write(data)
+        finally:
+            self.cs.on()
+        return len(data)
 
 
 class EspScreen:
@@ -103,6 +141,11 @@ class EspScreen:
 
     - Uses an RGB565 framebuffer with `framebuf.text` for glyphs.
     - Color scheme: black background, white text.
+    - `refresh()` pushes only the regions whose draw ops changed since the
+      last frame; `last_refresh_bytes` / `total_bytes_sent` count SPI pixel bytes.
+    - Rendered labels and highlighted rows are kept as RGB565 bitmaps in an
+      LRU cache of `row_cache_bytes` (0 disables it; PSRAM boards can afford
+      far more than the default) and blitted instead of re-rasterized.
     """
 
     def __init__(
@@ -121,6 +164,7 @@ class EspScreen:
         pin_bl=17,
         x_padding=15,
         y_padding=20,
+        row_cache_bytes=32 * 1024,
     ):
         spi = SPI(spi_id, baudrate=baudrate, sck=Pin(pin_clk), mosi=Pin(pin_mosi), miso=Pin(pin_miso))
         self.display = ST7789(
@@ -145,10 +189,16 @@ class EspScreen:
         self.char_w = 8
         self.char_h = 10
         self.line_height = 14  # add breathing room
+        self._dirty = DirtyTracker(width, height)
+        self._view = memoryview(self._buf)
+        self.last_refresh_bytes = 0
+        self.total_bytes_sent = 0
+        self.row_cache = RowCache(row_cache_bytes) if row_cache_bytes else None
         self.clear()
 
     def clear(self) -> None:
         self._fb.fill(self.bg)
+        self._dirty.begin_frame()
 
     def draw_text(self, x: int, y: int, text: str, color=None) -> None:
         # Treat x/y as character grid (like console renderer), not raw pixels.
@@ -157,21 +207,57 @@ class EspScreen:
         py = self.y_padding + y * self.line_height
         if py >= self.height - self.y_padding:
             return
-        self._fb.text(text, px, py, color)
+        w = min(len(text) * self.char_w, self.width - px)
+        bitmap = self._row_bitmap(text, color, self.bg, w, self.char_h)
+        if bitmap is None:
+            self._fb.text(text, px, py, color)
+        else:
+            # Background pixels are the blit key, so only glyphs land (as with fb.text).
+            self._fb.blit(bitmap, px, py, self.bg)
+        self._dirty.add(("text", px, py, text, color), (px, py, len(text) * self.char_w, self.char_h))
+
+    def visible_rows(self) -> int:
+        # Rows whose top edge lands above the bottom padding (see draw_text).
+        usable = self.height - 2 * self.y_padding
+        return (usable + self.line_height - 1) // self.line_height
 
     def draw_highlighted_text(self, x: int, y: int, text: str) -> None:
         px = self.x_padding + x * self.char_w
         py = self.y_padding + y * self.line_height
         w = self.width - 2 * self.x_padding
         h = self.line_height
-        self._fb.fill_rect(px, py, w, h, self.highlight_bg)
-        self.draw_text(x, y, text, color=self.highlight_fg)
+        bitmap = self._row_bitmap(text, self.highlight_fg, self.highlight_bg, w, h)
+        if bitmap is None or py >= self.height - self.y_padding:
+            self.fill_rect(px, py, w, h, self.highlight_bg)
+            self.draw_text(x, y, text, color=self.highlight_fg)
+            return
+        self._fb.blit(bitmap, px, py)
+        self._dirty.add(("rect", px, py, w, h, self.highlight_bg), (px, py, w, h))
+        self._dirty.add(("text", px, py, text, self.highlight_fg), (px, py, len(text) * self.char_w, self.char_h))
+
+    def _row_bitmap(self, text, fg, bg, w, h):
+        """Cached (w x h) RGB565 FrameBuffer of `text` on `bg`, or None without a cache."""
+        if self.row_cache is None or w <= 0:
+            return None
+        key = (text, fg, bg, w)
+        bitmap = self.row_cache.get(key)
+        if bitmap is None:
+            bitmap = framebuf.FrameBuffer(bytearray(w * h * 2), w, h, framebuf.RGB565)
+            bitmap.fill(bg)
+            bitmap.text(text, 0, 0, fg)
+            self.row_cache.put(key, bitmap, w * h * 2)
+        return bitmap
 
     def fill_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
         self._fb.fill_rect(x, y, w, h, color)
+        self._dirty.add(("rect", x, y, w, h, color), (x, y, w, h))
 
     def refresh(self) -> None:
-        self.display.blit(memoryview(self._buf))
+        sent = 0
+        for x, y, w, h in self._dirty.take():
+            sent += self.display.blit_rect(self._view, x, y, w, h)
+        self.last_refresh_bytes = sent
+        self.total_bytes_sent += sent
 
     def show_splash(self, path="/assets/loading.raw", duration_ms=5000) -> None:
         """
@@ -184,5 +270,8 @@ class EspScreen:
         px = max(0, (self.width - len(title) * self.char_w) // 2)
         py = max(0, self.height // 2 - self.line_height)
         self._fb.text(title, px, py, 0x001F)  # bright blue text
+        # Splash pixels bypass the op tracking: push it all, and all again next frame.
+        self._dirty.mark_all()
         self.refresh()
+        self._dirty.mark_all()
         time.sleep_ms(duration_ms)
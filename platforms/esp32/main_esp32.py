@@ -3,13 +3,18 @@
 import time
 
 import esp_audio_backend
+import esp_runtime
 import esp_screen
 from core import models
 from core import player_app
+from core.track_store import TrackStore
 
 
 def sample_tracks():
-    """Mock library for demo mode."""
+    """
+    Mock library for demo mode: WAV paths on the card. Files that are not
+    there play as silence of the listed duration (see `card_or_silence`).
+    """
     return [
         models.Track(
             id="1",
@@ -18,7 +23,7 @@ def sample_tracks():
             album="Album X",
             track_number=1,
             duration_secs=180,
-            path="/sd/artist_a/album_x/song1.mp3",
+            path="/sd/artist_a/album_x/song1.wav",
         ),
         models.Track(
             id="2",
@@ -27,7 +32,7 @@ def sample_tracks():
             album="Album X",
             track_number=2,
             duration_secs=200,
-            path="/sd/artist_a/album_x/song2.mp3",
+            path="/sd/artist_a/album_x/song2.wav",
         ),
         models.Track(
             id="3",
@@ -36,7 +41,7 @@ def sample_tracks():
             album="Album Y",
             track_number=None,
             duration_secs=210,
-            path="/sd/artist_b/album_y/song3.mp3",
+            path="/sd/artist_b/album_y/song3.wav",
         ),
     ]
 
@@ -47,7 +52,7 @@ def demo_sequence():
     - Enter Library (artists -> albums -> tracks)
     - Play first track (auto-jumps to Now Playing)
     - Pause/resume, back to root
-    - Enter Settings stub and return
+    - Enter Settings and return
     - Enter Now Playing from root, then back
     """
     return [
@@ -77,26 +82,39 @@ def demo_sequence():
     ]
 
 
-def run_demo_loop(app, delay_sec=1.0):
-    seq = demo_sequence()
-    idx = 0
-    while True:
-        event = seq[idx]
+class DemoInput:
+    """InputSource that replays `demo_sequence()` forever, one event per `delay_ms`."""
+
+    def __init__(self, delay_ms=1000):
+        self.seq = demo_sequence()
+        self.idx = 0
+        self.delay_ms = delay_ms
+        self.next_at = time.ticks_add(time.ticks_ms(), delay_ms)
+
+    def read_event(self):
+        if time.ticks_diff(time.ticks_ms(), self.next_at) < 0:
+            return None
+        self.next_at = time.ticks_add(self.next_at, self.delay_ms)
+        event = self.seq[self.idx]
+        self.idx = (self.idx + 1) % len(self.seq)
         print("DEMO event:", event)
-        app.handle_button(event)
-        idx = (idx + 1) % len(seq)
-        time.sleep(delay_sec)
+        return event
 
 
 def main():
     print("Starting demo UI…")
-    state = models.PlayerState(tracks=sample_tracks())
+    tracks = sample_tracks()
+    durations = {track.path: track.duration_secs for track in tracks}
+    state = models.PlayerState(tracks=TrackStore(tracks))
     screen = esp_screen.EspScreen()
     screen.show_splash()
-    audio = esp_audio_backend.EspAudioBackend()
+    audio = esp_audio_backend.EspAudioBackend(opener=esp_audio_backend.card_or_silence(durations))
     app = player_app.PlayerApp(state=state, screen=screen, audio_backend=audio)
     app.render()
-    run_demo_loop(app, delay_sec=1.0)
+    runtime = esp_runtime.EspRuntime(app)
+    esp_runtime.add_player_jobs(runtime, app, audio, DemoInput(delay_ms=1000))
+    runtime.add_job("stats", lambda deadline: print(runtime.report()), 10_000, 5, 9)
+    esp_runtime.asyncio.run(runtime.run())
 
 
 if __name__ == "__main__":
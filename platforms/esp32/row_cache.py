@@ -0,0 +1,62 @@
+"""Byte-budgeted LRU cache for pre-rendered row bitmaps (pure Python, no hardware imports)."""
+
+
+class RowCache:
+    """
+    LRU cache whose capacity is a byte budget rather than an entry count.
+
+    Entries carry their size in bytes; inserting evicts the least recently
+    used entries until the new one fits. Recency is a per-entry tick, so
+    eviction scans the entries (a few hundred rows at most) instead of
+    relying on ordered dicts, which MicroPython builds may not provide.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = {}  # key -> [tick, value, size]
+        self._tick = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._tick += 1
+        entry[0] = self._tick
+        return entry[1]
+
+    def put(self, key, value, size):
+        """Cache `value`; returns False (and caches nothing) if it exceeds the whole budget."""
+        if size > self.budget_bytes:
+            return False
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used_bytes -= old[2]
+        while self._entries and self.used_bytes + size > self.budget_bytes:
+            self._evict_oldest()
+        self._tick += 1
+        self._entries[key] = [self._tick, value, size]
+        self.used_bytes += size
+        return True
+
+    def clear(self):
+        self._entries = {}
+        self.used_bytes = 0
+
+    def _evict_oldest(self):
+        oldest_key = None
+        oldest_tick = None
+        for key, entry in self._entries.items():
+            if oldest_tick is None or entry[0] < oldest_tick:
+                oldest_key = key
+                oldest_tick = entry[0]
+        self.used_bytes -= self._entries.pop(oldest_key)[2]
+        self.evictions += 1
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from core.tags import TagInfo
+from core.models import Track
+from .track_loader import merge_tags, read_track_tags
+
+# Below this many files a process pool costs more to start than it saves.
+# `python -m benchmarks.bench_bulk_import` measured ~10-20 ms of pool startup
+# and IPC against ~40 us of parsing per file, so a 2-core machine breaks even
+# around 800 files; re-run it on the target machine to tune.
+INPROCESS_THRESHOLD = 1000
+DEFAULT_CHUNK_SIZE = 256
+
+
+def _read_chunk(paths: Sequence[str]) -> List[Optional[TagInfo]]:
+    return [read_track_tags(path) for path in paths]
+
+
+def iter_tag_infos(
+    paths: Sequence[str],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    threshold: int = INPROCESS_THRESHOLD,
+) -> Iterator[Tuple[int, Optional[TagInfo]]]:
+    """
+    Yield (position, TagInfo or None) for `paths` in input order as results arrive.
+
+    Header parsing is CPU-bound, so large inputs are split into `chunk_size`
+    batches and parsed on a pool of `workers` processes (None or 0: one per
+    CPU). Inputs smaller than `threshold`, or `workers` == 1, are parsed
+    in-process.
+    """
+    if len(paths) < threshold or workers == 1:
+        for pos, path in enumerate(paths):
+            yield pos, read_track_tags(path)
+        return
+
+    chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    try:
+        results = pool.map(_read_chunk, chunks)
+        pos = 0
+        # Executor.map yields chunks in submission order, so output order is deterministic.
+        for infos in results:
+            for info in infos:
+                yield pos, info
+                pos += 1
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def iter_tagged_batches(
+    batches: Sequence[List[Track]],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    threshold: int = INPROCESS_THRESHOLD,
+) -> Iterator[List[Track]]:
+    """
+    Read header metadata for every track in `batches`, yielding each batch
+    (tagged in place) as soon as its last header is parsed. Pool versus
+    in-process is decided once from the total file count, so many small
+    per-artist batches still share one pool and keep all its workers busy.
+    """
+    tracks = [track for batch in batches for track in batch]
+    infos = iter_tag_infos([track.path for track in tracks], workers, chunk_size, threshold)
+    for batch in batches:
+        for track in batch:
+            _, info = next(infos)
+            if info is not None:
+                merge_tags(track, info)
+        yield batch
@@ -1,17 +1,74 @@
 from __future__ import annotations
 
+import shutil
 import sys
-from typing import Dict
+from typing import Dict, List, Optional, TextIO
 
 from core.interfaces import Screen
 
 
 class ConsoleScreen(Screen):
-    """Minimal console renderer for the PC simulator."""
+    """
+    Minimal console renderer for the PC simulator.
 
-    def __init__(self) -> None:
+    `refresh()` diffs against the last flushed frame and rewrites only the
+    changed lines (cursor positioning + erase-to-end-of-line) in one write.
+    With `headless=True` nothing is written: `frame` holds the rendered lines
+    and `last_output` the escape sequence that would have been sent, for
+    benchmarks and golden-frame tests.
+
+    Cursor addressing only works while the terminal has not scrolled since
+    the last frame. The frame is sized to leave room for `footer` (written
+    under it on every refresh, wrapped as the terminal wraps it), the typed
+    input line and the newline that ends it. Anything else printed in
+    between must call `invalidate()` (see `InvalidatingStream`) so the next
+    refresh redraws the whole screen.
+    """
+
+    # Lines below the frame besides the footer: the typed input line and the row Enter moves to.
+    INPUT_LINES = 2
+    HEADLESS_ROWS = 24
+
+    def __init__(
+        self,
+        rows: Optional[int] = None,
+        headless: bool = False,
+        stream: Optional[TextIO] = None,
+        footer: str = "",
+    ) -> None:
         self._lines: Dict[int, str] = {}
         self._clear_seq = "\033[2J\033[H"  # ANSI clear + cursor home
+        self._rows = rows  # None: follow the terminal height
+        self._headless = headless
+        self._stream = stream
+        self._footer = footer
+        self.frame: List[str] = []  # lines as last flushed
+        self.last_output = ""
+        self._flushed_size: Optional[tuple] = None  # a change (or None) forces a full redraw
+
+    def visible_rows(self) -> int:
+        if self._rows is not None:
+            return self._rows
+        if self._headless:
+            return self.HEADLESS_ROWS
+        size = shutil.get_terminal_size()
+        return max(2, size.lines - self._footer_rows(size.columns) - self.INPUT_LINES)
+
+    def invalidate(self) -> None:
+        """Something else wrote to the terminal: redraw everything on the next refresh."""
+        self._flushed_size = None
+
+    def reset_input(self) -> None:
+        """
+        For input that left the frame unchanged: re-park the cursor under the
+        frame and erase the echoed line (a refresh with no changed rows).
+        """
+        self.refresh()
+
+    def _footer_rows(self, width: int) -> int:
+        if not self._footer:
+            return 0
+        return len(self._footer) // max(1, width) + 1
 
     def clear(self) -> None:
         self._lines.clear()
@@ -21,12 +78,55 @@ class ConsoleScreen(Screen):
         self._lines[y] = f"{' ' * max(0, x)}{text}"
 
     def refresh(self) -> None:
-        sys.stdout.write(self._clear_seq)
-        last_y = -1
-        for y in sorted(self._lines.keys()):
-            while last_y + 1 < y:
-                sys.stdout.write("\n")
-                last_y += 1
-            sys.stdout.write(f"{self._lines[y]}\n")
-            last_y = y
-        sys.stdout.flush()
+        size = (0, 0) if self._headless else tuple(shutil.get_terminal_size())
+        height = max(self._lines) + 1 if self._lines else 0
+        frame = [self._lines.get(y, "") for y in range(height)]
+        if not self._headless:
+            # A wrapped line would shift every row below it; keep one terminal row per line.
+            frame = [line[: size[0] - 1] for line in frame]
+
+        parts: List[str] = []
+        if self._flushed_size != size:
+            parts.append(self._clear_seq)
+            previous: List[str] = []
+        else:
+            previous = self.frame
+        for y, line in enumerate(frame):
+            if y >= len(previous) or previous[y] != line:
+                parts.append(f"\033[{y + 1};1H{line}\033[K")
+        # Park the cursor under the frame and erase whatever was printed there
+        # (footer, typed input, or rows of a longer previous frame).
+        parts.append(f"\033[{height + 1};1H\033[J")
+        if self._footer:
+            parts.append(f"{self._footer}\n")
+
+        self.frame = frame
+        self._flushed_size = size
+        self.last_output = "".join(parts)
+        if not self._headless:
+            out = self._stream if self._stream is not None else sys.stdout
+            out.write(self.last_output)
+            out.flush()
+
+
+class InvalidatingStream:
+    """
+    Stand-in for `sys.stdout` that tells `screen` whenever anything other
+    than the screen writes (log lines scroll the terminal under the frame).
+    Give the screen the real stream so its own writes bypass this.
+    """
+
+    def __init__(self, stream: TextIO, screen: ConsoleScreen) -> None:
+        self._stream = stream
+        self._screen = screen
+
+    def write(self, text: str) -> int:
+        if text:
+            self._screen.invalidate()
+        return self._stream.write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
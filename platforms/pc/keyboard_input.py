@@ -32,14 +32,24 @@ def read_key() -> Optional[str]:
     return line.rstrip("\n")
 
 
-def read_event() -> tuple[Optional[ButtonEvent], bool]:
-    """Return (ButtonEvent or None, quit_flag). Blocking read."""
+def read_events() -> tuple[list[ButtonEvent], bool]:
+    """
+    Return (events, quit_flag) for one line of input. Blocking read.
+
+    A line of repeated keys ("ssss") is a burst of presses, one per
+    character, for the app to apply as a single move.
+    """
     key = read_key()
     if key is None:
-        return None, True  # EOF
+        return [], True  # EOF
 
     if key in QUIT_KEYS:
-        return None, True
+        return [], True
 
     event = KEYMAP.get(key)
-    return event, False
+    if event is not None:
+        return [event], False
+    events = [KEYMAP.get(char) for char in key]
+    if any(event is None for event in events):
+        return [], False
+    return events, False
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.library import Library
+from core.models import Track
+from core.track_store import TrackStore
+from .track_loader import DirStamps, FileStamps, ScanDiff, rescan_library
+
+# Bump whenever the on-disk layout changes; older files are ignored and rebuilt.
+INDEX_VERSION = 3
+
+
+def default_index_path(music_dir: str) -> Path:
+    """Per-library index location under the user cache dir (never inside the music tree)."""
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    root = os.path.abspath(music_dir)
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+    return Path(cache_root) / "harmony" / f"index-{digest}.json"
+
+
+def _track_to_row(track: Optional[Track]) -> Optional[list]:
+    if track is None:
+        return None  # removed slot; kept so Library indices stay valid
+    # The id is almost always the path; store null instead of repeating it.
+    track_id = None if track.id == track.path else track.id
+    return [track_id, track.title, track.artist, track.album, track.track_number, track.duration_secs, track.path]
+
+
+def _row_to_track(row: Optional[list]) -> Optional[Track]:
+    if row is None:
+        return None
+    track_id, title, artist, album, number, duration, path = row
+    return Track(
+        id=path if track_id is None else track_id,
+        title=title,
+        artist=artist,
+        album=album,
+        track_number=number,
+        duration_secs=duration,
+        path=path,
+    )
+
+
+def load_index(index_path: Path, music_dir: str, read_tags: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Read an index file; return None when it is missing, corrupt, for another
+    library, or built with a different `read_tags` setting.
+    """
+    try:
+        with open(index_path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    if data.get("root") != os.path.abspath(music_dir) or data.get("tags") != read_tags:
+        return None
+    if not all(key in data for key in ("dirs", "files", "tracks", "library")):
+        return None
+    return data
+
+
+def save_index(
+    index_path: Path,
+    music_dir: str,
+    tracks: List[Optional[Track]],
+    stamps: DirStamps,
+    library: Library,
+    read_tags: bool = False,
+    files: Optional[FileStamps] = None,
+) -> None:
+    """
+    Atomically write the index; failures are non-fatal (the next start rescans).
+    `files` (per-file stamps) is stored with `read_tags` so in-place tag edits
+    are noticed.
+    """
+    data = {
+        "version": INDEX_VERSION,
+        "root": os.path.abspath(music_dir),
+        "tags": read_tags,
+        "dirs": {path: list(stamp) for path, stamp in stamps.items()},
+        "files": {path: list(stamp) for path, stamp in files.items()} if read_tags and files else {},
+        "tracks": [_track_to_row(track) for track in tracks],
+        "library": library.snapshot(),
+    }
+    index_path = Path(index_path)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
+
+
+def _library_from_index(index: Dict[str, Any], compact: bool = False) -> Optional[Tuple[List[Optional[Track]], Library]]:
+    try:
+        tracks = [_row_to_track(row) for row in index["tracks"]]
+        if compact:
+            tracks = TrackStore(tracks)
+        library = Library(tracks, snapshot=index["library"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return tracks, library
+
+
+def refresh_library(
+    music_dir: str,
+    library: Library,
+    stamps: DirStamps,
+    index_path: Optional[Path] = None,
+    read_tags: bool = False,
+    files: Optional[FileStamps] = None,
+) -> ScanDiff:
+    """
+    Bring a live `library` up to date by re-reading only changed directories
+    (and, with `read_tags`, re-parsing only changed files), then persist the
+    result. `stamps` and `files` are the stamps `library` was built from.
+    """
+    diff = rescan_library(music_dir, library.tracks, stamps, read_tags=read_tags, files=files)
+    if diff:
+        library.apply_changes(diff.added, diff.removed, diff.modified)
+    if diff or diff.stamps != stamps or (read_tags and diff.files != files):
+        index_path = Path(index_path) if index_path is not None else default_index_path(music_dir)
+        save_index(index_path, music_dir, library.tracks, diff.stamps, library, read_tags, diff.files)
+    return diff
+
+
+def load_cached_library(
+    music_dir: str,
+    index_path: Optional[Path] = None,
+    read_tags: bool = False,
+    compact: bool = False,
+) -> Optional[Tuple[List[Optional[Track]], Library]]:
+    """
+    Restore tracks and Library indexes from the on-disk index, re-reading only
+    directories that changed since it was written. Returns None when there is
+    no usable index (missing, corrupt, or for another library). With
+    `compact`, tracks are held in a TrackStore instead of a list.
+    """
+    index_path = Path(index_path) if index_path is not None else default_index_path(music_dir)
+    index = load_index(index_path, music_dir, read_tags)
+    cached = _library_from_index(index, compact) if index is not None else None
+    if cached is None:
+        return None
+    tracks, library = cached
+    stamps = {path: tuple(stamp) for path, stamp in index["dirs"].items()}
+    files = {path: tuple(stamp) for path, stamp in index.get("files", {}).items()}
+    # Stats every known directory (and file, with tags); only the changed ones are re-read.
+    refresh_library(music_dir, library, stamps, index_path, read_tags, files)
+    return tracks, library
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import sys
+import threading
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional
 
+from core.input_coalescer import coalesce
 from core.player_app import PlayerApp
-from core.models import ButtonEvent, PlayerState, Track
-from .console_screen import ConsoleScreen
-from .keyboard_input import read_event
+from core.models import PlayerState, Track
+from core.runtime import Runtime
+from core.track_store import TrackStore
+from .console_screen import ConsoleScreen, InvalidatingStream
+from .keyboard_input import read_events
+from .bulk_import import INPROCESS_THRESHOLD, iter_tagged_batches
+from .library_index import default_index_path, load_cached_library, save_index
 from .pc_audio_backend import PcAudioBackend
-from .track_loader import load_tracks_from_dir
+from .track_loader import DirStamps, FileStamps, same_track, file_stamps, iter_scan
 
 
-KEY_HINT = "w/s: up/down | a: left | d: right | space/enter: select | p: play/pause | +/-: volume | b/q: back | x: quit"
+KEY_HINT = "w/s: up/down (ssss: 4 rows) | a: left | d: right | space/enter: select | p: play/pause | +/-: volume | b/q: back | x: quit"
+TICK_MS = 250  # playback clock resolution
 
 
 def sample_tracks() -> list[Track]:
@@ -45,31 +57,198 @@ def sample_tracks() -> list[Track]:
     ]
 
 
+def stream_library(
+    app: PlayerApp,
+    music_dir: str,
+    call: Callable[..., None],
+    workers: int = 1,
+    index_path: Optional[Path] = None,
+    read_tags: bool = False,
+    tag_workers: int = 0,
+) -> None:
+    """
+    Feed scan batches into a running app as artist directories are read, so the
+    UI is usable before the scan finishes. Runs on a worker thread: every app
+    update goes through `call(fn, *args)`, which must run `fn` on the app's
+    loop. Writes the index at the end unless `index_path` is None.
+
+    With `read_tags`, each batch still reaches the app as soon as its directory
+    is listed, with filename-derived metadata. Once the whole tree is listed
+    (so the pool-or-not decision in `iter_tagged_batches` sees the total file
+    count) the headers are parsed on `tag_workers` processes (0: one per CPU)
+    and each batch's tags are applied as `modified` updates.
+
+    Unreadable directories are skipped. If the scan fails outright, the error
+    is reported on the app's loop and what was read so far is still indexed
+    (only its stamps are saved, so the rest is re-read next time).
+    """
+    stamps: DirStamps = {}
+    files: FileStamps = {}
+    listed: list[tuple[list[Track], list[int], FileStamps]] = []
+    try:
+        for batch, batch_stamps in iter_scan(music_dir, workers=workers):
+            if batch:
+                slots: list[int] = []  # filled on the app's loop, read only there
+                call(_add_batch, app, batch, slots)
+                if read_tags:
+                    listed.append(([_copy_track(track) for track in batch], slots, file_stamps(batch)))
+            stamps.update(batch_stamps)
+        tagged = iter_tagged_batches([batch for batch, _, _ in listed], workers=tag_workers or None)
+        for batch, (_, slots, batch_files) in zip(tagged, listed):
+            call(_apply_tags, app, slots, batch)
+            files.update(batch_files)
+    except Exception as exc:
+        call(print, f"[Scan] Stopped early, library is incomplete: {exc!r}")
+    call(_finish_scan, app, music_dir, index_path, stamps, read_tags, files)
+
+
+def _copy_track(track: Track) -> Track:
+    return Track(
+        track.id, track.title, track.artist, track.album, track.track_number, track.duration_secs, track.path
+    )
+
+
+def _add_batch(app: PlayerApp, batch: list[Track], slots: list[int]) -> None:
+    slots.extend(app.add_tracks(batch))
+
+
+def _apply_tags(app: PlayerApp, slots: list[int], tagged: list[Track]) -> None:
+    tracks = app.library.tracks
+    modified = [(idx, track) for idx, track in zip(slots, tagged) if not same_track(tracks[idx], track)]
+    app.apply_changes(modified=modified)
+
+
+def _finish_scan(
+    app: PlayerApp,
+    music_dir: str,
+    index_path: Optional[Path],
+    stamps: DirStamps,
+    read_tags: bool,
+    files: FileStamps,
+) -> None:
+    if not app.library.artist_index:
+        app.add_tracks(sample_tracks())
+        return
+    if index_path is not None:
+        save_index(index_path, music_dir, app.library.tracks, stamps, app.library, read_tags, files)
+
+
+def apply_input(app: PlayerApp, moves: list) -> None:
+    """
+    Apply one typed line's moves. The terminal echoed the line under the
+    frame, so when nothing was redrawn (no-op or unknown keys) the input
+    area is still cleared, or repeated lines would scroll the frame away.
+    """
+    renders = app.renders_performed
+    if moves:
+        app.handle_batch(moves)
+    if app.renders_performed == renders:
+        app.screen.reset_input()
+
+
+def read_input(loop: asyncio.AbstractEventLoop, runtime: Runtime) -> None:
+    """
+    Blocking stdin reader for a daemon thread; hands each line's events to
+    the runtime's loop as one coalesced batch.
+    """
+    while True:
+        events, should_quit = read_events()
+        if should_quit:
+            loop.call_soon_threadsafe(runtime.call, runtime.stop)  # after queued input
+            return
+        loop.call_soon_threadsafe(runtime.call, apply_input, runtime.app, coalesce(events))
+
+
+async def run(
+    app: PlayerApp,
+    audio: PcAudioBackend,
+    scan: Optional[Callable[[Callable[..., None]], None]] = None,
+) -> None:
+    """
+    Drive the app from one asyncio loop: stdin input, the playback tick and
+    (optionally) `scan(call)` on a background thread all feed the runtime.
+    """
+    loop = asyncio.get_running_loop()
+    runtime = Runtime(app)
+
+    def call(fn: Callable[..., None], *args: object) -> None:
+        loop.call_soon_threadsafe(runtime.call, fn, *args)
+
+    threading.Thread(target=read_input, args=(loop, runtime), daemon=True).start()
+    if scan is not None:
+        threading.Thread(target=scan, args=(call,), daemon=True).start()
+    await runtime.run(runtime.every(TICK_MS, audio.poll))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="PC simulator for the MP3 player")
     parser.add_argument("--music-dir", type=str, default=None, help="Optional directory of audio files to load")
+    parser.add_argument(
+        "--index-file",
+        type=str,
+        default=None,
+        help="Library index cache location (default: per-library file under ~/.cache/harmony)",
+    )
+    parser.add_argument("--no-index", action="store_true", help="Always rescan --music-dir; skip the index cache")
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=1,
+        help="Threads used to read artist directories in parallel (helps on network/USB storage)",
+    )
+    parser.add_argument(
+        "--read-tags",
+        action="store_true",
+        help="Read ID3/FLAC/WAV headers for titles, artists and durations (slower first scan)",
+    )
+    parser.add_argument(
+        "--tag-workers",
+        type=int,
+        default=0,
+        help=(
+            "Processes used to parse headers with --read-tags (0: one per CPU). Libraries under "
+            f"{INPROCESS_THRESHOLD} files are parsed in-process, where a pool would cost more than it saves"
+        ),
+    )
     args = parser.parse_args()
 
-    tracks = load_tracks_from_dir(args.music_dir) if args.music_dir else sample_tracks()
-    if not tracks:
+    tracks: list[Track | None] = []
+    library = None
+    index_path = None
+    stream = False
+    if args.music_dir:
+        if not args.no_index:
+            index_path = Path(args.index_file) if args.index_file else default_index_path(args.music_dir)
+            cached = load_cached_library(args.music_dir, index_path, args.read_tags, compact=True)
+            if cached is not None:
+                tracks, library = cached
+        # No usable index: scan in the background and fill the UI as we go.
+        stream = library is None
+        if stream:
+            tracks = TrackStore()
+    if not stream and not any(track is not None for track in tracks):
         tracks = sample_tracks()
+        library = None
 
     state = PlayerState(tracks=tracks)
-    screen = ConsoleScreen()
+    screen = ConsoleScreen(stream=sys.stdout, footer=KEY_HINT)
+    sys.stdout = InvalidatingStream(sys.stdout, screen)  # audio log lines force a full redraw
     audio = PcAudioBackend()
-    app = PlayerApp(state=state, screen=screen, audio_backend=audio)
+    app = PlayerApp(state=state, screen=screen, audio_backend=audio, library=library)
 
     app.render()
-    print(KEY_HINT)
-    while True:
-        event, should_quit = read_event()
-        if should_quit:
-            break
-        if event is None:
-            continue
-
-        app.handle_button(event)
-        print(KEY_HINT)
+    scan = None
+    if stream:
+        scan = partial(
+            stream_library,
+            app,
+            args.music_dir,
+            workers=args.scan_workers,
+            index_path=index_path,
+            read_tags=args.read_tags,
+            tag_workers=args.tag_workers,
+        )
+    asyncio.run(run(app, audio, scan))
 
 
 if __name__ == "__main__":
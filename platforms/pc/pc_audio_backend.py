@@ -1,32 +1,69 @@
 from __future__ import annotations
 
+import time
+from typing import Callable, Optional
+
 from core.interfaces import AudioBackend
 from core.models import Track
 
 
 class PcAudioBackend(AudioBackend):
-    """Print-only audio backend for the PC simulator."""
+    """
+    Print-only audio backend for the PC simulator.
+
+    Playback is simulated against `clock`: `poll()` (called from a periodic
+    tick) fires `on_track_end` once a track's duration has elapsed, so queues
+    advance as they would on the device.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
         self.last_track: Track | None = None
         self.volume: int | None = None
+        self.on_track_end: Optional[Callable[[bool], None]] = None
+        self._clock = clock
+        self._started: float | None = None  # clock time the track would have started, if playing
+        self._elapsed = 0.0  # seconds played when paused
 
     def play(self, track: Track) -> None:
         self.last_track = track
+        self._started = self._clock()
+        self._elapsed = 0.0
         self._log(f"Play: {track.title} - {track.artist}")
 
     def pause(self) -> None:
+        self._elapsed = self.position_secs()
+        self._started = None
         self._log("Pause")
 
     def resume(self) -> None:
+        if self.last_track is not None:
+            self._started = self._clock() - self._elapsed
         self._log("Resume")
 
     def stop(self) -> None:
+        self._started = None
+        self._elapsed = 0.0
         self._log("Stop")
 
     def set_volume(self, level: int) -> None:
         self.volume = level
         self._log(f"Volume: {level}")
 
+    def position_secs(self) -> float:
+        if self._started is None:
+            return self._elapsed
+        return self._clock() - self._started
+
+    def poll(self) -> None:
+        """Report the end of the current track once its duration has passed."""
+        track = self.last_track
+        if self._started is None or track is None or not track.duration_secs:
+            return
+        if self.position_secs() >= track.duration_secs:
+            self._started = None
+            self._elapsed = 0.0
+            if self.on_track_end is not None:
+                self.on_track_end(False)
+
     def _log(self, message: str) -> None:
         print(f"[Audio] {message}")
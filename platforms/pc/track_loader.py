@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from core import tags
 from core.models import Track
 
 SUPPORTED_EXTS = {".mp3", ".wav", ".flac"}
 
+# Patterns: "01 - Title", "01_Title", "01 Title"
+_NUMBERED_RE = re.compile(r"^(\d+)[\s\-_\.]+(.+)$")
+
 
 def _parse_filename(name: str) -> Tuple[Optional[int], str]:
     """Extract optional leading track number and title from a filename stem."""
-    # Patterns: "01 - Title", "01_Title", "01 Title"
-    m = re.match(r"^(\d+)[\s\-_\.]+(.+)$", name)
+    if not name[:1].isdigit():
+        return None, name
+    m = _NUMBERED_RE.match(name)
     if m:
         try:
             number = int(m.group(1))
@@ -23,69 +30,339 @@ def _parse_filename(name: str) -> Tuple[Optional[int], str]:
     return None, name
 
 
-def load_tracks_from_dir(path: str) -> List[Track]:
-    """Build Track objects from a directory tree using Artist/Album/Track convention."""
-    base = Path(path)
-    if not base.exists() or not base.is_dir():
-        return []
+# Directory path -> (mtime_ns, inode); used to validate cached scans.
+DirStamps = Dict[str, Tuple[int, int]]
 
-    tracks: List[Track] = []
 
-    for artist_dir in sorted([p for p in base.iterdir() if p.is_dir()]):
-        artist = artist_dir.name
-        album_dirs = [p for p in artist_dir.iterdir() if p.is_dir()]
-        # If files are directly under artist_dir, treat album as unknown.
-        file_entries = [p for p in artist_dir.iterdir() if p.is_file()]
+def dir_stamp(path: str) -> Tuple[int, int]:
+    """Return the (mtime_ns, inode) pair that identifies a directory listing."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_ino
 
-        for file_entry in file_entries:
-            if file_entry.suffix.lower() not in SUPPORTED_EXTS:
-                continue
-            number, title = _parse_filename(file_entry.stem)
-            tracks.append(
-                Track(
-                    id=str(file_entry),
-                    title=title,
-                    artist=artist,
-                    album=None,
-                    track_number=number,
-                    duration_secs=0,
-                    path=str(file_entry),
-                )
-            )
 
-        for album_dir in sorted(album_dirs):
-            album = album_dir.name
-            for file_entry in sorted([p for p in album_dir.iterdir() if p.is_file()]):
-                if file_entry.suffix.lower() not in SUPPORTED_EXTS:
-                    continue
-                number, title = _parse_filename(file_entry.stem)
-                tracks.append(
-                    Track(
-                        id=str(file_entry),
-                        title=title,
-                        artist=artist,
-                        album=album,
-                        track_number=number,
-                        duration_secs=0,
-                        path=str(file_entry),
-                    )
-                )
+# File path -> (mtime_ns, size); kept when tags were read, since rewriting a
+# file's tags in place does not touch its directory's stamp.
+FileStamps = Dict[str, Tuple[int, int]]
 
-    # Files directly under base (no artist folder) fallback to unknown artist/album.
-    for file_entry in sorted([p for p in base.iterdir() if p.is_file()]):
-        if file_entry.suffix.lower() not in SUPPORTED_EXTS:
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """Return the (mtime_ns, size) pair that identifies a file's contents."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def file_stamps(tracks: List[Track]) -> FileStamps:
+    """Stamp every track's file (take these before reading tags); unreadable files are skipped."""
+    stamps: FileStamps = {}
+    for track in tracks:
+        try:
+            stamps[track.path] = file_stamp(track.path)
+        except OSError:
             continue
-        number, title = _parse_filename(file_entry.stem)
+    return stamps
+
+
+def load_tracks_from_dir(path: str, workers: int = 1, read_tags: bool = False) -> List[Track]:
+    """Build Track objects from a directory tree using Artist/Album/Track convention."""
+    return scan_library(path, workers=workers, read_tags=read_tags)[0]
+
+
+def _audio_stem(name: str) -> Optional[str]:
+    """Return the stem of a supported audio file name, else None (Path.suffix rules)."""
+    dot = name.rfind(".")
+    if dot <= 0:
+        return None
+    ext = name[dot:]
+    if ext in SUPPORTED_EXTS or ext.lower() in SUPPORTED_EXTS:
+        return name[:dot]
+    return None
+
+
+def _list_dir(directory: str) -> Tuple[List[str], List[str]]:
+    """
+    Read `directory` once: (sorted subdirectory names, sorted audio file names).
+
+    Uses scandir entry types, so no per-entry stat is issued except for
+    symlinks or filesystems that do not report d_type.
+    """
+    dirs: List[str] = []
+    files: List[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if _audio_stem(name) is not None and entry.is_file():
+                files.append(name)
+            elif entry.is_dir():
+                dirs.append(name)
+    dirs.sort()
+    files.sort()
+    return dirs, files
+
+
+def merge_tags(track: Track, info: tags.TagInfo) -> None:
+    """Overlay header metadata onto a filename-derived track; missing fields are kept."""
+    if info.title is not None:
+        track.title = info.title
+    if info.artist is not None:
+        track.artist = info.artist
+    if info.album is not None:
+        track.album = info.album
+    if info.track_number is not None:
+        track.track_number = info.track_number
+    if info.duration_secs is not None:
+        track.duration_secs = info.duration_secs
+
+
+def read_track_tags(path: str) -> Optional[tags.TagInfo]:
+    """Header metadata for one file, or None if it cannot be read or parsed."""
+    try:
+        return tags.read_tags(path)
+    except (OSError, ValueError, IndexError, KeyError):
+        return None
+
+
+def apply_tags(tracks: List[Track]) -> List[Track]:
+    """Read header metadata (bounded reads) for each track in place."""
+    for track in tracks:
+        info = read_track_tags(track.path)
+        if info is not None:
+            merge_tags(track, info)
+    return tracks
+
+
+def _make_tracks(
+    directory: str,
+    files: List[str],
+    artist: Optional[str],
+    album: Optional[str],
+    read_tags: bool = False,
+) -> List[Track]:
+    prefix = os.path.join(directory, "")
+    tracks = []
+    for name in files:
+        number, title = _parse_filename(_audio_stem(name))
+        file_path = prefix + name
         tracks.append(
             Track(
-                id=str(file_entry),
+                id=file_path,
                 title=title,
-                artist=None,
-                album=None,
+                artist=artist,
+                album=album,
                 track_number=number,
                 duration_secs=0,
-                path=str(file_entry),
+                path=file_path,
             )
         )
-
+    if read_tags:
+        apply_tags(tracks)
     return tracks
+
+
+def _normalize_root(path: str) -> Optional[str]:
+    base = str(Path(path))
+    return base if os.path.isdir(base) else None
+
+
+def _scan_artist(base: str, artist: str, read_tags: bool = False) -> Tuple[List[Track], DirStamps]:
+    """
+    Tracks and stamps under one artist directory; directories that vanish or
+    cannot be read (e.g. PermissionError) are skipped, as `rescan_library` does.
+    """
+    artist_dir = os.path.join(base, artist)
+    try:
+        stamps: DirStamps = {artist_dir: dir_stamp(artist_dir)}
+        album_names, artist_files = _list_dir(artist_dir)
+    except OSError:
+        return [], {}
+    # Files directly under artist_dir have no album.
+    tracks = _make_tracks(artist_dir, artist_files, artist, None, read_tags)
+
+    for album in album_names:
+        album_dir = os.path.join(artist_dir, album)
+        try:
+            album_stamp = dir_stamp(album_dir)
+            _, album_files = _list_dir(album_dir)
+        except OSError:
+            continue
+        stamps[album_dir] = album_stamp
+        tracks.extend(_make_tracks(album_dir, album_files, artist, album, read_tags))
+    return tracks, stamps
+
+
+def iter_scan(path: str, workers: int = 1, read_tags: bool = False) -> Iterator[Tuple[List[Track], DirStamps]]:
+    """
+    Stream a scan of `path` as (tracks, stamps) batches, one per artist directory
+    in sorted order, ending with the loose files under `path` itself.
+
+    With `workers` > 1, artist directories are read concurrently on a thread
+    pool (directory reads release the GIL, so this overlaps storage latency);
+    batches are still yielded in the same sorted order as the serial scan.
+    With `read_tags`, file headers override filename-derived metadata.
+    """
+    base = _normalize_root(path)
+    if base is None:
+        return
+
+    base_stamp = dir_stamp(base)
+    artist_names, loose_files = _list_dir(base)
+
+    if workers > 1 and len(artist_names) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(lambda artist: _scan_artist(base, artist, read_tags), artist_names)
+    else:
+        for artist in artist_names:
+            yield _scan_artist(base, artist, read_tags)
+
+    # Files directly under base (no artist folder) fallback to unknown artist/album.
+    yield _make_tracks(base, loose_files, None, None, read_tags), {base: base_stamp}
+
+
+def iter_track_batches(path: str, workers: int = 1, read_tags: bool = False) -> Iterator[List[Track]]:
+    """Yield Track batches as directories are read (see `iter_scan`)."""
+    for tracks, _ in iter_scan(path, workers=workers, read_tags=read_tags):
+        if tracks:
+            yield tracks
+
+
+def scan_library(path: str, workers: int = 1, read_tags: bool = False) -> Tuple[List[Track], DirStamps]:
+    """Scan `path` and return its tracks plus stamps for every directory visited."""
+    tracks: List[Track] = []
+    stamps: DirStamps = {}
+    for batch, batch_stamps in iter_scan(path, workers=workers, read_tags=read_tags):
+        tracks.extend(batch)
+        stamps.update(batch_stamps)
+    return tracks, stamps
+
+
+class ScanDiff:
+    """
+    Changes found by `rescan_library`, relative to a prior track list.
+
+    `removed` and `modified` refer to indices in that prior list so the diff
+    can be applied to a live `Library` via `Library.apply_changes`.
+    """
+
+    def __init__(self) -> None:
+        self.added: List[Track] = []
+        self.removed: List[int] = []
+        self.modified: List[Tuple[int, Track]] = []
+        self.stamps: DirStamps = {}
+        self.files: FileStamps = {}  # only filled when tags are read
+        self.dirs_read = 0
+        self.files_read = 0  # files in unchanged directories re-parsed because their stamp changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+def same_track(a: Track, b: Track) -> bool:
+    return (
+        a.id == b.id
+        and a.title == b.title
+        and a.artist == b.artist
+        and a.album == b.album
+        and a.track_number == b.track_number
+        and a.duration_secs == b.duration_secs
+    )
+
+
+def rescan_library(
+    path: str,
+    tracks: List[Optional[Track]],
+    stamps: DirStamps,
+    read_tags: bool = False,
+    files: Optional[FileStamps] = None,
+) -> ScanDiff:
+    """
+    Re-read only the directories whose stamp changed since `stamps` was taken.
+
+    Unchanged directories are trusted (their subdirectories come from `stamps`,
+    their tracks from `tracks`); `None` entries in `tracks` are skipped. With
+    `read_tags`, every file is stamped into `diff.files`, and files in
+    unchanged directories whose stamp differs from `files` are re-parsed.
+    """
+    diff = ScanDiff()
+    base = _normalize_root(path)
+    if base is None:
+        diff.removed = [idx for idx, track in enumerate(tracks) if track is not None]
+        return diff
+
+    prior_children: Dict[str, List[str]] = {}
+    for dir_path in stamps:
+        parent = os.path.dirname(dir_path)
+        if parent != dir_path:
+            prior_children.setdefault(parent, []).append(dir_path)
+    prior_by_dir: Dict[str, List[int]] = {}
+    for idx, track in enumerate(tracks):
+        if track is not None:
+            prior_by_dir.setdefault(os.path.dirname(track.path), []).append(idx)
+
+    fresh: Dict[str, List[Track]] = {}
+
+    def retag(directory: str, artist: Optional[str], album: Optional[str]) -> None:
+        for idx in prior_by_dir.get(directory, ()):
+            track = tracks[idx]
+            try:
+                stamp = file_stamp(track.path)
+            except OSError:
+                continue  # gone or unreadable; its directory's next stamp change drops it
+            diff.files[track.path] = stamp
+            if files is None or files.get(track.path) == stamp:
+                continue
+            diff.files_read += 1
+            new_track = _make_tracks(directory, [os.path.basename(track.path)], artist, album, read_tags)[0]
+            if not same_track(track, new_track):
+                diff.modified.append((idx, new_track))
+
+    def visit(directory: str, depth: int, artist: Optional[str], album: Optional[str]) -> None:
+        stamp = dir_stamp(directory)
+        if stamps.get(directory) == stamp:
+            diff.stamps[directory] = stamp
+            subdirs = sorted(prior_children.get(directory, []))
+            if read_tags:
+                retag(directory, artist, album)
+        else:
+            names, audio_files = _list_dir(directory)
+            diff.stamps[directory] = stamp  # only once it could be read
+            diff.dirs_read += 1
+            subdirs = [os.path.join(directory, name) for name in names]
+            new_tracks = _make_tracks(directory, audio_files, artist, album)
+            if read_tags:
+                diff.files.update(file_stamps(new_tracks))
+                apply_tags(new_tracks)
+            fresh[directory] = new_tracks
+        if depth < 2:
+            for subdir in subdirs:
+                name = os.path.basename(subdir)
+                try:
+                    if depth == 0:
+                        visit(subdir, 1, name, None)
+                    else:
+                        visit(subdir, 2, artist, name)
+                except OSError:
+                    continue  # removed since it was listed or stamped, or unreadable
+
+    visit(base, 0, None, None)
+
+    for dir_path, indices in prior_by_dir.items():
+        if dir_path not in diff.stamps:
+            diff.removed.extend(indices)
+            continue
+        new_tracks = fresh.get(dir_path)
+        if new_tracks is None:
+            continue
+        by_path = {tracks[idx].path: idx for idx in indices}
+        for track in new_tracks:
+            idx = by_path.pop(track.path, None)
+            if idx is None:
+                diff.added.append(track)
+            elif not same_track(tracks[idx], track):
+                diff.modified.append((idx, track))
+        diff.removed.extend(by_path.values())
+
+    for dir_path, new_tracks in fresh.items():
+        if dir_path not in prior_by_dir:
+            diff.added.extend(new_tracks)
+
+    diff.removed.sort()
+    return diff
@@ -6,8 +6,11 @@ set -euo pipefail
 PORT="${PORT:-/dev/cu.usbmodem11101}"
 
 mpremote connect "${PORT}" cp -r core :core
+mpremote connect "${PORT}" cp platforms/esp32/dirty_rects.py :dirty_rects.py
+mpremote connect "${PORT}" cp platforms/esp32/row_cache.py :row_cache.py
 mpremote connect "${PORT}" cp platforms/esp32/esp_screen.py :esp_screen.py
 mpremote connect "${PORT}" cp platforms/esp32/esp_audio_backend.py :esp_audio_backend.py
+mpremote connect "${PORT}" cp platforms/esp32/esp_runtime.py :esp_runtime.py
 mpremote connect "${PORT}" cp platforms/esp32/main_esp32.py :main.py
 
 # Kick off the demo loop
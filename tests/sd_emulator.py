@@ -0,0 +1,206 @@
+"""Byte-level SD card (SPI mode) emulator for exercising hardware/prototype1/sdcard.py under CPython."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, List, Optional
+
+BLOCK = 512
+
+
+class FakeCS:
+    OUT = 1
+
+    def __init__(self, card: "FakeSDCard") -> None:
+        self.card = card
+        self.value = 1
+
+    def init(self, mode: int = 1, value: int = 1) -> None:
+        self(value)
+
+    def __call__(self, value: int) -> None:
+        self.value = value
+        if value:
+            self.card.deselect()
+
+
+class FakeSDCard:
+    """
+    Emulates the SPI side of an SD card: commands (CMD0/8/9/12/16/17/18/24/
+    25/55/58, ACMD41), data tokens, CRC bytes and busy signalling. Every
+    clocked byte goes through `_clock`, so `read`, `readinto`, `write` and
+    `write_readinto` behave like a full-duplex bus; as on MicroPython, reads
+    clock out 0x00 unless told otherwise. Pass `.cs` as the chip select.
+    `read_calls` counts uses of the allocating `read()`; `stall_reads` makes
+    the card accept read commands but never send data.
+    """
+
+    def __init__(self, blocks: int = 4096, sdhc: bool = True, busy_bytes: int = 3) -> None:
+        self.data = bytearray(blocks * BLOCK)
+        for i in range(blocks):
+            self.data[i * BLOCK : i * BLOCK + 4] = i.to_bytes(4, "big")
+        self.blocks = blocks
+        self.sdhc = sdhc
+        self.busy_bytes = busy_bytes
+        self.cs = FakeCS(self)
+        self.commands: List[int] = []
+        self.baudrates: List[int] = []
+        self.fail_next: Optional[int] = None  # command number to answer with an error once
+        self.stall_reads = False
+        self.read_calls = 0
+        self._out: Deque[int] = deque()
+        self._cmd = bytearray()
+        self._idle = True
+        self._app_cmd = False
+        self._reading: Optional[int] = None  # next block of a CMD18 stream
+        self._writing: Optional[int] = None  # next block of a CMD24/25 write
+        self._multi_write = False
+        self._rx: Optional[bytearray] = None  # incoming data block (+ CRC)
+
+    # SPI interface
+
+    def init(self, baudrate: int = 0, **_kwargs) -> None:
+        self.baudrates.append(baudrate)
+
+    def write(self, buf) -> None:
+        for byte in bytes(buf):
+            self._clock(byte)
+
+    def read(self, n: int, write: int = 0x00) -> bytes:
+        self.read_calls += 1
+        return bytes(self._clock(write) for _ in range(n))
+
+    def readinto(self, buf, write: int = 0x00) -> None:
+        for i in range(len(buf)):
+            buf[i] = self._clock(write)
+
+    def write_readinto(self, wbuf, rbuf) -> None:
+        for i in range(len(wbuf)):
+            rbuf[i] = self._clock(wbuf[i])
+
+    # Card side
+
+    def deselect(self) -> None:
+        self._cmd = bytearray()
+
+    def _clock(self, mosi: int) -> int:
+        if self.cs.value:
+            return 0xFF
+        miso = self._out.popleft() if self._out else 0xFF
+        if self._rx is not None:
+            self._receive(mosi)
+        elif self._writing is not None and not self._cmd:
+            self._await_token(mosi)
+        elif self._cmd or mosi & 0xC0 == 0x40:
+            self._cmd.append(mosi)
+            if len(self._cmd) == 6:
+                self._command(self._cmd[0] & 0x3F, int.from_bytes(self._cmd[1:5], "big"))
+                self._cmd = bytearray()
+        if self._reading is not None and not self._out:
+            self._queue_block(self._reading)
+            self._reading += 1
+        return miso
+
+    def _addr_to_block(self, arg: int) -> int:
+        return arg if self.sdhc else arg // BLOCK
+
+    def _command(self, cmd: int, arg: int) -> None:
+        app, self._app_cmd = self._app_cmd, False
+        self.commands.append(100 + cmd if app else cmd)
+        if self.fail_next == cmd:
+            self.fail_next = None
+            self._respond(0x04)  # illegal command
+            return
+        if cmd == 12:
+            self._reading = None
+            self._out.clear()
+            self._out.extend([0x3C, 0x00] + [0x00] * self.busy_bytes)  # stuff byte, R1, busy
+            return
+        if cmd == 0:
+            self._idle = True
+            self._respond(0x01)
+        elif cmd == 8:
+            self._respond(0x01, [0x00, 0x00, 0x01, 0xAA])
+        elif cmd == 55:
+            self._app_cmd = True
+            self._respond(0x01 if self._idle else 0x00)
+        elif cmd == 41 and app:
+            self._idle = False
+            self._respond(0x00)
+        elif cmd == 58:
+            ocr = 0xC0FF8000 if self.sdhc else 0x80FF8000  # power-up done, CCS for SDHC
+            self._respond(0x01 if self._idle else 0x00, list(ocr.to_bytes(4, "big")))
+        elif cmd == 9:
+            self._respond(0x00)
+            self._out.extend([0xFF, 0xFE] + list(self.csd()) + [0xFF, 0xFF])
+        elif cmd == 16:
+            self._respond(0x00)
+        elif cmd in (17, 18):
+            block = self._addr_to_block(arg)
+            if block >= self.blocks:
+                self._respond(0x40)  # address error
+                return
+            self._respond(0x00)
+            if self.stall_reads:
+                return
+            self._queue_block(block)
+            self._reading = block + 1 if cmd == 18 else None
+        elif cmd in (24, 25):
+            self._respond(0x00)
+            self._writing = self._addr_to_block(arg)
+            self._multi_write = cmd == 25
+        else:
+            self._respond(0x04)
+
+    def _respond(self, r1: int, extra: Optional[List[int]] = None) -> None:
+        self._out.clear()
+        self._out.append(0xFF)  # one byte of response latency (NCR)
+        self._out.append(r1)
+        if extra:
+            self._out.extend(extra)
+
+    def _queue_block(self, block: int) -> None:
+        self._out.extend([0xFF, 0xFF, 0xFE])
+        self._out.extend(self.data[block * BLOCK : (block + 1) * BLOCK])
+        self._out.extend([0xAB, 0xCD])  # CRC (ignored in SPI mode)
+
+    def _await_token(self, mosi: int) -> None:
+        if mosi in (0xFE, 0xFC):
+            self._rx = bytearray()
+        elif mosi == 0xFD and self._multi_write:
+            self._writing = None
+            self._out.extend([0xFF] + [0x00] * self.busy_bytes)
+
+    def _receive(self, mosi: int) -> None:
+        self._rx.append(mosi)
+        if len(self._rx) < BLOCK + 2:
+            return
+        block = self._writing
+        self.data[block * BLOCK : (block + 1) * BLOCK] = self._rx[:BLOCK]
+        self._rx = None
+        self._out.clear()
+        self._out.extend([0xE5] + [0x00] * self.busy_bytes)  # data accepted, then busy
+        if self._multi_write:
+            self._writing = block + 1
+        else:
+            self._writing = None
+
+    def csd(self) -> bytes:
+        """CSD register: v2 (C_SIZE in 512 KiB units) for SDHC, v1 otherwise."""
+        csd = bytearray(16)
+        if self.sdhc:
+            csd[0] = 0x40
+            c_size = self.blocks // 1024 - 1
+            csd[7] = (c_size >> 16) & 0x3F
+            csd[8] = (c_size >> 8) & 0xFF
+            csd[9] = c_size & 0xFF
+        else:
+            # blocks = (C_SIZE + 1) * 2^(C_SIZE_MULT + 2) * 2^READ_BL_LEN / 512; use READ_BL_LEN=9, MULT=7.
+            c_size = self.blocks // 512 - 1
+            csd[5] = 0x09
+            csd[6] = (c_size >> 10) & 0x03
+            csd[7] = (c_size >> 2) & 0xFF
+            csd[8] = (c_size & 0x03) << 6
+            csd[9] = 0x03
+            csd[10] = 0x80
+        return bytes(csd)
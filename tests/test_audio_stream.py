@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import io
+
+from core.audio_stream import StreamingPlayer
+from core.models import Track
+
+BYTE_RATE = 44100 * 2 * 2  # 16-bit stereo
+
+
+def make_wav(pcm: bytes, pad_before_data: int = 0) -> bytes:
+    fmt = (1).to_bytes(2, "little") + (2).to_bytes(2, "little") + (44100).to_bytes(4, "little")
+    fmt += BYTE_RATE.to_bytes(4, "little") + (4).to_bytes(2, "little") + (16).to_bytes(2, "little")
+    body = b"WAVE" + b"fmt " + len(fmt).to_bytes(4, "little") + fmt
+    if pad_before_data:
+        body += b"JUNK" + pad_before_data.to_bytes(4, "little") + b"\x00" * pad_before_data
+    body += b"data" + len(pcm).to_bytes(4, "little") + pcm
+    return b"RIFF" + len(body).to_bytes(4, "little") + body
+
+
+class SimClock:
+    def __init__(self) -> None:
+        self.now_us = 0
+
+
+class SlowFile(io.BytesIO):
+    """In-memory file whose reads cost simulated time: fixed latency plus per-byte transfer."""
+
+    def __init__(self, data: bytes, clock: SimClock, latency_us: int, bytes_per_sec: int) -> None:
+        super().__init__(data)
+        self.clock = clock
+        self.latency_us = latency_us
+        self.bytes_per_sec = bytes_per_sec
+        self.reads: list[tuple[int, int]] = []
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        self.clock.now_us += self.latency_us + len(data) * 1_000_000 // self.bytes_per_sec
+        return data
+
+    def readinto(self, buf) -> int:
+        self.reads.append((self.tell(), len(buf)))
+        n = super().readinto(buf)
+        self.clock.now_us += self.latency_us + n * 1_000_000 // self.bytes_per_sec
+        return n
+
+
+class RecordingSink:
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.format: tuple[int, int, int] | None = None
+
+    def configure(self, sample_rate: int, channels: int, bits_per_sample: int) -> None:
+        self.format = (sample_rate, channels, bits_per_sample)
+
+    def write(self, data: memoryview) -> int:
+        self.data.extend(data)
+        return len(data)
+
+
+def _track(name: str) -> Track:
+    return Track(id=name, title=name, artist=None, album=None, track_number=None, duration_secs=None, path=name)
+
+
+def play_in_real_time(player: StreamingPlayer, sink: RecordingSink, clock: SimClock) -> None:
+    """Alternate one storage read with feeding the sink whatever playback time has made due."""
+    player.play(_track("t.wav"))
+    start_us = clock.now_us
+    while player.is_playing:
+        if not player.fill(max_reads=1):
+            clock.now_us += 1000  # ring full or storage idle: let playback advance 1 ms
+        due = (clock.now_us - start_us) * BYTE_RATE // 1_000_000 - len(sink.data)
+        player.feed(max(0, due))
+
+
+def _pcm(seconds: float) -> bytes:
+    return bytes((i * 7 + i // 251) & 0xFF for i in range(int(BYTE_RATE * seconds) // 4 * 4))
+
+
+def test_fast_storage_streams_byte_exact_without_underruns() -> None:
+    pcm = _pcm(0.5)
+    clock = SimClock()
+    f = SlowFile(make_wav(pcm, pad_before_data=30), clock, latency_us=500, bytes_per_sec=4_000_000)
+    sink = RecordingSink()
+    player = StreamingPlayer(sink, buffer_size=16384, chunk_size=4096, opener=lambda path: f)
+
+    play_in_real_time(player, sink, clock)
+
+    assert bytes(sink.data) == pcm
+    assert sink.format == (44100, 2, 16)
+    assert player.underruns == 0
+    assert player.low_water > 0
+    # After the first partial read, every read is a whole chunk at an aligned file offset.
+    reads = [r for r in f.reads if r[0] >= 44 + 38]
+    assert all(offset % 4096 == 0 and size == 4096 for offset, size in reads[1:-1])
+
+
+def test_slow_storage_records_underruns_but_stays_byte_exact() -> None:
+    pcm = _pcm(0.5)
+    clock = SimClock()
+    f = SlowFile(make_wav(pcm), clock, latency_us=5_000, bytes_per_sec=150_000)  # slower than 176 KB/s playback
+    sink = RecordingSink()
+    player = StreamingPlayer(sink, buffer_size=16384, chunk_size=4096, opener=lambda path: f)
+
+    play_in_real_time(player, sink, clock)
+
+    assert bytes(sink.data) == pcm
+    assert player.underruns > 0
+    assert player.low_water == 0
+
+
+def measure_transition_gap_ms(preload: bool) -> tuple[float, bytes, bytes]:
+    """
+    Play a.wav then b.wav against a simulated clock and return the silence
+    between them in ms. Without preload, b.wav is started the moment a.wav
+    runs dry, so its open, header parse and prefill are heard as a gap.
+    """
+    clock = SimClock()
+    pcm = {"a.wav": _pcm(0.3), "b.wav": _pcm(0.2)[::-1]}
+
+    def opener(path: str) -> SlowFile:
+        clock.now_us += 20_000  # FAT directory walk
+        return SlowFile(make_wav(pcm[path]), clock, latency_us=2_000, bytes_per_sec=1_000_000)
+
+    sink = RecordingSink()
+    player = StreamingPlayer(sink, buffer_size=16384, chunk_size=4096, opener=opener)
+    a, b = _track("a.wav"), _track("b.wav")
+    player.play(a)
+    if preload:
+        player.preload(b)
+    silence_us = 0
+    owed = 0  # byte-microseconds of playback time not yet fed
+    last_us = clock.now_us
+    while True:
+        if not player.is_playing:
+            if player.track is b:
+                break
+            started_us = clock.now_us
+            player.play(b)
+            silence_us += clock.now_us - started_us
+            last_us = clock.now_us
+            continue
+        if not player.fill(max_reads=1):
+            clock.now_us += 1000
+        owed += (clock.now_us - last_us) * BYTE_RATE
+        last_us = clock.now_us
+        due = owed // 1_000_000 // 4 * 4
+        owed -= due * 1_000_000
+        sent = player.feed(due)
+        if player.is_playing:  # a short feed that ends the track is not silence
+            silence_us += (due - sent) * 1_000_000 // BYTE_RATE
+    return silence_us / 1000, bytes(sink.data), pcm["a.wav"] + pcm["b.wav"]
+
+
+def test_transition_without_preload_has_an_audible_gap() -> None:
+    gap_ms, played, expected = measure_transition_gap_ms(preload=False)
+    assert played == expected
+    assert gap_ms > 20
+
+
+def test_preloaded_transition_is_gapless() -> None:
+    gap_ms, played, expected = measure_transition_gap_ms(preload=True)
+    assert played == expected
+    assert gap_ms == 0
+
+
+def test_play_reuses_the_preloaded_track_without_reopening() -> None:
+    opened: list[str] = []
+    clock = SimClock()
+
+    def opener(path: str) -> SlowFile:
+        opened.append(path)
+        return SlowFile(make_wav(_pcm(0.1), pad_before_data=10), clock, latency_us=0, bytes_per_sec=10**9)
+
+    sink = RecordingSink()
+    player = StreamingPlayer(sink, buffer_size=16384, chunk_size=4096, opener=opener)
+    a, b = _track("a.wav"), _track("b.wav")
+    player.play(a)
+    player.preload(b)
+    player.stop()
+    player.play(b)
+    assert opened == ["a.wav", "b.wav"]
+    while player.is_playing:
+        player.pump(4096)
+    assert bytes(sink.data) == _pcm(0.1)
+    assert player.track is b
+
+
+def test_track_end_callback_reports_gapless_and_final_ends() -> None:
+    clock = SimClock()
+    pcm = {"a.wav": _pcm(0.05), "b.wav": _pcm(0.05)}
+    player = StreamingPlayer(
+        RecordingSink(),
+        buffer_size=16384,
+        chunk_size=4096,
+        opener=lambda path: SlowFile(make_wav(pcm[path]), clock, latency_us=0, bytes_per_sec=10**9),
+    )
+    ends: list[tuple[bool, str]] = []
+    player.on_track_end = lambda gapless: ends.append((gapless, player.track.path))
+    player.play(_track("a.wav"))
+    player.preload(_track("b.wav"))
+    while player.is_playing:
+        player.pump(1024)
+    assert ends == [(True, "b.wav"), (False, "b.wav")]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from hardware.prototype1.blockcache import BlockCache
+
+BLOCK = 512
+
+
+class RamDisk:
+    def __init__(self, blocks: int = 256) -> None:
+        self.data = bytearray(blocks * BLOCK)
+        for i in range(blocks):
+            self.data[i * BLOCK] = i
+        self.blocks = blocks
+        self.reads: list[tuple[int, int]] = []
+
+    def readblocks(self, block_num: int, buf) -> None:
+        self.reads.append((block_num, len(buf) // BLOCK))
+        buf[:] = self.data[block_num * BLOCK : block_num * BLOCK + len(buf)]
+
+    def writeblocks(self, block_num: int, buf) -> None:
+        self.data[block_num * BLOCK : block_num * BLOCK + len(buf)] = buf
+
+    def ioctl(self, op: int, arg: int) -> int:
+        return self.blocks if op == 4 else 0
+
+
+def test_repeated_metadata_reads_hit_the_pool() -> None:
+    disk = RamDisk()
+    cache = BlockCache(disk, blocks=4, read_ahead=4)
+    buf = bytearray(BLOCK)
+    for _ in range(3):
+        for block in (0, 32, 100):  # boot sector, FAT, directory: not sequential
+            cache.readblocks(block, buf)
+            assert buf[0] == block
+    assert disk.reads == [(0, 1), (32, 1), (100, 1)]
+    assert (cache.hits, cache.misses) == (6, 3)
+
+    for block in (1, 2):  # a sequential run prefetches 2-5 and evicts the metadata
+        cache.readblocks(block, buf)
+    cache.readblocks(100, buf)
+    assert disk.reads[-1] == (100, 1)
+
+
+def test_sequential_reads_prefetch_and_large_reads_bypass() -> None:
+    disk = RamDisk()
+    cache = BlockCache(disk, blocks=8, read_ahead=4)
+    buf = bytearray(BLOCK)
+    for block in range(10, 18):
+        cache.readblocks(block, buf)
+        assert buf[0] == block
+    # 10 is a cold single read, then 11 is sequential: 11-14 and 15-18 arrive in two transfers.
+    assert disk.reads == [(10, 1), (11, 4), (15, 4)]
+    assert cache.prefetched == 6 and cache.hits == 5
+
+    big = bytearray(16 * BLOCK)
+    cache.readblocks(64, big)
+    assert disk.reads[-1] == (64, 16) and cache.bypassed == 16
+    assert big[15 * BLOCK] == 79
+
+
+def test_writes_go_through_and_refresh_cached_copies() -> None:
+    disk = RamDisk()
+    cache = BlockCache(disk, blocks=4)
+    buf = bytearray(BLOCK)
+    cache.readblocks(5, buf)
+
+    cache.writeblocks(5, bytes([42]) * BLOCK)
+    assert disk.data[5 * BLOCK] == 42
+    cache.readblocks(5, buf)
+    assert buf[0] == 42 and len(disk.reads) == 1
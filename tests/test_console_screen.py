@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+import os
+
+from core.models import ButtonEvent, PlayerState, Track
+from core.player_app import PlayerApp
+from platforms.pc.console_screen import ConsoleScreen, InvalidatingStream
+from platforms.pc.main_pc import apply_input
+from .test_player_app import DummyAudioBackend
+
+
+def _app(screen: ConsoleScreen) -> PlayerApp:
+    tracks = [
+        Track(id=str(i), title=f"Song {i}", artist=f"Artist {i}", album="Album", track_number=1, duration_secs=60, path=f"/m/{i}.mp3")
+        for i in range(3)
+    ]
+    return PlayerApp(state=PlayerState(tracks=tracks), screen=screen, audio_backend=DummyAudioBackend())
+
+
+def test_headless_frames_and_minimal_line_updates() -> None:
+    screen = ConsoleScreen(headless=True)
+    app = _app(screen)
+    app.render()
+    assert screen.frame == ["Menu", "> Library", "  Now Playing", "  Settings"]
+    assert screen.last_output.startswith("\033[2J\033[H")
+
+    app.handle_button(ButtonEvent.DOWN)
+    assert screen.frame[1:3] == ["  Library", "> Now Playing"]
+    # Only the two rows whose highlight changed are rewritten.
+    assert screen.last_output == "\033[2;1H  Library\033[K\033[3;1H> Now Playing\033[K\033[5;1H\033[J"
+
+    app.render()
+    assert screen.last_output == "\033[5;1H\033[J"
+
+
+def test_refresh_is_a_single_write_to_the_stream() -> None:
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, s: str) -> int:
+            self.writes += 1
+            return super().write(s)
+
+    stream = CountingStream()
+    app = _app(ConsoleScreen(rows=10, stream=stream))
+    app.render()
+    app.handle_button(ButtonEvent.RIGHT)
+    assert stream.writes == 2
+    assert "Artists" in stream.getvalue()
+
+
+class FakeTerminal(io.StringIO):
+    """Just enough of a VT100 for ConsoleScreen: wrapping, scrolling, CUP, EL, ED."""
+
+    def __init__(self, columns: int, lines: int) -> None:
+        super().__init__()
+        self.columns = columns
+        self.lines = lines
+        self.rows = [""] * lines
+        self.y = 0
+        self.x = 0
+
+    def write(self, s: str) -> int:
+        i = 0
+        while i < len(s):
+            if s[i] == "\033":
+                end = i + 2
+                while not s[end].isalpha():
+                    end += 1
+                self._escape(s[i + 2 : end], s[end])
+                i = end + 1
+                continue
+            if s[i] == "\n":
+                self._newline()
+            else:
+                if self.x == self.columns:
+                    self._newline()
+                row = self.rows[self.y].ljust(self.x)
+                self.rows[self.y] = row[: self.x] + s[i] + row[self.x + 1 :]
+                self.x += 1
+            i += 1
+        return len(s)
+
+    def _newline(self) -> None:
+        self.x = 0
+        if self.y == self.lines - 1:
+            self.rows = self.rows[1:] + [""]
+        else:
+            self.y += 1
+
+    def _escape(self, args: str, command: str) -> None:
+        if command == "H":
+            y, x = (int(n) for n in args.split(";")) if args else (1, 1)
+            self.y, self.x = y - 1, x - 1
+        elif command == "K":
+            self.rows[self.y] = self.rows[self.y][: self.x]
+        elif command == "J":
+            if args == "2":
+                self.rows = [""] * self.lines
+            else:
+                self.rows[self.y] = self.rows[self.y][: self.x]
+                self.rows[self.y + 1 :] = [""] * (self.lines - self.y - 1)
+
+
+def test_frame_survives_footer_input_echo_and_log_lines(monkeypatch) -> None:
+    hint = "w/s: up/down | a: left | d: right | space/enter: select | p: play/pause | +/-: volume | b/q: back | x: quit"
+    for columns in (80, 100, 160):
+        terminal = FakeTerminal(columns, 12)
+        monkeypatch.setattr(
+            "platforms.pc.console_screen.shutil.get_terminal_size", lambda: os.terminal_size((columns, 12))
+        )
+        screen = ConsoleScreen(stream=terminal, footer=hint)
+        stdout = InvalidatingStream(terminal, screen)
+        tracks = [
+            Track(id=str(i), title=f"Song {i}", artist=f"Artist {i:02}", album="Album", track_number=1, duration_secs=60, path=f"/m/{i}.mp3")
+            for i in range(40)
+        ]
+        app = PlayerApp(state=PlayerState(tracks=tracks), screen=screen, audio_backend=DummyAudioBackend())
+        app.render()
+        for step in range(30):
+            terminal.write("s\n")  # the terminal echoes the typed line
+            if step % 7 == 3:
+                print("[Audio] Volume: 5", file=stdout)
+            app.handle_button(ButtonEvent.RIGHT if step == 0 else ButtonEvent.DOWN)
+            assert terminal.rows[: len(screen.frame)] == screen.frame
+            assert sum(row.startswith("> ") for row in terminal.rows) == 1
+            assert hint[: columns] in terminal.rows
+
+
+def test_no_op_and_unknown_keys_do_not_scroll_the_frame(monkeypatch) -> None:
+    hint = "w/s: up/down | a: left | d: right | space/enter: select | p: play/pause | b/q: back | x: quit"
+    terminal = FakeTerminal(80, 12)
+    monkeypatch.setattr("platforms.pc.console_screen.shutil.get_terminal_size", lambda: os.terminal_size((80, 12)))
+    screen = ConsoleScreen(stream=terminal, footer=hint)
+    app = _app(screen)
+    app.render()
+    renders = app.renders_performed
+    for typed, moves in [("a", [[ButtonEvent.LEFT, 1]]), ("w", [[ButtonEvent.UP, 1]]), ("zz", [])] * 5:
+        terminal.write(typed + "\n")
+        apply_input(app, moves)
+        assert terminal.rows[: len(screen.frame)] == screen.frame
+        assert terminal.rows.count(hint[:80]) == 1
+    assert app.renders_performed == renders
+
+    terminal.write("s\n")
+    apply_input(app, [[ButtonEvent.DOWN, 1]])
+    assert terminal.rows[:4] == ["Menu", "  Library", "> Now Playing", "  Settings"]
+    assert terminal.rows.count(hint[:80]) == 1
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from platforms.esp32.dirty_rects import DirtyTracker, clip, coalesce
+
+WIDTH, HEIGHT = 240, 280
+
+
+def _frame(tracker: DirtyTracker, selected: int) -> None:
+    """Record the ops EspScreen would emit for a 6-row list with one highlighted row."""
+    tracker.begin_frame()
+    tracker.add(("text", 15, 20, "Artists", 8), (15, 20, 56, 10))
+    for row in range(1, 7):
+        py = 20 + row * 14
+        label = f"Artist {row}"
+        if row == selected:
+            tracker.add(("rect", 15, py, 210, 14, 0xC618), (15, py, 210, 14))
+            tracker.add(("text", 15, py, label, 0), (15, py, 8 * len(label), 10))
+        else:
+            tracker.add(("text", 15, py, "  " + label, 8), (15, py, 8 * (len(label) + 2), 10))
+
+
+def _bytes(rects: list[tuple[int, int, int, int]]) -> int:
+    return sum(w * h * 2 for _, _, w, h in rects)
+
+
+def test_scrolling_one_row_sends_only_the_two_changed_rows() -> None:
+    tracker = DirtyTracker(WIDTH, HEIGHT)
+    _frame(tracker, selected=1)
+    assert tracker.take() == [(0, 0, WIDTH, HEIGHT)]
+
+    _frame(tracker, selected=2)
+    rects = tracker.take()
+    assert rects == [(15, 34, 210, 28)]  # old and new highlight rows, merged
+    assert _bytes(rects) < WIDTH * HEIGHT * 2 // 10
+
+    _frame(tracker, selected=2)  # identical frame: nothing to send
+    assert tracker.take() == []
+
+    tracker.mark_all()
+    assert tracker.take() == [(0, 0, WIDTH, HEIGHT)]
+
+
+def test_coalesce_merges_overlaps_and_keeps_distant_rects_apart() -> None:
+    assert coalesce([(0, 0, 10, 10), (5, 5, 10, 10)]) == [(0, 0, 15, 15)]
+    assert coalesce([(0, 200, 10, 10), (0, 0, 10, 10)]) == [(0, 0, 10, 10), (0, 200, 10, 10)]
+    assert clip((230, -5, 20, 10), WIDTH, HEIGHT) == (230, 0, 10, 5)
+    assert clip((300, 0, 5, 5), WIDTH, HEIGHT) is None
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+
+from core.audio_stream import StreamingPlayer
+from core.models import ButtonEvent, PlayerState, Track
+from core.player_app import PlayerApp
+from core.models import ScreenID
+from platforms.esp32.esp_audio_backend import EspAudioBackend, card_or_silence
+from platforms.esp32.esp_runtime import EspRuntime, add_player_jobs
+from tests.test_audio_stream import BYTE_RATE, make_wav
+
+
+class FakeScreen:
+    def __init__(self, refresh_secs: float = 0.0) -> None:
+        self.refresh_secs = refresh_secs
+        self.frames = 0
+
+    def clear(self) -> None:
+        pass
+
+    def draw_text(self, x: int, y: int, text: str) -> None:
+        pass
+
+    def refresh(self) -> None:
+        time.sleep(self.refresh_secs)  # SPI transfer time
+        self.frames += 1
+
+
+class BurstInput:
+    """Button source that has `count` presses of `event` queued up at once."""
+
+    def __init__(self, event: ButtonEvent, count: int) -> None:
+        self.pending = [event] * count
+
+    def read_event(self) -> ButtonEvent | None:
+        return self.pending.pop() if self.pending else None
+
+
+class FakeDmaSink:
+    """Accepts PCM only as fast as a `buffer_bytes` DMA buffer drains in real time."""
+
+    def __init__(self, buffer_bytes: int = 8192) -> None:
+        self.buffer_bytes = buffer_bytes
+        self.data = bytearray()
+        self.played_from = 0.0
+
+    def configure(self, sample_rate: int, channels: int, bits_per_sample: int) -> None:
+        self.played_from = time.perf_counter()
+
+    def write(self, data: memoryview) -> int:
+        drained = int((time.perf_counter() - self.played_from) * BYTE_RATE)
+        room = max(0, self.buffer_bytes - (len(self.data) - drained)) & ~3
+        n = min(len(data), room)
+        self.data.extend(data[:n])
+        return n
+
+
+def _library(count: int) -> list[Track]:
+    return [
+        Track(id=str(n), title=f"Song {n}", artist=f"Artist {n:03d}", album="X", track_number=1, duration_secs=1, path="t.wav")
+        for n in range(count)
+    ]
+
+
+def _run(runtime: EspRuntime, seconds: float) -> None:
+    async def stop_later() -> None:
+        await asyncio.sleep(seconds)
+        runtime.stop()
+
+    asyncio.run(runtime.run(stop_later()))
+
+
+def test_jobs_stream_audio_and_coalesce_renders() -> None:
+    pcm = bytes(i & 0xFF for i in range(BYTE_RATE // 5))  # 0.2 s
+    sink = FakeDmaSink()
+    audio = StreamingPlayer(sink, buffer_size=16384, chunk_size=4096, opener=lambda path: io.BytesIO(make_wav(pcm)))
+    app = PlayerApp(state=PlayerState(tracks=_library(100)), screen=FakeScreen(), audio_backend=audio)
+    app.handle_button(ButtonEvent.RIGHT)  # Artists
+    audio.play(app.state.tracks[0])
+    runtime = EspRuntime(app)
+    add_player_jobs(runtime, app, audio, BurstInput(ButtonEvent.DOWN, 60))
+    frames_before = app.screen.frames
+
+    _run(runtime, 0.35)
+
+    assert app.state.selected_artist_index == 60
+    assert app.screen.frames - frames_before <= 0.35 / 0.05 + 2  # one frame per render period at most
+    assert bytes(sink.data) == pcm
+    assert audio.underruns == 0
+    jobs = {job.name: job for job in runtime.jobs}
+    assert [job.name for job in runtime.jobs] == ["audio", "input", "sd", "render"]
+    assert jobs["audio"].runs > jobs["render"].runs > 0
+    assert runtime.monitor.samples > 0
+    assert "loop lag" in runtime.report()
+
+
+def test_end_of_track_is_dispatched_through_the_runtime() -> None:
+    pcm = bytes(BYTE_RATE // 20)  # 0.05 s per track
+    audio = StreamingPlayer(FakeDmaSink(), buffer_size=16384, chunk_size=4096, opener=lambda path: io.BytesIO(make_wav(pcm)))
+    tracks = [
+        Track(id=str(n), title=f"Song {n}", artist="A", album="X", track_number=n, duration_secs=1, path=f"{n}.wav")
+        for n in (1, 2)
+    ]
+    app = PlayerApp(state=PlayerState(tracks=tracks), screen=FakeScreen(), audio_backend=audio)
+    app.handle_button(ButtonEvent.RIGHT)  # Artists
+    app.handle_button(ButtonEvent.SELECT)  # albums
+    app.handle_button(ButtonEvent.SELECT)  # tracks
+    runtime = EspRuntime(app)
+    add_player_jobs(runtime, app, audio, BurstInput(ButtonEvent.DOWN, 0))
+    app.handle_button(ButtonEvent.PLAY_PAUSE)  # play the album from Song 1
+    assert audio.on_track_end is not None and audio.on_track_end != app.track_finished
+
+    applied: list[bool] = []
+    track_finished = app.track_finished
+
+    def recording_track_finished(gapless: bool = False) -> None:
+        applied.append(gapless)
+        track_finished(gapless)
+
+    app.track_finished = recording_track_finished
+    audio.on_track_end(False)  # as if Song 1 ended inside the audio job
+    assert applied == [] and app.state.playing_index == 0  # queued, not run there
+
+    _run(runtime, 0.4)
+
+    assert applied[0] is False and len(applied) >= 2  # then Song 2 plays out and ends the queue
+    assert runtime.dispatched >= len(applied)
+    assert app.state.playing_index == 1
+    assert app.state.is_playing is False
+
+
+def test_slow_render_shows_up_as_overruns_and_loop_lag() -> None:
+    audio = StreamingPlayer(FakeDmaSink())
+    app = PlayerApp(state=PlayerState(tracks=_library(5)), screen=FakeScreen(refresh_secs=0.04), audio_backend=audio)
+    runtime = EspRuntime(app)
+    add_player_jobs(runtime, app, audio, BurstInput(ButtonEvent.DOWN, 0))
+
+    def move_highlight(deadline: int) -> None:
+        app.state.root_index = 1 - app.state.root_index  # forces a new frame every period
+
+    runtime.add_job("toggle", move_highlight, 50, 1, 5)
+
+    _run(runtime, 0.3)
+
+    render = next(job for job in runtime.jobs if job.name == "render")
+    assert render.overruns > 0
+    assert render.worst_run_ms >= 40
+    assert runtime.monitor.worst_lag_ms >= 20
+
+
+def test_more_urgent_jobs_run_first_when_due_together() -> None:
+    app = PlayerApp(state=PlayerState(tracks=[]), screen=FakeScreen(), audio_backend=StreamingPlayer(FakeDmaSink()))
+    runtime = EspRuntime(app)
+    order: list[str] = []
+    for name, priority in (("low", 3), ("high", 0), ("mid", 1)):
+        runtime.add_job(name, lambda deadline, name=name: order.append(name), 1000, 1, priority)
+
+    _run(runtime, 0.05)
+
+    assert order == ["high", "mid", "low"]
+
+
+def test_demo_library_plays_silence_without_a_card() -> None:
+    tracks = [
+        Track(id=str(n), title=f"Song {n}", artist="A", album="X", track_number=n, duration_secs=1, path=f"/sd/missing/song{n}.wav")
+        for n in (1, 2)
+    ]
+    sink = FakeDmaSink(buffer_bytes=1 << 20)
+    audio = EspAudioBackend(sink, buffer_size=16384, chunk_size=4096, opener=card_or_silence({tracks[0].path: 0.25}))
+    app = PlayerApp(state=PlayerState(tracks=tracks), screen=FakeScreen(), audio_backend=audio)
+    for event in (ButtonEvent.RIGHT, ButtonEvent.SELECT, ButtonEvent.SELECT, ButtonEvent.SELECT):
+        app.handle_button(event)  # the demo script's way into Now Playing
+
+    assert app.state.current_screen == ScreenID.NOW_PLAYING
+    assert app.state.is_playing is True
+    assert audio.source.layout.sample_rate == 22050
+    for _ in range(20):
+        audio.pump(1 << 16)
+    assert len(sink.data) >= 22050 * 2 // 4  # at least the 0.25 s of Song 1
+    assert not any(sink.data)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from core.input_coalescer import InputCoalescer, coalesce
+from core.models import ButtonEvent
+
+DOWN = ButtonEvent.DOWN
+UP = ButtonEvent.UP
+SELECT = ButtonEvent.SELECT
+
+
+class QueuedInput:
+    def __init__(self) -> None:
+        self.queue: list[ButtonEvent] = []
+
+    def read_event(self) -> ButtonEvent | None:
+        return self.queue.pop(0) if self.queue else None
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 10_000
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def test_coalesce_merges_runs_but_keeps_order() -> None:
+    events = [DOWN] * 3 + [SELECT, SELECT, UP, ButtonEvent.VOLUME_UP, ButtonEvent.VOLUME_UP, DOWN]
+    assert coalesce(events) == [[DOWN, 3], [SELECT, 1], [SELECT, 1], [UP, 1], [ButtonEvent.VOLUME_UP, 2], [DOWN, 1]]
+
+
+def test_holding_a_key_accelerates_then_jumps_pages() -> None:
+    source = QueuedInput()
+    clock = FakeClock()
+    coalescer = InputCoalescer(source, page_rows=lambda: 17, clock=clock)
+
+    def poll(count: int) -> list[list]:
+        source.queue.extend([DOWN] * count)
+        return coalescer.read_batch()
+
+    assert poll(5) == [[DOWN, 5]]  # hold starts: one row per repeat
+    clock.now += 250
+    assert poll(3) == [[DOWN, 3]]
+    clock.now += 250
+    assert poll(3) == [[DOWN, 3]]
+    clock.now += 250  # held 750 ms
+    assert poll(3) == [[DOWN, 6]]
+    for _ in range(4):
+        clock.now += 250
+        coalescer.read_batch()  # nothing queued this poll; the hold continues
+        source.queue.append(DOWN)
+        coalescer.read_batch()
+    assert poll(2) == [[DOWN, 8]]  # held 1750 ms: 4 rows per repeat
+    for _ in range(5):
+        clock.now += 250
+        poll(1)
+    assert poll(2) == [[DOWN, 34]]  # past 3 s: a page per repeat
+
+    clock.now += 1000  # released
+    assert poll(1) == [[DOWN, 1]]
+    assert poll(1) == [[DOWN, 1]]
+    source.queue.extend([UP, SELECT])
+    assert coalescer.read_batch() == [[UP, 1], [SELECT, 1]]
+
+
+def test_empty_source_gives_an_empty_batch() -> None:
+    assert InputCoalescer(QueuedInput()).read_batch() == []
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from core.library import Library
+from core.models import Track
+
+
+def _track(track_id: str, artist: str, album: str, number: int) -> Track:
+    return Track(
+        id=track_id,
+        title=f"Song {track_id}",
+        artist=artist,
+        album=album,
+        track_number=number,
+        duration_secs=0,
+        path=f"/music/{track_id}.mp3",
+    )
+
+
+def test_apply_changes_updates_indexes_in_place() -> None:
+    tracks = [
+        _track("1", "Artist A", "Album X", 1),
+        _track("2", "Artist A", "Album X", 2),
+        _track("3", "Artist B", "Album Y", 1),
+    ]
+    library = Library(tracks)
+
+    assigned = library.apply_changes(
+        added=[_track("4", "Artist C", "Album Z", 1)],
+        removed=[2],
+        modified=[(1, _track("2", "Artist A", "Album X", 0))],
+    )
+
+    assert library.tracks is tracks
+    assert tracks[2] is not None and tracks[2].id == "4"  # freed slot reused
+    assert assigned == [2]
+    assert library.artists() == ["Artist A", "Artist C"]
+    assert library.tracks_for("Artist A", "Album X") == [1, 0]
+    assert library.tracks_for("Artist C", "Album Z") == [2]
+
+    library.apply_changes(removed=[2])
+    assert tracks[2] is None
+    assert library.artists() == ["Artist A"]
+    assert Library(tracks).artists() == ["Artist A"]
+
+
+def test_incremental_views_match_a_fresh_build() -> None:
+    rng = random.Random(7)
+    tracks = [_track(str(i), f"Artist {i % 5}", f"Album {i % 3}", i % 4) for i in range(40)]
+    library = Library(tracks)
+    for step in range(200):
+        live = [idx for idx, track in enumerate(tracks) if track is not None]
+        new = _track(f"n{step}", f"Artist {rng.randrange(8)}", f"Album {rng.randrange(4)}", rng.randrange(5))
+        op = rng.randrange(3)
+        if op == 0 or not live:
+            library.apply_changes(added=[new])
+        elif op == 1:
+            library.apply_changes(removed=[rng.choice(live)])
+        else:
+            library.apply_changes(modified=[(rng.choice(live), new)])
+
+    fresh = Library(list(tracks))
+    restored = Library(tracks, snapshot=library.snapshot())
+    for other in (fresh, restored):
+        assert library.artists() == other.artists()
+        for artist in library.artists():
+            assert library.albums_for_artist(artist) == other.albums_for_artist(artist)
+            for album in library.albums_for_artist(artist):
+                assert library.tracks_for(artist, album) == other.tracks_for(artist, album)
+    assert library.artist_position(library.artists()[-1]) == len(library.artists()) - 1
+    assert library.artist_position("Nobody") is None
+
+
+def test_duplicate_titles_keep_the_rebuilt_order_when_slots_are_reused() -> None:
+    def dup(track_id: str) -> Track:
+        track = _track(track_id, "Artist A", "Album X", 1)
+        track.title = "Intro"
+        return track
+
+    tracks = [dup("1"), dup("2"), dup("3")]
+    library = Library(tracks)
+    library.apply_changes(removed=[0])
+    library.apply_changes(added=[dup("4")])  # lands in slot 0, after equal keys at 1 and 2
+
+    assert library.tracks_for("Artist A", "Album X") == [0, 1, 2]
+    assert library.tracks_for("Artist A", "Album X") == Library(list(tracks)).tracks_for("Artist A", "Album X")
+    restored = Library(tracks, snapshot=library.snapshot())
+    assert restored.tracks_for("Artist A", "Album X") == [0, 1, 2]
+
+
+def test_out_of_order_snapshot_is_rejected() -> None:
+    tracks = [_track("1", "B", "X", 1), _track("2", "A", "X", 1)]
+    with pytest.raises(ValueError):
+        Library(tracks, snapshot={"albums": [["B", "X", [0]], ["A", "X", [1]]]})
+
+
+def test_snapshot_that_does_not_match_the_tracks_is_rejected() -> None:
+    tracks = [_track("1", "A", "X", 1), None, _track("3", "B", "Y", 1)]
+    with pytest.raises(ValueError):
+        Library(tracks, snapshot={"albums": [["A", "X", [0, 1]], ["B", "Y", [2]]]})  # removed slot
+    with pytest.raises(ValueError):
+        Library(tracks, snapshot={"albums": [["A", "X", [0, 2]]]})  # B's track filed under A
+    assert Library(tracks, snapshot={"albums": [["A", "X", [0]], ["B", "Y", [2]]]}).artists() == ["A", "B"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from core.models import PlayerState
+from core.player_app import PlayerApp
+from platforms.pc import library_index, main_pc
+from platforms.pc.console_screen import ConsoleScreen
+from platforms.pc.library_index import load_cached_library
+from .test_player_app import DummyAudioBackend
+from .test_tags import _id3v23, _mp3_with_xing
+
+
+def _make_tree(root: Path) -> None:
+    album_dir = root / "Artist A" / "Album X"
+    album_dir.mkdir(parents=True)
+    (album_dir / "02 - Second.mp3").write_bytes(b"")
+    (album_dir / "01 - First.mp3").write_bytes(b"")
+    (root / "Artist B").mkdir()
+    (root / "Artist B" / "Solo.flac").write_bytes(b"")
+
+
+def _bump_mtime(directory: Path) -> None:
+    # Filesystem timestamps can be coarse; make the change visible to stamp checks.
+    st = os.stat(directory)
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _fail_scan(*args, **kwargs):
+    raise AssertionError("expected the index to be used instead of a rescan")
+
+
+def load_library(music_dir: str, index_file: Path, read_tags: bool = False):
+    """What `main_pc` does at startup: the cached index, else a streamed scan that writes one."""
+    cached = load_cached_library(music_dir, index_file, read_tags)
+    if cached is not None:
+        return cached
+    app = PlayerApp(state=PlayerState(tracks=[]), screen=ConsoleScreen(headless=True), audio_backend=DummyAudioBackend())
+    main_pc.stream_library(app, music_dir, lambda fn, *args: fn(*args), index_path=index_file, read_tags=read_tags)
+    return app.library.tracks, app.library
+
+
+def test_load_library_writes_and_reuses_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    music = tmp_path / "music"
+    _make_tree(music)
+    index_file = tmp_path / "index.json"
+
+    tracks, library = load_library(str(music), index_file)
+    assert index_file.exists()
+    assert len(tracks) == 3
+
+    monkeypatch.setattr(main_pc, "stream_library", _fail_scan)
+    cached_tracks, cached_library = load_library(str(music), index_file)
+    assert [t.path for t in cached_tracks] == [t.path for t in tracks]
+    assert cached_library.artists() == ["Artist A", "Artist B"]
+    titles = [cached_tracks[i].title for i in cached_library.tracks_for("Artist A", "Album X")]
+    assert titles == ["First", "Second"]
+
+
+def test_load_library_rescans_when_directory_changes(tmp_path: Path) -> None:
+    music = tmp_path / "music"
+    _make_tree(music)
+    index_file = tmp_path / "index.json"
+    load_library(str(music), index_file)
+
+    new_album = music / "Artist B" / "Album Z"
+    new_album.mkdir()
+    (new_album / "01 - New.wav").write_bytes(b"")
+    _bump_mtime(music / "Artist B")
+
+    tracks, library = load_library(str(music), index_file)
+    assert len(tracks) == 4
+    assert library.albums_for_artist("Artist B") == ["Album Z", "Unknown Album"]
+
+
+def test_stale_index_is_refreshed_incrementally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    music = tmp_path / "music"
+    _make_tree(music)
+    index_file = tmp_path / "index.json"
+    load_library(str(music), index_file)
+
+    (music / "Artist A" / "Album X" / "02 - Second.mp3").unlink()
+    _bump_mtime(music / "Artist A" / "Album X")
+
+    monkeypatch.setattr(main_pc, "stream_library", _fail_scan)
+    tracks, library = load_library(str(music), index_file)
+    live = [t.title for t in tracks if t is not None]
+    assert sorted(live) == ["First", "Solo"]
+    assert [tracks[i].title for i in library.tracks_for("Artist A", "Album X")] == ["First"]
+
+    # The refreshed index is fresh again: reloading yields the same slots.
+    reloaded, _ = load_library(str(music), index_file)
+    assert [t.path if t else None for t in reloaded] == [t.path if t else None for t in tracks]
+
+
+def test_load_library_recovers_from_corrupt_index(tmp_path: Path) -> None:
+    music = tmp_path / "music"
+    _make_tree(music)
+    index_file = tmp_path / "index.json"
+    index_file.write_text("{not json")
+
+    tracks, _ = load_library(str(music), index_file)
+    assert len(tracks) == 3
+    assert library_index.load_index(index_file, str(music)) is not None
+
+
+def test_tag_edited_in_place_is_reparsed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    music = tmp_path / "music"
+    album_dir = music / "Artist A" / "Album X"
+    album_dir.mkdir(parents=True)
+    edited = album_dir / "01 - a.mp3"
+    edited.write_bytes(_id3v23({"TIT2": b"\x00Old Title"}) + _mp3_with_xing(100))
+    (album_dir / "02 - b.mp3").write_bytes(_id3v23({"TIT2": b"\x00Other"}) + _mp3_with_xing(100))
+    index_file = tmp_path / "index.json"
+    tracks, _ = load_library(str(music), index_file, read_tags=True)
+    assert [t.title for t in tracks] == ["Old Title", "Other"]
+
+    # A tag editor rewrites the file in place: the directory listing (and its stamp) is untouched.
+    dir_mtime = os.stat(album_dir).st_mtime_ns
+    edited.write_bytes(_id3v23({"TIT2": b"\x00New Title"}) + _mp3_with_xing(100))
+    _bump_mtime(edited)
+    assert os.stat(album_dir).st_mtime_ns == dir_mtime
+
+    monkeypatch.setattr(main_pc, "stream_library", _fail_scan)
+    refreshed = []
+    real_rescan = library_index.rescan_library
+
+    def recording_rescan(*args, **kwargs):
+        refreshed.append(real_rescan(*args, **kwargs))
+        return refreshed[-1]
+
+    monkeypatch.setattr(library_index, "rescan_library", recording_rescan)
+    tracks, library = load_library(str(music), index_file, read_tags=True)
+    assert [tracks[i].title for i in library.tracks_for("Artist A", "Album X")] == ["New Title", "Other"]
+    assert (refreshed[-1].dirs_read, refreshed[-1].files_read) == (0, 1)
+
+    # The new file stamp was saved: the next load re-parses nothing.
+    tracks, _ = load_library(str(music), index_file, read_tags=True)
+    assert tracks[0].title == "New Title"
+    assert refreshed[-1].files_read == 0
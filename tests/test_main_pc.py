@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.models import PlayerState
+from core.player_app import PlayerApp
+from core.track_store import TrackStore
+from platforms.pc import main_pc
+from platforms.pc.console_screen import ConsoleScreen
+from platforms.pc.library_index import load_index
+from .test_player_app import DummyAudioBackend
+
+
+@pytest.mark.parametrize("read_tags", [False, True])
+def test_failed_scan_is_reported_and_what_was_read_is_indexed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], read_tags: bool
+) -> None:
+    music = tmp_path / "music"
+    for artist in ("Artist A", "Artist B", "Artist C"):
+        (music / artist).mkdir(parents=True)
+        (music / artist / "01 - Song.wav").write_bytes(b"")
+    if read_tags:
+        # Every directory is listed (and shown) before headers are parsed; fail while parsing the second artist.
+        def failing_tags(batches, workers=None):
+            yield batches[0]
+            raise ValueError("malformed header")
+
+        monkeypatch.setattr(main_pc, "iter_tagged_batches", failing_tags)
+    else:
+        real_iter_scan = main_pc.iter_scan
+
+        def failing_scan(*args, **kwargs):
+            batches = real_iter_scan(*args, **kwargs)
+            yield next(batches)
+            raise PermissionError(13, "Permission denied")
+
+        monkeypatch.setattr(main_pc, "iter_scan", failing_scan)
+    app = PlayerApp(
+        state=PlayerState(tracks=TrackStore()), screen=ConsoleScreen(headless=True), audio_backend=DummyAudioBackend()
+    )
+    index_file = tmp_path / "index.json"
+
+    main_pc.stream_library(app, str(music), lambda fn, *args: fn(*args), index_path=index_file, read_tags=read_tags)
+
+    assert "Stopped early" in capsys.readouterr().out
+    listed = ["Artist A", "Artist B", "Artist C"] if read_tags else ["Artist A"]
+    assert app.library.artists() == listed
+    index = load_index(index_file, str(music), read_tags)
+    assert index is not None
+    # A completed listing also stamps the root directory.
+    dirs = [str(music / artist) for artist in listed] + ([str(music)] if read_tags else [])
+    assert sorted(index["dirs"]) == sorted(dirs)
+    # Only parsed headers are stamped, so the untagged rows are re-read next launch.
+    assert list(index["files"]) == ([str(music / "Artist A" / "01 - Song.wav")] if read_tags else [])
+
+
+def test_tagged_scan_shows_file_names_first_then_applies_tags_as_updates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    music = tmp_path / "music"
+    for artist in ("Artist A", "Artist B"):
+        (music / artist).mkdir(parents=True)
+        (music / artist / "01 - Song.wav").write_bytes(b"")
+    app = PlayerApp(state=PlayerState(tracks=[]), screen=ConsoleScreen(headless=True), audio_backend=DummyAudioBackend())
+    shown_before_parsing = []
+
+    def tagging(batches, workers=None):
+        shown_before_parsing.append([track.title for track in app.library.tracks])
+        for batch in batches:
+            for track in batch:
+                track.title = "Tagged"
+                track.artist = "Band"
+            yield batch
+
+    monkeypatch.setattr(main_pc, "iter_tagged_batches", tagging)
+    calls = []
+
+    def call(fn, *args):
+        calls.append(fn.__name__)
+        fn(*args)
+
+    main_pc.stream_library(app, str(music), call, index_path=tmp_path / "index.json", read_tags=True)
+
+    assert shown_before_parsing == [["Song", "Song"]]
+    assert calls == ["_add_batch", "_add_batch", "_apply_tags", "_apply_tags", "_finish_scan"]
+    assert [track.title for track in app.library.tracks] == ["Tagged", "Tagged"]
+    assert app.library.artists() == ["Band"]
+    assert len(app.library.artist_index["Band"]) == 2
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from array import array
+
+from core.library import Library
+from core.models import Track
+from core.play_queue import PlayQueue, queue_items
+
+
+def _track(artist: str, album: str, number: int) -> Track:
+    return Track(
+        id=f"{artist}-{album}-{number}",
+        title=f"Song {number}",
+        artist=artist,
+        album=album,
+        track_number=number,
+        duration_secs=100,
+        path=f"/{artist}/{album}/{number}.wav",
+    )
+
+
+def test_queue_items_follow_display_order() -> None:
+    tracks = [_track("B", "Y", 1), _track("A", "X", 2), _track("A", "X", 1), _track("A", "W", 1)]
+    library = Library(tracks)
+
+    assert list(queue_items(library, "A", "X")) == [2, 1]
+    assert list(queue_items(library, "A")) == [3, 2, 1]
+    assert list(queue_items(library)) == [3, 2, 1, 0]
+    assert isinstance(queue_items(library), array)
+
+
+def test_next_and_prev_stop_at_the_ends() -> None:
+    queue = PlayQueue(array("I", [7, 8, 9]), start=1)
+    assert queue.current() == 8
+    assert queue.peek_next() == 9
+    assert queue.next() == 9
+    assert queue.next() is None
+    assert queue.current() == 9
+    assert queue.prev() == 8
+    assert queue.prev() == 7
+    assert queue.prev() is None
+    assert queue.current() == 7
+
+
+def test_dropped_tracks_are_skipped_both_ways() -> None:
+    queue = PlayQueue(array("I", [7, 8, 9, 10]), start=1)
+    queue.drop([9])
+    assert queue.peek_next() == 10
+    assert queue.next() == 10
+    queue.drop([7, 8])
+    assert queue.prev() is None
+    assert queue.current() == 10
+
+
+def test_shuffle_visits_a_large_library_once_without_copying() -> None:
+    items = range(100_000)
+    queue = PlayQueue(items, start=4242, shuffle=True)
+    assert queue.items is items
+    seen = bytearray(len(items))
+    order = [queue.current()]
+    while True:
+        index = queue.next()
+        if index is None:
+            break
+        order.append(index)
+    for index in order:
+        seen[index] += 1
+    assert order[0] == 4242
+    assert len(order) == len(items)
+    assert all(count == 1 for count in seen)
+    assert order != list(items)
+
+    for expected in reversed(order[:-1]):
+        assert queue.prev() == expected
+
+
+def test_shuffle_handles_tiny_queues() -> None:
+    for size in range(0, 5):
+        queue = PlayQueue(array("I", range(size)), shuffle=True)
+        order = [] if size == 0 else [queue.current()]
+        while queue.peek_next() is not None:
+            order.append(queue.next())
+        assert sorted(order) == list(range(size))
+
+
+def test_shuffle_orders_are_unpatterned() -> None:
+    queue = PlayQueue(range(1000), shuffle=True)
+    order = [queue.current()]
+    while queue.peek_next() is not None:
+        order.append(queue.next())
+    gaps = {(b - a) % len(order) for a, b in zip(order, order[1:])}
+    assert len(gaps) > 100  # consecutive tracks are not a fixed distance apart
+
+    orders = set()
+    for _ in range(2000):
+        queue = PlayQueue(array("I", range(5)), start=2, shuffle=True)
+        order = [queue.current()]
+        while queue.peek_next() is not None:
+            order.append(queue.next())
+        orders.add(tuple(order))
+    assert len(orders) == 24  # every order of the other 4 tracks, all starting at items[2]
+    assert all(order[0] == 2 for order in orders)
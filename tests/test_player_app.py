@@ -207,3 +207,261 @@ def test_volume_changes_clamp_and_call_backend() -> None:
         app.handle_button(ButtonEvent.VOLUME_DOWN)
     assert app.state.volume == 0
     assert audio.set_volume_calls[-1] == 0
+
+
+def test_add_tracks_appends_and_keeps_artist_highlight() -> None:
+    app, _, screen, tracks = _make_app()
+    app.handle_button(ButtonEvent.RIGHT)  # Library -> Artists
+    app.handle_button(ButtonEvent.DOWN)  # Artist B
+    assert app.state.selected_artist_index == 1
+
+    app.add_tracks(
+        [
+            Track(
+                id="4",
+                title="Aardvark",
+                artist="Aaron",
+                album="First",
+                track_number=1,
+                duration_secs=100,
+                path="/music/aa.mp3",
+            )
+        ]
+    )
+
+    assert len(tracks) == 4
+    assert app.library.artists()[0] == "Aaron"
+    assert app.state.selected_artist_index == 2  # still Artist B
+    assert (0, 1, "  Aaron") in screen.draw_calls
+
+
+class WindowedScreen(DummyScreen):
+    def visible_rows(self) -> int:
+        return 4  # header + 3 list rows
+
+
+def test_long_lists_draw_only_a_window_that_follows_the_selection() -> None:
+    tracks = [
+        Track(
+            id=str(i),
+            title=f"Song {i}",
+            artist=f"Artist {i:02d}",
+            album="Album",
+            track_number=1,
+            duration_secs=60,
+            path=f"/music/{i}.mp3",
+        )
+        for i in range(10)
+    ]
+    screen = WindowedScreen()
+    app = PlayerApp(state=PlayerState(tracks=tracks), screen=screen, audio_backend=DummyAudioBackend())
+    app.handle_button(ButtonEvent.RIGHT)  # Library -> Artists
+    assert [text for _, _, text in screen.draw_calls] == ["Artists", "> Artist 00", "  Artist 01", "  Artist 02"]
+
+    for _ in range(5):
+        app.handle_button(ButtonEvent.DOWN)
+    assert app.state.artist_scroll_offset == 3
+    assert [text for _, _, text in screen.draw_calls[1:]] == ["  Artist 03", "  Artist 04", "> Artist 05"]
+
+    app.handle_button(ButtonEvent.UP)  # still inside the window: no scroll
+    assert app.state.artist_scroll_offset == 3
+    for _ in range(3):
+        app.handle_button(ButtonEvent.UP)
+    assert app.state.artist_scroll_offset == 1
+    assert screen.draw_calls[1] == (0, 1, "> Artist 01")
+
+
+def test_no_op_events_skip_the_render() -> None:
+    app, _, screen, _ = _make_app()
+    app.render()
+    frame = list(screen.draw_calls)
+
+    screen.draw_calls.append("sentinel")  # a skipped render never clears
+    app.handle_button(ButtonEvent.LEFT)  # no-op at root
+    app.handle_button(ButtonEvent.UP)  # already at the top
+    assert screen.draw_calls[-1] == "sentinel"
+    assert (app.renders_performed, app.renders_skipped) == (1, 2)
+
+    app.handle_button(ButtonEvent.RIGHT)  # Library -> Artists
+    app.handle_button(ButtonEvent.UP)  # top of the artist list
+    assert (app.renders_performed, app.renders_skipped) == (2, 3)
+    assert screen.draw_calls != frame
+
+    app.add_tracks([Track(id="9", title="New", artist="Artist C", album="Z", track_number=1, duration_secs=1, path="/n.mp3")])
+    assert app.renders_performed == 3
+
+
+class PreloadingAudioBackend(DummyAudioBackend):
+    def __init__(self) -> None:
+        super().__init__()
+        self.preload_calls: list[Track] = []
+
+    def preload(self, track: Track) -> None:
+        self.preload_calls.append(track)
+
+
+def test_playback_preloads_the_next_track_in_album_order() -> None:
+    app, _, _, tracks = _make_app()
+    audio = PreloadingAudioBackend()
+    app.audio_backend = audio
+    app.handle_button(ButtonEvent.RIGHT)  # Library -> Artists
+    app.handle_button(ButtonEvent.SELECT)  # Artist A albums
+    app.handle_button(ButtonEvent.SELECT)  # Album X tracks
+
+    app.handle_button(ButtonEvent.PLAY_PAUSE)  # play track 1 in place
+    assert audio.preload_calls == [tracks[1]]
+
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.SELECT)  # last track of the album: nothing follows
+    assert audio.play_calls[-1] == tracks[1]
+    assert audio.preload_calls == [tracks[1]]
+
+
+class EndNotifyingAudioBackend(PreloadingAudioBackend):
+    def __init__(self) -> None:
+        super().__init__()
+        self.on_track_end = None
+
+
+def _album_app() -> tuple[PlayerApp, EndNotifyingAudioBackend, list[Track]]:
+    tracks = [
+        Track(id=str(n), title=f"Song {n}", artist="A", album="X", track_number=n, duration_secs=60, path=f"/{n}.wav")
+        for n in (1, 2, 3)
+    ]
+    audio = EndNotifyingAudioBackend()
+    app = PlayerApp(state=PlayerState(tracks=tracks), screen=DummyScreen(), audio_backend=audio)
+    app.handle_button(ButtonEvent.RIGHT)  # Library -> Artists
+    app.handle_button(ButtonEvent.SELECT)  # albums
+    app.handle_button(ButtonEvent.SELECT)  # tracks
+    return app, audio, tracks
+
+
+def test_end_of_track_advances_through_the_album() -> None:
+    app, audio, tracks = _album_app()
+    app.handle_button(ButtonEvent.SELECT)  # play Song 1
+    assert audio.on_track_end == app.track_finished
+
+    audio.on_track_end(False)  # backend stopped at the end of Song 1
+    assert audio.play_calls == [tracks[0], tracks[1]]
+    assert app.state.playing_index == 1
+
+    audio.on_track_end(True)  # backend already continued into the preloaded Song 3
+    assert audio.play_calls == [tracks[0], tracks[1]]
+    assert app.state.playing_index == 2
+    assert audio.preload_calls == [tracks[1], tracks[2]]
+
+    audio.on_track_end(False)  # end of the queue
+    assert app.state.is_playing is False
+    assert app.state.playing_index == 2
+
+
+def test_queue_skips_slots_removed_or_reused_while_it_plays() -> None:
+    app, audio, tracks = _album_app()
+    app.handle_button(ButtonEvent.SELECT)  # play Song 1; Song 2 is preloaded
+    song2 = tracks[1]
+    other = Track(id="9", title="Other", artist="B", album="Y", track_number=1, duration_secs=60, path="/9.wav")
+
+    app.apply_changes(removed=[1])
+    app.apply_changes(added=[other])  # reuses Song 2's slot
+    assert tracks[1] is other
+    assert audio.preload_calls == [song2, tracks[2]]  # re-buffered past the gone track
+
+    audio.on_track_end(False)
+    assert audio.play_calls[-1] is tracks[2]
+    assert app.state.playing_index == 2
+
+    stops = audio.stop_calls
+    app.apply_changes(removed=[2])  # the playing track itself
+    assert audio.stop_calls == stops + 1
+    assert app.state.playing_index is None and app.state.is_playing is False
+
+
+def test_track_that_fails_to_open_is_not_shown_as_playing() -> None:
+    app, audio, tracks = _album_app()
+    real_play = audio.play
+
+    def play(track: Track) -> None:
+        if track.id == "2":
+            raise ValueError("unsupported audio format")
+        real_play(track)
+
+    audio.play = play
+    app.handle_button(ButtonEvent.SELECT)  # play Song 1
+    audio.on_track_end(False)  # Song 2 cannot be opened
+    assert app.state.is_playing is False
+    assert app.state.playing_index is None
+
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.PLAY_PAUSE)  # try Song 2 in place
+    assert app.state.is_playing is False
+    assert audio.resume_calls == 0
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.PLAY_PAUSE)  # Song 3 opens
+    assert app.state.is_playing is True
+    assert app.state.playing_index == 2
+    assert audio.play_calls == [tracks[0], tracks[2]]
+
+
+def test_now_playing_up_down_skip_within_the_queue() -> None:
+    app, audio, tracks = _album_app()
+    app.handle_button(ButtonEvent.SELECT)  # play Song 1, jump to Now Playing
+    app.handle_button(ButtonEvent.UP)  # already first: no-op
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.DOWN)  # already last: no-op
+    assert audio.play_calls == [tracks[0], tracks[1], tracks[2]]
+    app.handle_button(ButtonEvent.UP)
+    assert app.state.playing_index == 1
+    assert app.state.is_playing is True
+
+
+def test_shuffle_setting_shuffles_new_queues() -> None:
+    app, audio, tracks = _album_app()
+    app.handle_button(ButtonEvent.BACK)
+    app.handle_button(ButtonEvent.BACK)
+    app.handle_button(ButtonEvent.BACK)  # root
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.DOWN)
+    app.handle_button(ButtonEvent.SELECT)  # Settings
+    app.handle_button(ButtonEvent.SELECT)  # toggle shuffle
+    assert app.state.shuffle is True
+    app.handle_button(ButtonEvent.BACK)
+    app.handle_button(ButtonEvent.UP)
+    app.handle_button(ButtonEvent.UP)  # Library highlighted
+
+    app.handle_button(ButtonEvent.PLAY_PAUSE)  # play the whole library
+    assert app.queue is not None and app.queue.shuffle
+    for _ in range(2):
+        audio.on_track_end(False)
+    assert sorted(track.id for track in audio.play_calls) == ["1", "2", "3"]
+
+
+def test_batched_moves_apply_in_one_render() -> None:
+    tracks = [
+        Track(id=str(i), title=f"Song {i}", artist=f"Artist {i:02d}", album="Album", track_number=1, duration_secs=60, path=f"/music/{i}.mp3")
+        for i in range(10)
+    ]
+    screen = WindowedScreen()
+    app = PlayerApp(state=PlayerState(tracks=tracks), screen=screen, audio_backend=DummyAudioBackend())
+    assert app.page_rows() == 3
+    app.handle_button(ButtonEvent.RIGHT)  # Library -> Artists
+    renders = app.renders_performed
+
+    app.handle_batch([(ButtonEvent.DOWN, 37)])  # clamps at the last artist
+    assert app.state.selected_artist_index == 9
+    assert app.renders_performed == renders + 1
+    assert screen.draw_calls[-1] == (0, 3, "> Artist 09")
+
+    app.handle_batch([(ButtonEvent.UP, 4), (ButtonEvent.VOLUME_UP, 3), (ButtonEvent.SELECT, 1)])
+    assert app.state.selected_artist_index == 5
+    assert app.state.volume == 65
+    assert app.state.library_level.name == "ALBUMS"
+    assert app.renders_performed == renders + 2
+
+
+def test_batched_skips_start_only_the_final_track() -> None:
+    app, audio, tracks = _album_app()
+    app.handle_button(ButtonEvent.SELECT)  # play Song 1, jump to Now Playing
+    app.handle_batch([(ButtonEvent.DOWN, 5)])
+    assert audio.play_calls == [tracks[0], tracks[2]]
+    assert app.state.playing_index == 2
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from platforms.esp32.row_cache import RowCache
+
+
+def test_lru_eviction_respects_the_byte_budget() -> None:
+    cache = RowCache(budget_bytes=300)
+    assert cache.put("a", "A", 100)
+    assert cache.put("b", "B", 100)
+    assert cache.put("c", "C", 100)
+    assert cache.get("a") == "A"  # "b" is now least recently used
+
+    assert cache.put("d", "D", 150)  # needs two slots' worth: evicts b, then c
+    assert cache.get("b") is None and cache.get("c") is None
+    assert cache.get("a") == "A" and cache.get("d") == "D"
+    assert cache.used_bytes == 250
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 2, 2)
+
+    assert not cache.put("huge", "H", 301)  # larger than the budget: not cached
+    assert len(cache) == 2
+
+    assert cache.put("a", "A2", 50)  # replacing frees the old size first
+    assert cache.used_bytes == 200
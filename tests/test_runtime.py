@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from core.models import ButtonEvent, PlayerState, ScreenID, Track
+from core.player_app import PlayerApp
+from core.runtime import Runtime
+from platforms.pc.pc_audio_backend import PcAudioBackend
+
+
+class NullScreen:
+    def clear(self) -> None:
+        pass
+
+    def draw_text(self, x: int, y: int, text: str) -> None:
+        pass
+
+    def refresh(self) -> None:
+        pass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _tracks() -> list[Track]:
+    return [
+        Track(id=str(n), title=f"Song {n}", artist="A", album="X", track_number=n, duration_secs=30, path=f"/{n}.mp3")
+        for n in (1, 2)
+    ]
+
+
+def _make_app(clock: FakeClock) -> tuple[PlayerApp, PcAudioBackend]:
+    audio = PcAudioBackend(clock=clock)
+    app = PlayerApp(state=PlayerState(tracks=_tracks()), screen=NullScreen(), audio_backend=audio)
+    app.render()
+    return app, audio
+
+
+def test_input_and_calls_dispatch_in_order_on_one_loop() -> None:
+    app, _ = _make_app(FakeClock())
+    runtime = Runtime(app)
+    rendered: list[ScreenID] = []
+    runtime.on_render = lambda: rendered.append(app.state.current_screen)
+
+    async def script() -> None:
+        runtime.post(ButtonEvent.RIGHT)  # into Library
+        runtime.call(app.add_tracks, [Track("9", "New", "B", "Y", 1, 10, "/9.mp3")])
+        runtime.post(ButtonEvent.LEFT)  # back to root
+        runtime.post(ButtonEvent.LEFT)  # no-op at root: no render
+        await asyncio.sleep(0)
+        runtime.call(runtime.stop)
+
+    asyncio.run(runtime.run(script()))
+
+    assert runtime.dispatched == 5
+    assert rendered == [ScreenID.LIBRARY, ScreenID.LIBRARY, ScreenID.ROOT]
+    assert app.library.artists() == ["A", "B"]
+
+
+def test_periodic_tick_advances_playback_without_input(capsys: pytest.CaptureFixture[str]) -> None:
+    clock = FakeClock()
+    app, audio = _make_app(clock)
+    runtime = Runtime(app)
+
+    async def script() -> None:
+        for event in (ButtonEvent.RIGHT, ButtonEvent.SELECT, ButtonEvent.SELECT, ButtonEvent.SELECT):
+            runtime.post(event)  # play Song 1
+        await asyncio.sleep(0.01)
+        assert app.state.playing_index == 0
+        clock.now = 31.0  # Song 1 is over
+        await asyncio.sleep(0.01)
+        runtime.stop()
+
+    asyncio.run(runtime.run(script(), runtime.every(1, audio.poll)))
+
+    assert app.state.playing_index == 1
+    assert app.state.is_playing is True
+    assert "[Audio] Play: Song 2 - A" in capsys.readouterr().out
+
+
+def test_a_failing_task_stops_the_runtime_and_reraises() -> None:
+    app, _ = _make_app(FakeClock())
+    runtime = Runtime(app)
+
+    async def broken() -> None:
+        raise RuntimeError("scan failed")
+
+    async def forever() -> None:
+        while True:
+            await asyncio.sleep(1)
+
+    with pytest.raises(RuntimeError, match="scan failed"):
+        asyncio.run(runtime.run(forever(), broken()))
+    assert runtime.running is False
+
+
+def test_pc_backend_pause_holds_the_playback_position() -> None:
+    clock = FakeClock()
+    audio = PcAudioBackend(clock=clock)
+    ends: list[bool] = []
+    audio.on_track_end = ends.append
+    audio.play(_tracks()[0])
+    clock.now = 20.0
+    audio.pause()
+    clock.now = 100.0
+    audio.poll()
+    assert ends == []
+    audio.resume()
+    clock.now = 110.0
+    audio.poll()
+    assert ends == [False]
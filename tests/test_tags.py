@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.tags import read_tags
+from platforms.pc import bulk_import
+from platforms.pc.bulk_import import iter_tag_infos, iter_tagged_batches
+from platforms.pc.track_loader import load_tracks_from_dir, scan_library
+
+MPEG1_L3_128K_STEREO = b"\xff\xfb\x90\x00"
+
+
+def _syncsafe(n: int) -> bytes:
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+
+def _id3v23(frames: dict[str, bytes]) -> bytes:
+    body = b""
+    for frame_id, payload in frames.items():
+        body += frame_id.encode() + len(payload).to_bytes(4, "big") + b"\x00\x00" + payload
+    body += b"\x00" * 64  # padding
+    return b"ID3\x03\x00\x00" + _syncsafe(len(body)) + body
+
+
+def _mp3_with_xing(frames: int) -> bytes:
+    frame = bytearray(417)
+    frame[0:4] = MPEG1_L3_128K_STEREO
+    frame[36:40] = b"Xing"
+    frame[40:44] = (1).to_bytes(4, "big")
+    frame[44:48] = frames.to_bytes(4, "big")
+    return bytes(frame)
+
+
+def test_mp3_id3v2_text_frames_and_xing_duration(tmp_path: Path) -> None:
+    tag = _id3v23(
+        {
+            "TIT2": b"\x00Tagged Title",
+            "TPE1": b"\x01\xff\xfeA\x00r\x00t\x00\x00\x00",  # UTF-16 with BOM
+            "APIC": b"\x00" * 200_000,  # skipped, never read
+            "TALB": b"\x03Alb\xc3\xbcm\x00",
+            "TRCK": b"\x004/12",
+        }
+    )
+    path = tmp_path / "song.mp3"
+    path.write_bytes(tag + _mp3_with_xing(1000) + b"\x00" * 4096)
+
+    info = read_tags(str(path))
+    assert info.title == "Tagged Title"
+    assert info.artist == "Art"
+    assert info.album == "Albüm"
+    assert info.track_number == 4
+    assert info.duration_secs == 26  # 1000 frames * 1152 / 44100
+
+
+def test_mp3_cbr_duration_and_id3v1_fallback(tmp_path: Path) -> None:
+    audio = MPEG1_L3_128K_STEREO + b"\x00" * (160_000 - 4)  # 10 s at 128 kbps
+    v1 = bytearray(b"TAG" + b"\x00" * 125)
+    v1[3:9] = b"V1 Ttl"
+    v1[33:39] = b"V1 Art"
+    v1[126] = 7
+    path = tmp_path / "cbr.mp3"
+    path.write_bytes(audio + bytes(v1))
+
+    info = read_tags(str(path))
+    assert (info.title, info.artist, info.album) == ("V1 Ttl", "V1 Art", None)
+    assert info.track_number == 7
+    assert info.duration_secs == 10
+
+
+def test_flac_streaminfo_and_vorbis_comments(tmp_path: Path) -> None:
+    streaminfo = bytearray(34)
+    sample_rate, total = 44100, 44100 * 185
+    streaminfo[10] = (sample_rate >> 12) & 0xFF
+    streaminfo[11] = (sample_rate >> 4) & 0xFF
+    streaminfo[12] = (sample_rate & 0x0F) << 4
+    streaminfo[13] = (total >> 32) & 0x0F
+    streaminfo[14:18] = (total & 0xFFFFFFFF).to_bytes(4, "big")
+    comments = [b"TITLE=Flac Song", b"artist=Flac Artist", b"TRACKNUMBER=2"]
+    vorbis = (3).to_bytes(4, "little") + b"abc" + len(comments).to_bytes(4, "little")
+    for entry in comments:
+        vorbis += len(entry).to_bytes(4, "little") + entry
+    data = b"fLaC"
+    data += bytes([0]) + len(streaminfo).to_bytes(3, "big") + bytes(streaminfo)
+    data += bytes([6]) + (50_000).to_bytes(3, "big") + b"\x00" * 50_000  # PICTURE, skipped
+    data += bytes([0x80 | 4]) + len(vorbis).to_bytes(3, "big") + vorbis
+    path = tmp_path / "song.flac"
+    path.write_bytes(data + b"\x00" * 1024)
+
+    info = read_tags(str(path))
+    assert (info.title, info.artist, info.album) == ("Flac Song", "Flac Artist", None)
+    assert info.track_number == 2
+    assert info.duration_secs == 185
+
+
+def test_wav_duration_from_fmt_and_data(tmp_path: Path) -> None:
+    byte_rate = 44100 * 2 * 2
+    fmt = (1).to_bytes(2, "little") + (2).to_bytes(2, "little") + (44100).to_bytes(4, "little")
+    fmt += byte_rate.to_bytes(4, "little") + (4).to_bytes(2, "little") + (16).to_bytes(2, "little")
+    pcm = b"\x00" * (byte_rate * 3)
+    body = b"WAVE" + b"fmt " + len(fmt).to_bytes(4, "little") + fmt + b"data" + len(pcm).to_bytes(4, "little") + pcm
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"RIFF" + len(body).to_bytes(4, "little") + body)
+
+    assert read_tags(str(path)).duration_secs == 3
+
+
+def test_loader_read_tags_overrides_folder_metadata(tmp_path: Path) -> None:
+    album_dir = tmp_path / "Wrong Artist" / "Album"
+    album_dir.mkdir(parents=True)
+    tag = _id3v23({"TPE1": b"\x00Right Artist", "TIT2": b"\x00Real Title"})
+    (album_dir / "01 - file name.mp3").write_bytes(tag + _mp3_with_xing(100))
+    (album_dir / "02 - untagged.mp3").write_bytes(b"")
+
+    tagged, untagged = load_tracks_from_dir(str(tmp_path), read_tags=True)
+    assert (tagged.artist, tagged.album, tagged.title, tagged.track_number) == ("Right Artist", "Album", "Real Title", 1)
+    assert tagged.duration_secs == 3
+    assert (untagged.artist, untagged.title, untagged.duration_secs) == ("Wrong Artist", "untagged", 0)
+
+
+def test_bulk_tagging_matches_in_process_order(tmp_path: Path) -> None:
+    paths = []
+    for i in range(12):
+        tag = _id3v23({"TIT2": b"\x00Song %d" % i})
+        path = tmp_path / f"{i:02d}.mp3"
+        path.write_bytes(tag + _mp3_with_xing(100 * (i + 1)))
+        paths.append(str(path))
+    paths.append(str(tmp_path / "missing.mp3"))
+
+    in_process = list(iter_tag_infos(paths, threshold=len(paths) + 1))
+    pooled = list(iter_tag_infos(paths, workers=2, chunk_size=5, threshold=0))
+
+    assert [pos for pos, _ in pooled] == list(range(len(paths)))
+    assert [info.title if info else None for _, info in pooled] == [info.title if info else None for _, info in in_process]
+    assert pooled[-1][1] is None
+    assert pooled[3][1].duration_secs == in_process[3][1].duration_secs == 10
+
+
+@pytest.mark.parametrize("threshold, pools", [(10, 1), (13, 0)])
+def test_small_batches_share_one_pool_decided_from_the_total(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, threshold: int, pools: int
+) -> None:
+    for artist in "ABC":
+        album_dir = tmp_path / f"Artist {artist}" / "Album"
+        album_dir.mkdir(parents=True)
+        for i in range(4):
+            (album_dir / f"{i:02d}.mp3").write_bytes(_id3v23({"TIT2": b"\x00%s%d" % (artist.encode(), i)}) + _mp3_with_xing(100))
+    created = []
+
+    class CountingPool(bulk_import.ProcessPoolExecutor):
+        def __init__(self, *args: object, **kwargs: object) -> None:
+            created.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(bulk_import, "ProcessPoolExecutor", CountingPool)
+    tracks, _ = scan_library(str(tmp_path))
+    batches = [tracks[0:4], [], tracks[4:8], tracks[8:12]]
+
+    tagged = list(iter_tagged_batches(batches, workers=2, threshold=threshold))
+
+    assert len(created) == pools
+    assert tagged == batches
+    assert [track.title for track in tracks] == ["%s%d" % (artist, i) for artist in "ABC" for i in range(4)]
+
+
+def test_absurd_track_numbers_are_dropped(tmp_path: Path) -> None:
+    path = tmp_path / "a.mp3"
+    path.write_bytes(_id3v23({"TIT2": b"\x00Song", "TRCK": b"\x0099999999999/12"}) + _mp3_with_xing(100))
+    info = read_tags(str(path))
+    assert (info.title, info.track_number) == ("Song", None)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from platforms.pc.track_loader import load_tracks_from_dir
+from platforms.pc.track_loader import iter_track_batches, load_tracks_from_dir, rescan_library, scan_library
 
 
 def test_load_tracks_from_dir_parses_artist_album_and_numbers(tmp_path: Path) -> None:
@@ -43,3 +44,88 @@ def test_load_tracks_from_dir_parses_artist_album_and_numbers(tmp_path: Path) ->
     t4 = next(t for t in tracks if t.title == "Loose")
     assert t4.artist is None
     assert t4.album is None
+
+
+def _bump_mtime(directory: Path) -> None:
+    st = os.stat(directory)
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_rescan_library_reads_only_changed_directories(tmp_path: Path) -> None:
+    for artist in ("Artist A", "Artist B", "Artist C"):
+        album_dir = tmp_path / artist / "Album"
+        album_dir.mkdir(parents=True)
+        (album_dir / "01 - One.mp3").write_bytes(b"")
+        (album_dir / "02 - Two.mp3").write_bytes(b"")
+    tracks, stamps = scan_library(str(tmp_path))
+    assert len(tracks) == 6
+
+    unchanged = rescan_library(str(tmp_path), tracks, stamps)
+    assert not unchanged
+    assert unchanged.dirs_read == 0
+
+    album_b = tmp_path / "Artist B" / "Album"
+    (album_b / "02 - Two.mp3").rename(album_b / "02 - Deux.mp3")
+    (album_b / "03 - Three.mp3").write_bytes(b"")
+    _bump_mtime(album_b)
+
+    diff = rescan_library(str(tmp_path), tracks, stamps)
+    assert diff.dirs_read == 1
+    assert sorted(t.title for t in diff.added) == ["Deux", "Three"]
+    assert [tracks[idx].title for idx in diff.removed] == ["Two"]
+    assert tracks[diff.removed[0]].artist == "Artist B"
+    assert diff.modified == []
+
+
+def test_parallel_scan_matches_serial_order(tmp_path: Path) -> None:
+    for a in range(6):
+        artist_dir = tmp_path / f"Artist {a}"
+        (artist_dir / "Album B").mkdir(parents=True)
+        (artist_dir / "Album A").mkdir()
+        (artist_dir / "Album B" / "02 - Two.mp3").write_bytes(b"")
+        (artist_dir / "Album A" / "01 - One.flac").write_bytes(b"")
+        (artist_dir / "Loose.wav").write_bytes(b"")
+    (tmp_path / "Root.mp3").write_bytes(b"")
+
+    serial, serial_stamps = scan_library(str(tmp_path))
+    parallel, parallel_stamps = scan_library(str(tmp_path), workers=4)
+
+    assert [t.path for t in parallel] == [t.path for t in serial]
+    assert parallel_stamps == serial_stamps
+
+
+def test_iter_track_batches_streams_one_batch_per_artist(tmp_path: Path) -> None:
+    for artist in ("B", "A"):
+        album_dir = tmp_path / artist / "Album"
+        album_dir.mkdir(parents=True)
+        (album_dir / "01 - One.mp3").write_bytes(b"")
+    (tmp_path / "Loose.mp3").write_bytes(b"")
+
+    batches = list(iter_track_batches(str(tmp_path)))
+    assert [[t.artist for t in batch] for batch in batches] == [["A"], ["B"], [None]]
+
+
+def test_unreadable_directories_are_skipped(tmp_path: Path, monkeypatch) -> None:
+    for artist in ("Artist A", "Artist B"):
+        for album in ("Open", "Locked"):
+            album_dir = tmp_path / artist / album
+            album_dir.mkdir(parents=True)
+            (album_dir / "01 - One.mp3").write_bytes(b"")
+    (tmp_path / "Artist C").mkdir()
+    (tmp_path / "Artist C" / "Solo.mp3").write_bytes(b"")
+    locked = {str(tmp_path / "Artist A" / "Locked"), str(tmp_path / "Artist C")}
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if path in locked:
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr("platforms.pc.track_loader.os.scandir", scandir)
+    tracks, stamps = scan_library(str(tmp_path))
+    assert sorted((t.artist, t.album) for t in tracks) == [("Artist A", "Open"), ("Artist B", "Locked"), ("Artist B", "Open")]
+    assert not locked & set(stamps)
+
+    diff = rescan_library(str(tmp_path), [], {})
+    assert sorted(t.path for t in diff.added) == sorted(t.path for t in tracks)
+    assert not locked & set(diff.stamps)
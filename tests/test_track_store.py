@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from core.library import Library
+from core.models import ButtonEvent, PlayerState, ScreenID, Track
+from core.player_app import PlayerApp
+from core.track_store import TrackStore
+
+from .test_player_app import DummyAudioBackend, DummyScreen
+
+
+def _tracks() -> list[Track]:
+    return [
+        Track(id="1", title="Ünïcode", artist="Artist A", album="Album X", track_number=2, duration_secs=61, path="/m/a.mp3"),
+        Track(id="/m/b.mp3", title="Bee", artist="Artist A", album="Album X", track_number=1, duration_secs=0, path="/m/b.mp3"),
+        Track(id="/m/c.mp3", title="Sea", artist=None, album=None, track_number=None, duration_secs=5, path="/m/c.mp3"),
+    ]
+
+
+def test_store_round_trips_fields_and_supports_removal() -> None:
+    tracks = _tracks()
+    store = TrackStore(tracks)
+
+    assert len(store) == 3
+    for original, view in zip(tracks, store):
+        assert view.to_track().__dict__ == original.__dict__
+
+    store[0] = None
+    assert store[0] is None
+    store[0] = Track(id="/m/d.mp3", title="Dee", artist="Artist B", album=None, track_number=4, duration_secs=9, path="/m/d.mp3")
+    assert (store[0].title, store[0].artist, store[0].track_number, store[0].id) == ("Dee", "Artist B", 4, "/m/d.mp3")
+    assert store[-1].title == "Sea"
+
+
+def test_store_drives_library_and_player_app() -> None:
+    store = TrackStore(_tracks())
+    state = PlayerState(tracks=store)
+    audio = DummyAudioBackend()
+    app = PlayerApp(state=state, screen=DummyScreen(), audio_backend=audio)
+
+    assert state.tracks is store
+    assert app.library.artists() == ["Artist A", "Unknown Artist"]
+    app.handle_button(ButtonEvent.RIGHT)  # Library
+    app.handle_button(ButtonEvent.SELECT)  # Artist A albums
+    app.handle_button(ButtonEvent.SELECT)  # Album X tracks
+    app.handle_button(ButtonEvent.SELECT)  # play first by track number
+
+    assert app.state.current_screen == ScreenID.NOW_PLAYING
+    assert audio.play_calls[-1].title == "Bee"
+
+    library = Library(store)
+    assigned = library.apply_changes(removed=[2])
+    assert assigned == [] and store[2] is None
+    assert library.artists() == ["Artist A"]
+
+
+def test_out_of_range_values_are_normalised_and_bad_rows_are_not_half_written() -> None:
+    store = TrackStore(_tracks())
+    store[1] = Track(
+        id="", title="é" * 40000, artist="Artist Z", album=None, track_number=99_999_999_999, duration_secs=2**40, path="/m/b.mp3"
+    )
+    row = store[1]
+    assert row.track_number is None
+    assert row.duration_secs == 0xFFFFFFFF
+    assert row.title == "é" * 32767  # cut to 65535 bytes on a character boundary
+    assert row.id == ""  # a falsy id is kept, not replaced by the path
+
+    with pytest.raises(ValueError):
+        store[0] = Track(id="x", title="t", artist="New", album=None, track_number=1, duration_secs=1, path="/" + "p" * 70000)
+    assert store[0].to_track().__dict__ == _tracks()[0].__dict__